@@ -0,0 +1,90 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the footprint bboxes computation strategies on the test OData search results,
+as they are and densified: the original per-Product loop, the GEOS parsing of the
+serialized footprints and the current `geometries_bounds`.
+
+    PYTHONPATH=src python benchmarks/bounds.py [repeat]
+"""
+
+from pathlib import Path
+from pygeocdse.converters.bounds import geometries_bounds, parse_geometries
+from typing import Any, Callable, List, Mapping, Optional
+import json
+import numpy
+import shapely
+import shapely.geometry
+import sys
+import timeit
+
+ODATA_SEARCH = (
+    Path(__file__).parent.parent / "tests" / "artifacts" / "odata_search.json"
+)
+
+
+def loop_bounds(geometries: List[Mapping[str, Any]]) -> List[Optional[List[float]]]:
+    # one Python pass over the positions of each Polygon, as before the batching
+    bboxes: List[Optional[List[float]]] = []
+    for geometry in geometries:
+        polygons = (
+            [geometry["coordinates"]]
+            if "Polygon" == geometry["type"]
+            else geometry["coordinates"]
+        )
+        xs = [x for polygon in polygons for ring in polygon for x, *_ in ring]
+        ys = [y for polygon in polygons for ring in polygon for _, y, *_ in ring]
+        bboxes.append([min(xs), min(ys), max(xs), max(ys)])
+    return bboxes
+
+
+def geos_bounds(geometries: List[Mapping[str, Any]]) -> List[Optional[List[float]]]:
+    # serialize to GeoJSON then parse with GEOS, as in the first batched version
+    return [
+        None if numpy.isnan(bounds).any() else bounds.tolist()
+        for bounds in shapely.bounds(parse_geometries(geometries))
+    ]
+
+
+def main(repeat: int = 5):
+    with ODATA_SEARCH.open() as input_stream:
+        footprints = [p["GeoFootprint"] for p in json.load(input_stream)["value"]]
+    # the same page size iter_bounds works with
+    footprints = (footprints * (100 // len(footprints) + 1))[:100]
+    # detailed footprints, e.g. the Sentinel-2 ones, have hundreds of vertices
+    detailed = [
+        shapely.geometry.mapping(shapely.segmentize(shapely.geometry.shape(f), 0.05))
+        for f in footprints
+    ]
+
+    strategies: Mapping[str, Callable] = {
+        "loop": loop_bounds,
+        "geos": geos_bounds,
+        "coordinates": geometries_bounds,
+    }
+
+    for label, geometries in (("5 vertices", footprints), ("detailed", detailed)):
+        expected = loop_bounds(geometries)
+        for name, strategy in strategies.items():
+            assert expected == strategy(geometries), name
+
+            seconds = min(
+                timeit.repeat(lambda: strategy(geometries), number=100, repeat=repeat)
+            )
+            print(f"{label:>10} {name:>12}: {seconds * 10:.3f} ms per 100 footprints")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -21,24 +21,20 @@ from pygeofilter.ast import (
     Attribute,
     Equal,
     GeometryIntersects,
+    In,
     Or,
 )
 from pygeofilter.parsers.cql2_json import parse as parse_cql2_json
 from pygeofilter.util import parse_datetime
 from pygeofilter.values import Geometry
 from shapely.geometry import box, mapping
-from typing import Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 
-def _and_concat(left: AstType | None, right: AstType) -> AstType:
+def flatten_and(node: AstType) -> list[AstType]:
     """
-    Flatten nested ANDs from `left` and `right`, then rebuild as a left-associated AND chain.
-
-    Assumes `left` and `right` are non-None and already validated as AstType.
+    Collect the clauses of a (possibly nested) AND tree, in left-to-right order.
     """
-    if not left:
-        return right
-
     parts: list[AstType] = []
 
     def collect(node: AstType) -> None:
@@ -54,11 +50,15 @@ def _and_concat(left: AstType | None, right: AstType) -> AstType:
         else:
             parts.append(node)
 
-    collect(left)
-    collect(right)
+    collect(node)
 
-    # At least two parts exist unless one side was a degenerate And,
-    # but keep this safe anyway.
+    return parts
+
+
+def and_chain(parts: Sequence[AstType]) -> AstType:
+    """
+    Rebuild a left-associated AND chain from the given clauses.
+    """
     if not parts:
         raise ValueError("and_concat: no clauses collected (unexpected empty AND tree)")
 
@@ -69,6 +69,59 @@ def _and_concat(left: AstType | None, right: AstType) -> AstType:
     return expr
 
 
+def _and_concat(left: AstType | None, right: AstType) -> AstType:
+    """
+    Flatten nested ANDs from `left` and `right`, then rebuild as a left-associated AND chain.
+
+    Assumes `left` and `right` are non-None and already validated as AstType.
+    """
+    if not left:
+        return right
+
+    # At least two parts exist unless one side was a degenerate And,
+    # but keep this safe anyway.
+    return and_chain(flatten_and(left) + flatten_and(right))
+
+
+def _collection_options(node: AstType) -> Optional[List[str]]:
+    if isinstance(node, Or):
+        lhs = _collection_options(node.lhs)
+        rhs = _collection_options(node.rhs)
+        return None if lhs is None or rhs is None else lhs + rhs
+
+    if (
+        isinstance(node, (Equal, In))
+        and isinstance(node.lhs, Attribute)
+        and "Collection/Name" == node.lhs.name
+    ):
+        if isinstance(node, Equal):
+            return [node.rhs] if isinstance(node.rhs, str) else None
+        if not node.not_ and all(isinstance(option, str) for option in node.sub_nodes):
+            return list(node.sub_nodes)
+
+    return None
+
+
+def collection_names(filter: AstType | None) -> List[str]:
+    """
+    Collect the collections the input filter restricts the search to, i.e. the
+    `Collection/Name` equalities (possibly OR-ed, or expressed as an IN list) among its
+    top level AND clauses, as built by `collections_filter`.
+
+    Returns an empty list when the filter does not constrain the collection.
+    """
+    if filter is None:
+        return []
+
+    names: List[str] = []
+    for clause in flatten_and(filter):
+        options = _collection_options(clause)
+        if options:
+            names.extend(name for name in options if name not in names)
+
+    return names
+
+
 def collections_filter(filter: AstType | None, collections: Sequence[str]) -> AstType:
     """
     Build a pygeofilter AST equivalent to:
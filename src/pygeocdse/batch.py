@@ -0,0 +1,237 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from http import HTTPStatus
+from httpx import URL, Response
+from itertools import chain
+from loguru import logger
+from pygeocdse import codec
+from pygeocdse.client import CDSEClient, ServerError
+from pygeocdse.evaluator import Cql2Filter, satisfiable_where
+from pygeocdse.fields import PRODUCT_EXPANSIONS
+from pygeocdse.search import follow_pages, products_url, take
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import re
+import uuid
+
+# statuses meaning the endpoint does not serve $batch, rather than a failing server
+_BATCH_UNSUPPORTED = frozenset(
+    (
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.METHOD_NOT_ALLOWED,
+        HTTPStatus.NOT_IMPLEMENTED,
+    )
+)
+
+_BLANK_LINE = re.compile(rb"\r?\n\r?\n")
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+
+def _batch_url(base_url: str) -> str:
+    # the $batch resource sits at the service root, next to the Products entity set
+    return f"{base_url.rstrip('/').rsplit('/', 1)[0]}/$batch"
+
+
+def _relative_url(url: str) -> str:
+    """
+    Return the input request URL, percent-encoded and relative to the service root.
+    """
+    path, _, query = URL(url).raw_path.decode("ascii").partition("?")
+    relative: str = path.rsplit("/", 1)[-1]
+    return f"{relative}?{query}" if query else relative
+
+
+def _batch_request(urls: Sequence[str], limit: int, boundary: str) -> bytes:
+    parts: List[str] = []
+    for content_id, url in enumerate(urls):
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            "Content-Transfer-Encoding: binary\r\n"
+            f"Content-ID: {content_id}\r\n"
+            "\r\n"
+            f"GET {_relative_url(url)} HTTP/1.1\r\n"
+            "Accept: application/json\r\n"
+            f"Prefer: odata.maxpagesize={limit}\r\n"
+            "\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode("ascii")
+
+
+def _parse_headers(block: bytes) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    for line in block.decode("latin-1").splitlines():
+        name, separator, value = line.partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _parse_part(part: bytes) -> Tuple[Optional[str], int, bytes]:
+    """
+    Split a `application/http` part of the batch response into its Content-ID, the
+    embedded HTTP response status and body.
+    """
+    split: List[bytes] = _BLANK_LINE.split(part, 1)
+    if len(split) < 2:
+        raise RuntimeError(f"Malformed $batch response part: {part[:1024]!r}")
+
+    part_headers, message = split
+    head, body = (_BLANK_LINE.split(message, 1) + [b""])[:2]
+    status_line, _, _ = head.partition(b"\n")
+
+    # e.g. HTTP/1.1 200 OK
+    status: int = int(status_line.split()[1])
+    return _parse_headers(part_headers).get("content-id"), status, body
+
+
+def _parse_batch_response(response: Response) -> List[Tuple[Optional[str], int, bytes]]:
+    match = _BOUNDARY.search(response.headers.get("Content-Type", ""))
+    if match is None:
+        raise RuntimeError(
+            f"The $batch response of {response.request.url} is not a multipart message (Content-Type: {response.headers.get('Content-Type')})"
+        )
+
+    delimiter: bytes = b"--" + match.group(1).encode("ascii")
+    parts: List[Tuple[Optional[str], int, bytes]] = []
+    for part in response.content.split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            # closing delimiter
+            break
+        parts.append(_parse_part(part.strip(b"\r\n")))
+
+    return parts
+
+
+def _post_batch(
+    batch_url: str,
+    urls: Sequence[str],
+    limit: int,
+    timeout: int,
+    session: CDSEClient,
+) -> Optional[List[Mapping[str, Any]]]:
+    """
+    Send the input GET requests in a single `$batch` request, returning the first page
+    of each of them, in the same order, or `None` if the endpoint does not support
+    `$batch` (400, 404, 405 or 501); any other error status is raised.
+    """
+    boundary: str = f"batch_{uuid.uuid4().hex}"
+
+    try:
+        response: Response = session.post(
+            url=batch_url,
+            content=_batch_request(urls, limit, boundary),
+            headers={
+                "Content-Type": f"multipart/mixed; boundary={boundary}",
+                "OData-Version": "4.0",
+            },
+            timeout=timeout,
+        )
+    except ServerError as e:
+        if e.status_code not in _BATCH_UNSUPPORTED:
+            raise
+        logger.warning(
+            f"$batch request rejected ({e}), sending the requests one by one."
+        )
+        return None
+
+    parts = _parse_batch_response(response)
+    if len(parts) != len(urls):
+        raise RuntimeError(
+            f"The $batch response of {batch_url} contains {len(parts)} response(s), {len(urls)} expected"
+        )
+
+    pages: List[Optional[Mapping[str, Any]]] = [None] * len(urls)
+    for position, (content_id, status, body) in enumerate(parts):
+        index: int = int(content_id) if content_id is not None else position
+        if HTTPStatus.MULTIPLE_CHOICES._value_ <= status:
+            raise RuntimeError(
+                f"A server error occurred when invoking GET {urls[index]} via $batch: {status} {body[:1024]!r}"
+            )
+        pages[index] = codec.loads(body)
+
+    return pages  # type: ignore
+
+
+def batch_http_invoke(
+    base_url: str,
+    cql2_filters: Sequence[Cql2Filter],
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    batch_size: int = 20,
+    client: Optional[CDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+) -> List[Mapping[str, Any]]:
+    """
+    Run several searches at once, packing up to `batch_size` of them in each OData
+    `$batch` request, and return their results in the same order as the input filters,
+    in the same shape `http_invoke` returns.
+
+    Only the first page of each search travels through `$batch`, the following ones (if
+    any, up to `max_items` Products) are fetched as usual; if the endpoint rejects
+    `$batch`, all the searches are sent one by one instead.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be a positive integer, {batch_size} given")
+
+    urls: List[Optional[str]] = []
+    for cql2_filter in cql2_filters:
+        where: Optional[str] = satisfiable_where(cql2_filter)
+        urls.append(
+            None
+            if where is None
+            else products_url(base_url, where, max_items, select, expand)
+        )
+
+    results: List[Mapping[str, Any]] = [{"value": []} for _ in urls]
+    pending: List[int] = [i for i, url in enumerate(urls) if url is not None]
+    batch_url: str = _batch_url(base_url)
+    batch_supported: bool = True
+
+    with nullcontext(client) if client is not None else CDSEClient() as session:
+        for start in range(0, len(pending), batch_size):
+            indexes: List[int] = pending[start : start + batch_size]
+            batch_urls: List[str] = [urls[i] for i in indexes]  # type: ignore
+
+            pages: Optional[List[Mapping[str, Any]]] = (
+                _post_batch(batch_url, batch_urls, limit, timeout, session)
+                if batch_supported
+                else None
+            )
+            batch_supported = pages is not None
+
+            for position, index in enumerate(indexes):
+                if pages is None:
+                    products = follow_pages(
+                        batch_urls[position], limit, timeout, session
+                    )
+                else:
+                    page: Mapping[str, Any] = pages[position]
+                    products = chain(
+                        [page],
+                        follow_pages(
+                            page.get("@odata.nextLink"), limit, timeout, session
+                        ),
+                    )
+
+                results[index] = {"value": list(take(products, max_items))}
+
+    return results
@@ -0,0 +1,161 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from contextlib import closing
+from httpx import URL
+from loguru import logger
+from pathlib import Path
+from typing import Mapping, Optional
+import hashlib
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def cache_key(url: str, headers: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Compute the cache key of a GET request, from its URL (with sorted query parameters)
+    and its headers (case-insensitive names, sorted).
+    """
+    parsed: URL = URL(url)
+    normalized_url: URL = parsed.copy_with(
+        params=sorted(parsed.params.multi_items()), fragment=None
+    )
+    normalized_headers = sorted(
+        (name.lower(), value.strip()) for name, value in (headers or {}).items()
+    )
+
+    digest = hashlib.sha256(str(normalized_url).encode("utf-8"))
+    for name, value in normalized_headers:
+        digest.update(f"\n{name}:{value}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent cache of the OData response bodies, stored in a local SQLite database
+    so that it can be shared among several processes.
+
+    Entries expire after `ttl` seconds (unless overridden per entry); once the stored
+    bodies exceed `max_size` bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = 3600,
+        max_size: int = 256 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # a fresh connection per operation keeps the cache safe across threads
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def get(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[bytes]:
+        key: str = cache_key(url, headers)
+        now: float = time.time()
+
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT content, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            content, expires_at = row
+            if expires_at <= now:
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        logger.debug(f"Cache hit for GET {url}")
+        return content
+
+    def put(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]],
+        content: bytes,
+        ttl: Optional[float] = None,
+    ):
+        if len(content) > self.max_size:
+            return
+
+        key: str = cache_key(url, headers)
+        now: float = time.time()
+        expires_at: float = now + (self.ttl if ttl is None else ttl)
+
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, content, len(content), expires_at, now),
+                )
+                self._evict(connection, now)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+
+        evicted: int = 0
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            evicted += 1
+            total -= size
+            if total <= self.max_size:
+                break
+
+        logger.debug(f"Evicted {evicted} least recently used cache entries.")
+
+    def clear(self):
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM responses")
@@ -14,21 +14,32 @@
 
 from __future__ import annotations
 
+from contextlib import nullcontext
 from enum import auto, Enum
 from loguru import logger
 from pathlib import Path
-from pygeocdse.evaluator import http_invoke
+from pygeocdse.cache import ResponseCache
+from pygeocdse.client import CDSEClient, WireLogging
 from pygeocdse.ast_utils import (
     bbox_filter,
+    collection_names,
     collections_filter,
     datetime_or_interval_filter,
 )
-from pygeocdse.converters.odata2stac import to_stac_item_collection
+from pygeocdse.converters import odata2geojson, odata2geoparquet, odata2stac
+from pygeocdse.fields import resolve_fields, resolve_sortby
+from pygeocdse.geometry import GEOMETRY_FALLBACKS, GeometryOptions, reduce_geometries
+from pygeocdse.search import (
+    count,
+    iter_products,
+    iter_products_keyset,
+    keyset_descending,
+)
+from pygeocdse.tiling import iter_tiled_products
 from pygeofilter.ast import AstType
-from pygeofilter.backends.cql2_json import to_cql2
 from pygeofilter.parsers.ecql import parse as parse_ecql
 from pygeofilter.parsers.cql2_json import parse as parse_cql2_json
-from typing import Any, List, Mapping, Tuple
+from typing import Any, Iterator, List, Mapping, Tuple
 import click
 import sys
 
@@ -51,6 +62,160 @@ class FilterLang(Enum):
     CQL2_TEXT = "cql2-text"
 
 
+class OutputFormat(Enum):
+    STAC = "stac"
+    GEOJSON = "geojson"
+    GEOPARQUET = "geoparquet"
+
+
+OUTPUT_REQUIRED_FIELDS = {
+    OutputFormat.STAC.value: odata2stac.REQUIRED_FIELDS,
+    OutputFormat.GEOJSON.value: odata2geojson.REQUIRED_FIELDS,
+    OutputFormat.GEOPARQUET.value: odata2geoparquet.REQUIRED_FIELDS,
+}
+
+
+def _write_output(
+    output_format: str,
+    url: str,
+    products: Iterator[Mapping[str, Any]],
+    save: Path | None,
+    indent: int | None = 2,
+    workers: int = 1,
+    collections: List[str] | None = None,
+):
+    if OutputFormat.GEOPARQUET.value == output_format:
+        # Parquet is a binary format, written to the file or to the stdout bytes
+        odata2geoparquet.write_geoparquet(
+            products, save or sys.stdout.buffer, collections or ()
+        )
+        return
+
+    with save.open("w") if save else nullcontext(sys.stdout) as output_stream:
+        if OutputFormat.GEOJSON.value == output_format:
+            odata2geojson.write_feature_collection_geojson(
+                products, output_stream, indent=indent
+            )
+        else:
+            odata2stac.write_stac_item_collection(
+                url, products, output_stream, indent=indent, workers=workers
+            )
+
+
+def _build_filter(
+    collections: List[str] | None,
+    bbox: Tuple[float, ...] | None,
+    datetime: str | None,
+    filter: str | None,
+    filter_lang: str | None,
+) -> AstType:
+    ast: AstType | None = None
+
+    if filter:
+        if FilterLang.CQL2_JSON.value == filter_lang:
+            ast = parse_cql2_json(filter)
+        else:
+            ast = parse_ecql(filter)  # type: ignore
+
+    if collections:
+        ast = collections_filter(ast, collections)
+    if bbox:
+        ast = bbox_filter(ast, bbox)
+    if datetime:
+        ast = datetime_or_interval_filter(ast, datetime)
+
+    if ast is None:
+        raise Exception(
+            "At least one of the --filter|--collections|--bbox|--datetime option must be set."
+        )
+
+    return ast
+
+
+def _iter_search(
+    url: str,
+    ast: AstType,
+    limit: int,
+    max_items: int,
+    timeout: int,
+    max_connections: int,
+    http2: bool,
+    tiled: bool,
+    tile_size: float | None,
+    wire_logging: WireLogging | None,
+    cache: ResponseCache | None,
+    bypass_cache: bool,
+    select: List[str] | None,
+    expand: List[str],
+    orderby: List[str],
+    keyset: bool,
+    stream: bool,
+) -> Iterator[Mapping[str, Any]]:
+    if tiled:
+        if orderby:
+            logger.warning("--sortby is not honored across tiles when --tiled is set.")
+        if cache is not None or bypass_cache:
+            logger.warning(
+                "--cache and --refresh-cache are not honored when --tiled is set, the tiles are always fetched."
+            )
+        if stream:
+            logger.warning(
+                "--stream is not honored when --tiled is set, each tile page is decoded at once."
+            )
+
+        yield from iter_tiled_products(
+            base_url=url,
+            filter=ast,
+            tile_size=tile_size,
+            limit=limit,
+            max_items=max_items,
+            timeout=timeout,
+            max_concurrency=max_connections,
+            http2=http2,
+            wire_logging=wire_logging,
+            select=select,
+            expand=expand,
+        )
+        return
+
+    with CDSEClient(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        http2=http2,
+        timeout=timeout,
+        wire_logging=wire_logging,
+        cache=cache,
+    ) as client:
+        if keyset:
+            yield from iter_products_keyset(
+                base_url=url,
+                cql2_filter=ast,
+                limit=limit,
+                max_items=max_items,
+                timeout=timeout,
+                client=client,
+                bypass_cache=bypass_cache,
+                select=select,
+                expand=expand,
+                descending=keyset_descending(orderby),
+            )
+            return
+
+        yield from iter_products(
+            base_url=url,
+            cql2_filter=ast,
+            limit=limit,
+            max_items=max_items,
+            timeout=timeout,
+            client=client,
+            bypass_cache=bypass_cache,
+            select=select,
+            expand=expand,
+            orderby=orderby,
+            stream=stream,
+        )
+
+
 @main.command("search")
 @click.argument("url", type=click.STRING)
 @click.option(
@@ -107,15 +272,44 @@ class FilterLang(Enum):
     default=FilterLang.CQL2_JSON.value,
 )
 @click.option(
-    "--sortby", help="Sort by fields", type=click.STRING, required=False, multiple=True
+    "--sortby",
+    help="Sort by fields, prefix with - for descending order (e.g. -datetime)",
+    type=click.STRING,
+    required=False,
+    multiple=True,
+)
+@click.option(
+    "--keyset/--no-keyset",
+    required=False,
+    default=False,
+    help="Page through the results by ContentDate/Start (and Id) instead of $skip, keeping deep harvests fast",
 )
 @click.option(
     "--fields",
-    help="Control what fields get returned",
+    help="Control what fields get returned: OData Product properties (mapped to $select) or Assets, Attributes, Locations (mapped to $expand), prefix with - to exclude",
     type=click.STRING,
     required=False,
     multiple=True,
 )
+@click.option(
+    "--format",
+    "output_format",
+    help="Output format",
+    type=click.Choice([f.value for f in OutputFormat], case_sensitive=False),
+    default=OutputFormat.STAC.value,
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    default=False,
+    help="Write the output without any indentation nor whitespace",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes converting the results to STAC Items in parallel",
+)
 @click.option(
     "--limit", help="Page size limit", required=False, type=click.INT, default=20
 )
@@ -137,7 +331,7 @@ class FilterLang(Enum):
     "--save",
     type=click.Path(path_type=Path),
     required=False,
-    help="Filename to save GeoJSON FeatureCollection to",
+    help="Filename to save the results to, in the --format format",
 )
 @click.option(
     "--timeout",
@@ -146,6 +340,102 @@ class FilterLang(Enum):
     default=30,
     help="Connection timeout, in seconds",
 )
+@click.option(
+    "--max-connections",
+    type=click.INT,
+    required=False,
+    default=10,
+    help="Max number of pooled connections to the OData endpoint",
+)
+@click.option(
+    "--http2/--no-http2",
+    required=False,
+    default=False,
+    help="Negotiate HTTP/2 with the OData endpoint (requires the 'http2' extra)",
+)
+@click.option(
+    "--tiled/--no-tiled",
+    required=False,
+    default=False,
+    help="Split the search AOI in a grid of tiles, queried in parallel",
+)
+@click.option(
+    "--tile-size",
+    type=click.FLOAT,
+    required=False,
+    help="Tiles edge, in degrees, when --tiled is set (chosen automatically if omitted)",
+)
+@click.option(
+    "--wire-log/--no-wire-log",
+    required=False,
+    default=False,
+    help="Log the HTTP requests and responses exchanged with the OData endpoint, at DEBUG level",
+)
+@click.option(
+    "--wire-log-max-body",
+    type=click.INT,
+    required=False,
+    default=1024,
+    help="Max number of bytes of the HTTP bodies reported by the wire log",
+)
+@click.option(
+    "--cache",
+    type=click.Path(path_type=Path),
+    required=False,
+    help="SQLite file where OData responses are cached, shared across runs",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FLOAT,
+    required=False,
+    default=3600,
+    help="Time to live of the cached OData responses, in seconds",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.INT,
+    required=False,
+    default=256 * 1024 * 1024,
+    help="Max size of the OData responses cache, in bytes",
+)
+@click.option(
+    "--refresh-cache",
+    is_flag=True,
+    required=False,
+    default=False,
+    help="Bypass the cached OData responses, fetching (and caching) them again",
+)
+@click.option(
+    "--stream/--no-stream",
+    required=False,
+    default=False,
+    help="Decode the OData pages incrementally, as they arrive (requires the 'streaming' extra)",
+)
+@click.option(
+    "--simplify-tolerance",
+    type=click.FLOAT,
+    required=False,
+    help="Simplify the search geometry, preserving its topology, with the given tolerance in degrees",
+)
+@click.option(
+    "--precision",
+    type=click.INT,
+    required=False,
+    help="Number of decimal digits the search geometry coordinates are rounded to",
+)
+@click.option(
+    "--max-wkt-length",
+    type=click.INT,
+    required=False,
+    help="Max length of the search geometry WKT, larger geometries are replaced by the --geometry-fallback",
+)
+@click.option(
+    "--geometry-fallback",
+    type=click.Choice(GEOMETRY_FALLBACKS, case_sensitive=False),
+    required=False,
+    default=GEOMETRY_FALLBACKS[0],
+    help="Geometry replacing the search one when it exceeds --max-wkt-length",
+)
 def search_cmd(
     url: str,
     collections: List[str] | None,
@@ -157,53 +447,191 @@ def search_cmd(
     filter: str | None,
     filter_lang: str | None,
     sortby: List[str] | None,
+    keyset: bool,
     fields: List[str] | None,
+    output_format: str,
+    compact: bool,
+    workers: int,
     limit: int,
     max_items: int,
     method: HttpMethod | None,
     save: Path | None,
     timeout: int,
+    max_connections: int,
+    http2: bool,
+    tiled: bool,
+    tile_size: float | None,
+    wire_log: bool,
+    wire_log_max_body: int,
+    cache: Path | None,
+    cache_ttl: float,
+    cache_max_size: int,
+    refresh_cache: bool,
+    stream: bool,
+    simplify_tolerance: float | None,
+    precision: int | None,
+    max_wkt_length: int | None,
+    geometry_fallback: str,
 ):
     try:
-        ast: AstType | None = None
-
-        if filter:
-            if FilterLang.CQL2_JSON.value == filter_lang:
-                ast = parse_cql2_json(filter)
-            else:
-                ast = parse_ecql(filter)  # type: ignore
-
-        if collections:
-            ast = collections_filter(ast, collections)
-        if bbox:
-            ast = bbox_filter(ast, bbox)
-        if datetime:
-            ast = datetime_or_interval_filter(ast, datetime)
-
-        if ast is None:
+        ast: AstType = _build_filter(collections, bbox, datetime, filter, filter_lang)
+
+        if simplify_tolerance or precision is not None or max_wkt_length:
+            ast = reduce_geometries(
+                ast,
+                GeometryOptions(
+                    simplify_tolerance=simplify_tolerance,
+                    precision=precision,
+                    max_wkt_length=max_wkt_length,
+                    fallback=geometry_fallback,
+                ),
+            )
+
+        # request only what the output format needs, plus the requested fields
+        select, expand = resolve_fields(
+            fields or (), OUTPUT_REQUIRED_FIELDS[output_format]
+        )
+
+        orderby: List[str] = resolve_sortby(sortby or ())
+        if keyset:
+            keyset_descending(orderby)
+        if workers > 1 and OutputFormat.STAC.value != output_format:
+            logger.warning(
+                f"--workers is not honored by the {output_format} output, only the STAC conversion runs in parallel."
+            )
+        if keyset and tiled:
             raise Exception(
-                "At least one of the --filter|--collections|--bbox|--datetime option must be set."
+                "--keyset pagination cannot be combined with --tiled, the tiles are searched independently."
             )
 
-        cql2_json_str = to_cql2(ast)
-        result: Mapping[str, Any] = http_invoke(
-            base_url=url,
-            cql2_filter=cql2_json_str,
+        products: Iterator[Mapping[str, Any]] = _iter_search(
+            url=url,
+            ast=ast,
             limit=limit,
             max_items=max_items,
             timeout=timeout,
+            max_connections=max_connections,
+            http2=http2,
+            tiled=tiled,
+            tile_size=tile_size,
+            wire_logging=WireLogging(max_body_size=wire_log_max_body)
+            if wire_log
+            else None,
+            cache=ResponseCache(cache, ttl=cache_ttl, max_size=cache_max_size)
+            if cache
+            else None,
+            bypass_cache=refresh_cache,
+            select=select,
+            expand=expand,
+            orderby=orderby,
+            keyset=keyset,
+            stream=stream,
         )
 
+        indent: int | None = None if compact else 2
+
         if save:
             save.parent.mkdir(parents=True, exist_ok=True)
-            with save.open("w") as output_stream:
-                to_stac_item_collection(url, result, output_stream)
+
+        _write_output(
+            output_format,
+            url,
+            products,
+            save,
+            indent,
+            workers,
+            collection_names(ast),
+        )
+
+        if save:
             logger.success(
-                f"'Results successfully converted to STAC Item Collection to {save.absolute()}."
+                f"'Results successfully converted to {output_format} to {save.absolute()}."
             )
         else:
-            to_stac_item_collection(url, result, sys.stdout)
-            logger.success("Results successfully converted to STAC Item Collection.")
+            logger.success(f"Results successfully converted to {output_format}.")
+
+        logger.info(
+            "------------------------------------------------------------------------"
+        )
+        logger.success("BUILD SUCCESS")
+    except Exception as e:
+        logger.info(
+            "------------------------------------------------------------------------"
+        )
+        logger.error("BUILD FAILED")
+        logger.error(f"An unexpected error occurred: {e}")
+
+
+@main.command("count")
+@click.argument("url", type=click.STRING)
+@click.option(
+    "-c",
+    "--collections",
+    multiple=True,
+    required=False,
+    help="One or more collection IDs.",
+)
+@click.option(
+    "--bbox",
+    type=(click.FLOAT, click.FLOAT, click.FLOAT, click.FLOAT),
+    required=False,
+    help="Bounding box (min lon, min lat, max lon, max lat).",
+)
+@click.option(
+    "--datetime",
+    type=click.STRING,
+    required=False,
+    help="Single datetime or begin and end datetime (e.g., 2017-01-01/2017-02-15)",
+)
+@click.option(
+    "--filter",
+    type=click.STRING,
+    required=False,
+    help="Filter on queryables using language specified in filter-lang parameter",
+)
+@click.option(
+    "--filter-lang",
+    help="Filter language used within the filter parameter",
+    type=click.Choice(
+        [FilterLang.CQL2_JSON.value, FilterLang.CQL2_TEXT.value], case_sensitive=False
+    ),
+    default=FilterLang.CQL2_JSON.value,
+)
+@click.option(
+    "--timeout",
+    type=click.INT,
+    required=True,
+    default=30,
+    help="Connection timeout, in seconds",
+)
+@click.option(
+    "--wire-log/--no-wire-log",
+    required=False,
+    default=False,
+    help="Log the HTTP requests and responses exchanged with the OData endpoint, at DEBUG level",
+)
+def count_cmd(
+    url: str,
+    collections: List[str] | None,
+    bbox: Tuple[float, ...] | None,
+    datetime: str | None,
+    filter: str | None,
+    filter_lang: str | None,
+    timeout: int,
+    wire_log: bool,
+):
+    """Print how many OData Products match the search criteria, via $count."""
+    try:
+        ast: AstType = _build_filter(collections, bbox, datetime, filter, filter_lang)
+
+        with CDSEClient(
+            timeout=timeout, wire_logging=WireLogging() if wire_log else None
+        ) as client:
+            matching: int = count(
+                base_url=url, cql2_filter=ast, timeout=timeout, client=client
+            )
+
+        click.echo(matching)
 
         logger.info(
             "------------------------------------------------------------------------"
@@ -0,0 +1,406 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from builtins import isinstance
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from http import HTTPStatus
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    BaseTransport,
+    Client,
+    Headers,
+    Limits,
+    Request,
+    RequestNotRead,
+    Response,
+)
+from loguru import logger
+from pygeocdse.cache import ResponseCache
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+import asyncio
+import re
+import threading
+
+
+def _decode(value):
+    if not value:
+        return ""
+
+    if isinstance(value, str):
+        return value
+
+    return value.decode("utf-8")
+
+
+@dataclass(frozen=True)
+class WireLogging:
+    """
+    HTTP wire logging settings of a client session; wire logging is disabled unless an
+    instance is passed in.
+
+    Messages are formatted only when `level` is enabled on the loguru sink(s), bodies
+    are truncated to `max_body_size` bytes and headers are summarized on one line.
+    """
+
+    level: str = "DEBUG"
+    max_body_size: int = 1024
+
+
+ERROR_WIRE_LOGGING = WireLogging(level="ERROR")
+
+
+def _truncate(content: bytes | str, max_size: int) -> str:
+    if len(content) <= max_size:
+        return _decode(content)
+
+    head = content[:max_size]
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="replace")
+    return f"{head}... [{len(content) - max_size} more bytes]"
+
+
+def _headers_summary(headers: Headers) -> str:
+    return "; ".join(
+        f"{_decode(name)}: "
+        + re.sub(
+            r"(\bBearer\s+)[^\s]+",
+            r"\1********",
+            _decode(value),
+            flags=re.IGNORECASE,
+        )
+        for name, value in headers.raw
+    )
+
+
+def _request_body(request: Request, max_size: int) -> str:
+    try:
+        return _truncate(request.content, max_size)
+    except RequestNotRead:
+        return "[REQUEST BUILT FROM STREAM, OMISSING]"
+
+
+def _log_request(func, wire_logging: WireLogging):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        request: Request = func(*args, **kwargs)
+
+        log = logger.opt(lazy=True).log
+        level: str = wire_logging.level
+        log(level, "> {} {}", lambda: request.method, lambda: request.url)
+        log(level, "> {}", lambda: _headers_summary(request.headers))
+        log(
+            level,
+            "> {}",
+            lambda: _request_body(request, wire_logging.max_body_size),
+        )
+
+        return request
+
+    return wrapper
+
+
+class ServerError(RuntimeError):
+    """
+    Raised when the catalogue answers with an HTTP error status, which is kept in
+    `status_code` so that callers can tell a rejected request from a failing server.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _log_http_response(
+    response: Response, wire_logging: Optional[WireLogging], streamed: bool = False
+):
+    if HTTPStatus.MULTIPLE_CHOICES._value_ <= response.status_code:
+        # errors are always reported, regardless of the wire logging settings
+        wire_logging = ERROR_WIRE_LOGGING
+    elif wire_logging is None:
+        return
+
+    log = logger.opt(lazy=True).log
+    level: str = wire_logging.level
+    status: HTTPStatus = HTTPStatus(response.status_code)
+    log(level, "< {} {}", lambda: status._value_, lambda: status.phrase)
+    log(level, "< {}", lambda: _headers_summary(response.headers))
+    log(
+        level,
+        "< {}",
+        lambda: "<streamed body>"
+        if streamed and not response.is_stream_consumed
+        else _truncate(response.content, wire_logging.max_body_size),
+    )
+
+    if HTTPStatus.MULTIPLE_CHOICES._value_ <= response.status_code:
+        raise ServerError(
+            f"A server error occurred when invoking {response.request.method} {response.request.url}, read the logs for details",
+            response.status_code,
+        )
+
+
+def _log_response(func, wire_logging: Optional[WireLogging]):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        response: Response = func(*args, **kwargs)
+        _log_http_response(response, wire_logging)
+        return response
+
+    return wrapper
+
+
+def _alog_response(func, wire_logging: Optional[WireLogging]):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        response: Response = await func(*args, **kwargs)
+        _log_http_response(response, wire_logging)
+        return response
+
+    return wrapper
+
+
+class CDSEClient:
+    """
+    Long-lived HTTP session towards the CDSE OData catalogue.
+
+    A single pooled `httpx.Client` is shared by all the searches issued through the same
+    instance, so that TCP connections (and TLS sessions) are kept alive and reused
+    across requests; it is safe to share one instance among several threads.
+
+    HTTP/2 support requires the optional `h2` package, i.e.
+    `pip install pygeofilter-odata-cdse[http2]`.
+
+    When a `cache` is set, successful GET responses are stored there and served back
+    without contacting the catalogue, unless the cache is explicitly bypassed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: int = 30,
+        wire_logging: Optional[WireLogging] = None,
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[BaseTransport] = None,
+    ):
+        self._lock = threading.Lock()
+        self.cache = cache
+        self.wire_logging = wire_logging
+        self._http_client: Client | None = Client(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            timeout=timeout,
+            transport=transport,
+        )
+        if wire_logging is not None:
+            self._http_client.build_request = _log_request(  # type: ignore
+                self._http_client.build_request, wire_logging
+            )
+        self._http_client.request = _log_response(  # type: ignore
+            self._http_client.request, wire_logging
+        )
+
+    @property
+    def http_client(self) -> Client:
+        http_client = self._http_client
+        if http_client is None:
+            raise RuntimeError("The CDSE client session has already been closed")
+        return http_client
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[int] = None,
+        bypass_cache: bool = False,
+    ) -> Response:
+        if self.cache is not None and not bypass_cache:
+            content: bytes | None = self.cache.get(url, headers)
+            if content is not None:
+                return Response(
+                    HTTPStatus.OK._value_,
+                    headers={"Content-Type": "application/json"},
+                    content=content,
+                    request=Request("GET", url, headers=headers),
+                )
+
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        response: Response = self.http_client.get(url=url, headers=headers, **kwargs)
+
+        if self.cache is not None and HTTPStatus.OK._value_ == response.status_code:
+            self.cache.put(url, headers, response.content)
+
+        return response
+
+    @contextmanager
+    def stream(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[int] = None,
+        bypass_cache: bool = False,
+    ) -> Iterator[Iterator[bytes]]:
+        """
+        GET the input URL, providing the response body chunk by chunk as it arrives,
+        rather than holding it all in memory.
+
+        When a `cache` is set, the body is also collected to be cached, hence it is
+        held in memory anyway.
+        """
+        if self.cache is not None and not bypass_cache:
+            content: bytes | None = self.cache.get(url, headers)
+            if content is not None:
+                yield iter((content,))
+                return
+
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        with self.http_client.stream("GET", url, headers=headers, **kwargs) as response:
+            if HTTPStatus.MULTIPLE_CHOICES._value_ <= response.status_code:
+                # error bodies are small, read them to report them
+                response.read()
+            _log_http_response(response, self.wire_logging, streamed=True)
+
+            if self.cache is None:
+                yield response.iter_bytes()
+                return
+
+            chunks: List[bytes] = []
+
+            def collect() -> Iterator[bytes]:
+                for chunk in response.iter_bytes():
+                    chunks.append(chunk)
+                    yield chunk
+
+            yield collect()
+
+            if response.is_stream_consumed:
+                self.cache.put(url, headers, b"".join(chunks))
+
+    def post(
+        self,
+        url: str,
+        content: bytes,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[int] = None,
+    ) -> Response:
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        # POST responses are never cached
+        return self.http_client.post(
+            url=url, content=content, headers=headers, **kwargs
+        )
+
+    def close(self):
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+
+    def __enter__(self) -> "CDSEClient":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AsyncCDSEClient:
+    """
+    asyncio counterpart of `CDSEClient`, built on a pooled `httpx.AsyncClient`.
+
+    At most `max_concurrency` requests are in flight at the same time, no matter how
+    many searches are running concurrently on the event loop through this instance.
+    """
+
+    max_concurrency: int
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: int = 30,
+        max_concurrency: int = 10,
+        wire_logging: Optional[WireLogging] = None,
+        transport: Optional[AsyncBaseTransport] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http_client: AsyncClient | None = AsyncClient(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            timeout=timeout,
+            transport=transport,
+        )
+        if wire_logging is not None:
+            self._http_client.build_request = _log_request(  # type: ignore
+                self._http_client.build_request, wire_logging
+            )
+        self._http_client.request = _alog_response(  # type: ignore
+            self._http_client.request, wire_logging
+        )
+
+    @property
+    def http_client(self) -> AsyncClient:
+        http_client = self._http_client
+        if http_client is None:
+            raise RuntimeError("The CDSE client session has already been closed")
+        return http_client
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[int] = None,
+    ) -> Response:
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        async with self._semaphore:
+            return await self.http_client.get(url=url, headers=headers, **kwargs)
+
+    async def aclose(self):
+        if self._http_client is not None:
+            http_client, self._http_client = self._http_client, None
+            await http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncCDSEClient":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
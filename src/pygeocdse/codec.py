@@ -0,0 +1,54 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+JSON codec shared by the OData responses decoding and the converters output.
+
+`orjson` is used when installed, i.e. `pip install pygeofilter-odata-cdse[speedups]`,
+falling back to the standard library `json` module otherwise.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+BACKEND = "orjson" if orjson is not None else "json"
+"""The name of the JSON backend in use."""
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any, indent: Optional[int] = None) -> str:
+    """
+    Serialize the input value to JSON, compact (i.e. without any whitespace) when
+    `indent` is not set.
+    """
+    if orjson is not None and indent in (None, 0, 2):
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0).decode(
+            "utf-8"
+        )
+
+    if indent:
+        return json.dumps(value, indent=indent)
+    return json.dumps(value, separators=(",", ":"))
@@ -0,0 +1,165 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from itertools import chain, islice
+from pygeocdse import codec
+from shapely.errors import GEOSException
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import numpy
+import shapely
+
+BOUNDS_CHUNK_SIZE = 100
+"""How many Products `iter_bounds` computes the bboxes of at once."""
+
+
+def parse_geometries(
+    geometries: Sequence[Optional[Mapping[str, Any]]],
+) -> numpy.ndarray:
+    """
+    Parse the input GeoJSON geometries, of any type, into an array of shapely
+    geometries, in a single vectorized pass; missing geometries are `None`.
+
+    Only needed when the geometries themselves are written, e.g. as GeoParquet WKB,
+    `geometries_bounds` does not parse them.
+    """
+    try:
+        return shapely.from_geojson(
+            numpy.array(
+                [
+                    codec.dumps(geometry) if geometry else None
+                    for geometry in geometries
+                ],
+                dtype=object,
+            )
+        )
+    except GEOSException as e:
+        raise ValueError(f"Unsupported GeoJSON geometry: {e}") from e
+
+
+POSITIONS_DEPTH: Dict[str, int] = {
+    "Point": 0,
+    "MultiPoint": 1,
+    "LineString": 1,
+    "MultiLineString": 2,
+    "Polygon": 2,
+    "MultiPolygon": 3,
+}
+"""How deep the positions are nested in the `coordinates`, by GeoJSON geometry type."""
+
+
+def _positions(geometry: Mapping[str, Any]) -> List[Sequence[float]]:
+    type = geometry.get("type")
+    if "GeometryCollection" == type:
+        return [
+            position
+            for member in geometry.get("geometries") or []
+            for position in _positions(member)
+        ]
+
+    depth: Optional[int] = POSITIONS_DEPTH.get(str(type))
+    if depth is None:
+        raise ValueError(f"Unsupported GeoJSON geometry type: {type}")
+
+    coordinates: Any = geometry.get("coordinates") or []
+    if 0 == depth:
+        return [coordinates] if coordinates else []
+
+    for _ in range(depth - 1):
+        coordinates = list(chain.from_iterable(coordinates))
+    return list(coordinates)
+
+
+def _xy(positions: List[Sequence[float]]) -> numpy.ndarray:
+    xy: numpy.ndarray = numpy.fromiter(chain.from_iterable(positions), dtype=float)
+    if xy.size == 2 * len(positions):
+        return xy.reshape(-1, 2)
+
+    # 3D positions, possibly mixed with 2D ones
+    return numpy.array([position[:2] for position in positions], dtype=float)
+
+
+def geometries_bounds(
+    geometries: Sequence[Optional[Mapping[str, Any]]],
+) -> List[Optional[List[float]]]:
+    """
+    Compute the `[minx, miny, maxx, maxy]` bbox of each of the input GeoJSON geometries,
+    of any type, straight from their coordinates: the positions of all the geometries
+    are reduced together, in a single vectorized pass.
+
+    Missing and empty geometries have no bbox, i.e. `None`.
+    """
+    positions: List[Sequence[float]] = []
+    counts: List[int] = []
+    for geometry in geometries:
+        geometry_positions = _positions(geometry) if geometry else []
+        positions.extend(geometry_positions)
+        counts.append(len(geometry_positions))
+
+    bboxes: List[Optional[List[float]]] = [None] * len(geometries)
+    if not positions:
+        return bboxes
+
+    xy: numpy.ndarray = _xy(positions)
+    # the empty geometries have no positions, the others are contiguous
+    non_empty: numpy.ndarray = numpy.flatnonzero(counts)
+    offsets: numpy.ndarray = (numpy.cumsum(counts) - counts)[non_empty]
+    bounds: numpy.ndarray = numpy.hstack(
+        (
+            numpy.minimum.reduceat(xy, offsets, axis=0),
+            numpy.maximum.reduceat(xy, offsets, axis=0),
+        )
+    )
+
+    for index, bbox in zip(non_empty.tolist(), bounds.tolist()):
+        bboxes[index] = bbox
+    return bboxes
+
+
+def geometry_bounds(geometry: Mapping[str, Any]) -> Optional[List[float]]:
+    """
+    Compute the `[minx, miny, maxx, maxy]` bbox of the input GeoJSON geometry.
+    """
+    return geometries_bounds([geometry])[0]
+
+
+def iter_bounds(
+    products: Iterable[Mapping[str, Any]], chunk_size: int = BOUNDS_CHUNK_SIZE
+) -> Iterator[Tuple[Mapping[str, Any], Optional[List[float]]]]:
+    """
+    Pair each OData Product with the bbox of its `GeoFootprint`, computed `chunk_size`
+    Products at a time, so that the streaming conversions benefit from
+    `geometries_bounds` too.
+    """
+    iterator: Iterator[Mapping[str, Any]] = iter(products)
+    while True:
+        chunk: List[Mapping[str, Any]] = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        yield from zip(
+            chunk,
+            geometries_bounds([product.get("GeoFootprint") for product in chunk]),
+        )
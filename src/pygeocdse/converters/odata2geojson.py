@@ -16,9 +16,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Mapping, TextIO, Optional
+from pygeocdse.converters.bounds import geometries_bounds, iter_bounds
+from pygeocdse.converters.streaming import write_feature_collection
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    TextIO,
+    Optional,
+    Tuple,
+)
 import geojson
 
+REQUIRED_FIELDS = ("Id", "GeoFootprint")
+"""The OData Product fields the GeoJSON conversion cannot do without."""
+
 
 def _parse_rfc3339(dt: Optional[str]) -> Optional[str]:
     """Normalize timestamps like '2025-01-28T15:50:03.000000Z' to RFC3339."""
@@ -29,32 +45,6 @@ def _parse_rfc3339(dt: Optional[str]) -> Optional[str]:
     return datetime.fromisoformat(dt).isoformat()
 
 
-def _bbox_from_geojson_geometry(geom: Dict[str, Any]) -> List[float]:
-    """Compute [minx, miny, maxx, maxy] from Polygon/MultiPolygon GeoJSON geometry."""
-    gtype = geom.get("type")
-    coords = geom.get("coordinates")
-
-    def iter_points_polygon(poly_coords):
-        for ring in poly_coords:
-            for x, y in ring:
-                yield x, y
-
-    def iter_points_multipolygon(mpoly_coords):
-        for poly in mpoly_coords:
-            yield from iter_points_polygon(poly)
-
-    if gtype == "Polygon":
-        pts = list(iter_points_polygon(coords))
-    elif gtype == "MultiPolygon":
-        pts = list(iter_points_multipolygon(coords))
-    else:
-        raise ValueError(f"Unsupported geometry type: {gtype}")
-
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-    return [min(xs), min(ys), max(xs), max(ys)]
-
-
 def _to_geojson_instance(obj: Dict[str, Any]) -> Any:
     """
     Convert a plain dict (already shaped like GeoJSON) into a geojson.* object.
@@ -65,11 +55,56 @@ def _to_geojson_instance(obj: Dict[str, Any]) -> Any:
 
 @dataclass(frozen=True)
 class FeatureBuildOptions:
-    feature_id_getter: Callable[[Dict[str, Any]], Any] = lambda p: p.get("Id")
+    feature_id_getter: Callable[[Mapping[str, Any]], Any] = lambda p: p.get("Id")
     include_bbox: bool = True
     property_filter: Optional[Callable[[str, Any], bool]] = None
 
 
+def _product_properties(
+    p: Mapping[str, Any], opts: FeatureBuildOptions
+) -> Dict[str, Any]:
+    content_date = p.get("ContentDate") or {}
+    props = {
+        "id": p.get("Id"),
+        "name": p.get("Name"),
+        "content_start": _parse_rfc3339(content_date.get("Start")),
+        "content_end": _parse_rfc3339(content_date.get("End")),
+        "origin_date": _parse_rfc3339(p.get("OriginDate")),
+        "publication_date": _parse_rfc3339(p.get("PublicationDate")),
+        "modification_date": _parse_rfc3339(p.get("ModificationDate")),
+        "online": p.get("Online"),
+        "s3_path": p.get("S3Path"),
+        "content_type": p.get("ContentType") or p.get("@odata.mediaContentType"),
+        "content_length": p.get("ContentLength"),
+        "checksum": p.get("Checksum"),
+    }
+    props = {k: v for k, v in props.items() if v is not None}
+
+    if opts.property_filter is not None:
+        props = {k: v for k, v in props.items() if opts.property_filter(k, v)}
+
+    return props
+
+
+class _BBoxAccumulator:
+    def __init__(self):
+        self.minx = self.miny = float("inf")
+        self.maxx = self.maxy = float("-inf")
+        self.saw_bbox = False
+
+    def add(self, bbox: List[float]):
+        self.minx = min(self.minx, bbox[0])
+        self.miny = min(self.miny, bbox[1])
+        self.maxx = max(self.maxx, bbox[2])
+        self.maxy = max(self.maxy, bbox[3])
+        self.saw_bbox = True
+
+    def bbox(self) -> Optional[List[float]]:
+        if not self.saw_bbox:
+            return None
+        return [self.minx, self.miny, self.maxx, self.maxy]
+
+
 def odata_products_to_feature_collection_geojson(
     odata: Mapping[str, Any],
     opts: FeatureBuildOptions = FeatureBuildOptions(),
@@ -87,42 +122,23 @@ def odata_products_to_feature_collection_geojson(
     features: List[geojson.Feature] = []
 
     # Optional top-level bbox
-    minx = miny = float("inf")
-    maxx = maxy = float("-inf")
-    saw_bbox = False
+    overall_bbox = _BBoxAccumulator()
+
+    bboxes: List[Optional[List[float]]] = (
+        geometries_bounds([p.get("GeoFootprint") for p in products])
+        if opts.include_bbox
+        else [None] * len(products)
+    )
 
-    for p in products:
+    for p, bbox in zip(products, bboxes):
         geom_dict = p.get("GeoFootprint")
         if not geom_dict:
             continue
 
-        bbox = _bbox_from_geojson_geometry(geom_dict) if opts.include_bbox else None
         if bbox:
-            minx = min(minx, bbox[0])
-            miny = min(miny, bbox[1])
-            maxx = max(maxx, bbox[2])
-            maxy = max(maxy, bbox[3])
-            saw_bbox = True
-
-        content_date = p.get("ContentDate") or {}
-        props = {
-            "id": p.get("Id"),
-            "name": p.get("Name"),
-            "content_start": _parse_rfc3339(content_date.get("Start")),
-            "content_end": _parse_rfc3339(content_date.get("End")),
-            "origin_date": _parse_rfc3339(p.get("OriginDate")),
-            "publication_date": _parse_rfc3339(p.get("PublicationDate")),
-            "modification_date": _parse_rfc3339(p.get("ModificationDate")),
-            "online": p.get("Online"),
-            "s3_path": p.get("S3Path"),
-            "content_type": p.get("ContentType") or p.get("@odata.mediaContentType"),
-            "content_length": p.get("ContentLength"),
-            "checksum": p.get("Checksum"),
-        }
-        props = {k: v for k, v in props.items() if v is not None}
-
-        if opts.property_filter is not None:
-            props = {k: v for k, v in props.items() if opts.property_filter(k, v)}
+            overall_bbox.add(bbox)
+
+        props = _product_properties(p, opts)
 
         geom = _to_geojson_instance(geom_dict)
 
@@ -144,16 +160,86 @@ def odata_products_to_feature_collection_geojson(
         # non-standard but often handy
         fc["next"] = next_link
 
-    if opts.include_bbox and saw_bbox:
-        fc["bbox"] = [minx, miny, maxx, maxy]
+    if opts.include_bbox and overall_bbox.saw_bbox:
+        fc["bbox"] = overall_bbox.bbox()
 
     return fc
 
 
+def iter_features(
+    products: Iterable[Mapping[str, Any]],
+    opts: FeatureBuildOptions = FeatureBuildOptions(),
+    overall_bbox: Optional[_BBoxAccumulator] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily convert OData Products to plain GeoJSON Feature dicts.
+
+    Unlike `odata_products_to_feature_collection_geojson`, the `GeoFootprint` dict is
+    reused as-is as the Feature geometry, without round-tripping it through geojson.
+    """
+    pairs: Iterable[Tuple[Mapping[str, Any], Optional[List[float]]]] = (
+        iter_bounds(products) if opts.include_bbox else ((p, None) for p in products)
+    )
+
+    for p, bbox in pairs:
+        geom_dict = p.get("GeoFootprint")
+        if not geom_dict:
+            continue
+
+        feature: Dict[str, Any] = {"type": "Feature"}
+
+        feature_id = opts.feature_id_getter(p)
+        if feature_id is not None:
+            feature["id"] = feature_id
+
+        feature["geometry"] = geom_dict
+        feature["properties"] = _product_properties(p, opts)
+
+        if opts.include_bbox and bbox is not None:
+            feature["bbox"] = bbox
+            if overall_bbox is not None:
+                overall_bbox.add(bbox)
+
+        yield feature
+
+
+def write_feature_collection_geojson(
+    products: Iterable[Mapping[str, Any]],
+    output_stream: TextIO,
+    opts: FeatureBuildOptions = FeatureBuildOptions(),
+    next_link: Optional[str] = None,
+    indent: Optional[int] = 2,
+) -> int:
+    """
+    Convert the OData Products to GeoJSON Features and write them to the output stream,
+    one at a time, as soon as the input iterable produces them.
+
+    The top-level `next` link and `bbox` are written in the trailer, once all the
+    Features have been written.
+
+    Returns the number of written Features.
+    """
+    overall_bbox = _BBoxAccumulator()
+
+    def trailer() -> Dict[str, Any]:
+        members: Dict[str, Any] = {}
+        if next_link:
+            # non-standard but often handy
+            members["next"] = next_link
+        if opts.include_bbox and overall_bbox.saw_bbox:
+            members["bbox"] = overall_bbox.bbox()
+        return members
+
+    return write_feature_collection(
+        output_stream, iter_features(products, opts, overall_bbox), trailer, indent
+    )
+
+
 def to_feature_collection_geojson(
     odata: Mapping[str, Any],
     output_stream: TextIO,
     opts: FeatureBuildOptions = FeatureBuildOptions(),
 ):
-    feature_collection = odata_products_to_feature_collection_geojson(odata, opts)
-    output_stream.write(geojson.dumps(feature_collection, indent=2))
+    write_feature_collection_geojson(
+        odata.get("value") or [], output_stream, opts, odata.get("@odata.nextLink")
+    )
@@ -0,0 +1,310 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import islice
+from loguru import logger
+from pathlib import Path
+from pygeocdse import codec
+from pygeocdse.converters.bounds import parse_geometries
+from pygeocdse.odata_attributes import ATTRIBUTE_TYPES, COLLECTION_ATTRIBUTES
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+import numpy
+import shapely
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+REQUIRED_FIELDS = (
+    "Id",
+    "Name",
+    "ContentType",
+    "ContentLength",
+    "OriginDate",
+    "PublicationDate",
+    "ModificationDate",
+    "Online",
+    "S3Path",
+    "ContentDate",
+    "GeoFootprint",
+    "Attributes",
+)
+"""The OData Product fields the GeoParquet conversion reads."""
+
+GEOPARQUET_BATCH_SIZE = 1000
+"""How many Products are buffered before being written as a Parquet row group."""
+
+GEOPARQUET_VERSION = "1.1.0"
+
+COMMON_ATTRIBUTES = {
+    "beginningDateTime": "DateTimeOffset",
+    "endingDateTime": "DateTimeOffset",
+}
+"""The attributes all the Products declare, even if they cannot be queried."""
+
+
+def _parse_rfc3339(dt: Optional[str]) -> Optional[datetime]:
+    """Parse timestamps like '2025-01-28T15:50:03.000000Z' into aware datetime."""
+    if not dt:
+        return None
+    if dt.endswith("Z"):
+        dt = dt[:-1] + "+00:00"
+    return datetime.fromisoformat(dt)
+
+
+def _arrow_types() -> Dict[str, Any]:
+    timestamp = pyarrow.timestamp("us", tz="UTC")
+    return {
+        "String": pyarrow.string(),
+        "Integer": pyarrow.int64(),
+        "Double": pyarrow.float64(),
+        "Boolean": pyarrow.bool_(),
+        "DateTimeOffset": timestamp,
+    }
+
+
+VALUE_PARSERS: Dict[str, Callable[[Any], Any]] = {
+    "String": str,
+    "Integer": int,
+    "Double": float,
+    "Boolean": bool,
+    "DateTimeOffset": lambda value: _parse_rfc3339(str(value)),
+}
+"""How the OData attribute values are parsed, by OData type."""
+
+# column name -> (OData type, Product getter)
+PRODUCT_COLUMNS: Dict[str, Any] = {
+    "id": ("String", lambda p: p.get("Id")),
+    "name": ("String", lambda p: p.get("Name")),
+    "content_start": (
+        "DateTimeOffset",
+        lambda p: (p.get("ContentDate") or {}).get("Start"),
+    ),
+    "content_end": (
+        "DateTimeOffset",
+        lambda p: (p.get("ContentDate") or {}).get("End"),
+    ),
+    "origin_date": ("DateTimeOffset", lambda p: p.get("OriginDate")),
+    "publication_date": ("DateTimeOffset", lambda p: p.get("PublicationDate")),
+    "modification_date": ("DateTimeOffset", lambda p: p.get("ModificationDate")),
+    "online": ("Boolean", lambda p: p.get("Online")),
+    "s3_path": ("String", lambda p: p.get("S3Path")),
+    "content_type": (
+        "String",
+        lambda p: p.get("ContentType") or p.get("@odata.mediaContentType"),
+    ),
+    "content_length": ("Integer", lambda p: p.get("ContentLength")),
+}
+"""The columns of the OData Product properties, named as the GeoJSON properties."""
+
+
+def attribute_types(collections: Sequence[str] = ()) -> Dict[str, str]:
+    """
+    Return the OData type of the attributes the Products of the input collections
+    declare, by name; the attributes of all the known collections when none is given.
+    """
+    types: Dict[str, str] = dict(COMMON_ATTRIBUTES)
+
+    known_collections = [c for c in collections if c in COLLECTION_ATTRIBUTES]
+    if not known_collections:
+        types.update(ATTRIBUTE_TYPES)
+        return types
+
+    for collection in known_collections:
+        for name, type in COLLECTION_ATTRIBUTES[collection].items():
+            # first declaration wins, as in ATTRIBUTE_TYPES
+            types.setdefault(name, type)
+    return types
+
+
+def geoparquet_schema(attributes: Mapping[str, str]) -> Any:
+    """
+    Build the Arrow schema of the GeoParquet file: the Product properties, the WKB
+    `geometry`, its `bbox` covering and one typed column per attribute.
+    """
+    types = _arrow_types()
+    fields = [
+        pyarrow.field(name, types[type]) for name, (type, _) in PRODUCT_COLUMNS.items()
+    ]
+    fields.append(pyarrow.field("geometry", pyarrow.binary()))
+    fields.append(
+        pyarrow.field(
+            "bbox",
+            pyarrow.struct(
+                [
+                    pyarrow.field(name, pyarrow.float64())
+                    for name in ("xmin", "ymin", "xmax", "ymax")
+                ]
+            ),
+        )
+    )
+    fields.extend(pyarrow.field(name, types[type]) for name, type in attributes.items())
+
+    # the schema is written before any row, the geometry types are left unspecified
+    geo: Dict[str, Any] = {
+        "version": GEOPARQUET_VERSION,
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": [],
+                "covering": {
+                    "bbox": {
+                        "xmin": ["bbox", "xmin"],
+                        "ymin": ["bbox", "ymin"],
+                        "xmax": ["bbox", "xmax"],
+                        "ymax": ["bbox", "ymax"],
+                    }
+                },
+            }
+        },
+    }
+    return pyarrow.schema(fields, metadata={"geo": codec.dumps(geo)})
+
+
+def _parse_value(type: str, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        return VALUE_PARSERS[type](value)
+    except (TypeError, ValueError):
+        logger.warning(f"Value {value!r} is not a valid {type}, writing null instead.")
+        return None
+
+
+def _record_batch(
+    products: List[Mapping[str, Any]],
+    schema: Any,
+    attributes: Mapping[str, str],
+    unknown_attributes: Set[str],
+) -> Any:
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+
+    for product in products:
+        for name, (type, getter) in PRODUCT_COLUMNS.items():
+            columns[name].append(_parse_value(type, getter(product)))
+
+        values: Dict[str, Any] = {
+            str(attribute.get("Name")): attribute.get("Value")
+            for attribute in product.get("Attributes") or []
+        }
+        for name, type in attributes.items():
+            columns[name].append(_parse_value(type, values.get(name)))
+
+        for name in values.keys() - attributes.keys() - unknown_attributes:
+            unknown_attributes.add(name)
+            logger.warning(
+                f"Attribute '{name}' has no declared type, it is not written to GeoParquet."
+            )
+
+    geometries: numpy.ndarray = parse_geometries(
+        [product.get("GeoFootprint") for product in products]
+    )
+    bounds: numpy.ndarray = shapely.bounds(geometries)
+
+    arrays: List[Any] = []
+    for field in schema:
+        if "geometry" == field.name:
+            arrays.append(pyarrow.array(shapely.to_wkb(geometries), field.type))
+        elif "bbox" == field.name:
+            missing = numpy.isnan(bounds).any(axis=1)
+            arrays.append(
+                pyarrow.StructArray.from_arrays(
+                    [pyarrow.array(bounds[:, i]) for i in range(4)],
+                    fields=list(field.type),
+                    mask=pyarrow.array(missing),
+                )
+            )
+        else:
+            arrays.append(pyarrow.array(columns[field.name], field.type))
+
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _chunks(
+    products: Iterable[Mapping[str, Any]], size: int
+) -> Iterator[List[Mapping[str, Any]]]:
+    iterator = iter(products)
+    while True:
+        chunk: List[Mapping[str, Any]] = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_geoparquet(
+    products: Iterable[Mapping[str, Any]],
+    output: Union[str, Path, BinaryIO],
+    collections: Sequence[str] = (),
+    batch_size: int = GEOPARQUET_BATCH_SIZE,
+    compression: str = "zstd",
+) -> int:
+    """
+    Write the OData Products to a GeoParquet file, `batch_size` rows at a time, as soon
+    as the input iterable produces them.
+
+    Footprints are written as WKB, dates as UTC timestamps and the Attributes as one
+    column each, typed after the attribute types of the input `collections` (all the
+    known collections when none is given); requires the optional `pyarrow` package.
+
+    Returns the number of written rows.
+    """
+    if pyarrow is None:
+        raise ImportError(
+            "GeoParquet output requires the optional 'pyarrow' package, i.e. `pip install pygeofilter-odata-cdse[geoparquet]`"
+        )
+
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be a positive integer, {batch_size} given")
+
+    attributes: Dict[str, str] = {
+        name: type
+        for name, type in attribute_types(collections).items()
+        if name not in PRODUCT_COLUMNS
+    }
+    schema = geoparquet_schema(attributes)
+    unknown_attributes: Set[str] = set()
+
+    count: int = 0
+    with pyarrow.parquet.ParquetWriter(
+        output if not isinstance(output, Path) else str(output),
+        schema,
+        compression=compression,
+    ) as writer:
+        for chunk in _chunks(products, batch_size):
+            writer.write_batch(
+                _record_batch(chunk, schema, attributes, unknown_attributes)
+            )
+            count += len(chunk)
+            logger.debug(f"{count} Product(s) written to GeoParquet.")
+
+    return count
@@ -14,8 +14,17 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from loguru import logger
+from pygeocdse.converters.bounds import (
+    geometries_bounds,
+    geometry_bounds,
+    iter_bounds,
+)
+from pygeocdse.converters.parallel import PARALLEL_CHUNK_SIZE, imap_chunks
+from pygeocdse.converters.streaming import write_feature_collection
 from pystac import Asset, Item, ItemCollection, Link, RelType
 from pystac.extensions.processing import ProcessingExtension
 from pystac.extensions.product import ProductExtension
@@ -23,9 +32,31 @@ from pystac.extensions.sentinel1 import Sentinel1Extension
 from pystac.extensions.sar import Polarization, SarExtension
 from pystac.extensions.sat import OrbitState, SatExtension
 from pystac.extensions.eo import EOExtension
-from typing import Any, Dict, List, Mapping, Protocol, TextIO
-
-import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    TextIO,
+    Tuple,
+)
+
+REQUIRED_FIELDS = (
+    "Id",
+    "Name",
+    "GeoFootprint",
+    "ContentType",
+    "ContentLength",
+    "Checksum",
+    "S3Path",
+    "Attributes",
+    "Locations",
+)
+"""The OData Product fields the STAC conversion reads, `Assets` are not needed."""
 
 LEVEL_MAP = {
     "LEVEL1": "L1",
@@ -49,6 +80,13 @@ def _parse_rfc3339(dt: str) -> datetime:
 
 
 class Handler(Protocol):
+    """
+    Map the `value` of an OData Product attribute onto the target Item.
+
+    During the conversion, `product` is an `IndexedProduct`, whose `attributes` hold
+    all the Product attributes values, by name.
+    """
+
     def __call__(
         self, product: Mapping[str, Any], value: Any, target_item: Item
     ) -> None: ...
@@ -140,16 +178,22 @@ def on_swath_identifier(product: Mapping[str, Any], value: Any, target_item: Ite
     )
 
 
+def _attribute_values(product: Mapping[str, Any]) -> Mapping[str, Any]:
+    attributes: Optional[Mapping[str, Any]] = getattr(product, "attributes", None)
+    if attributes is None:
+        attributes = {
+            str(attribute.get("Name")): attribute.get("Value")
+            for attribute in product.get("Attributes") or []
+        }
+    return attributes
+
+
 def on_platform_short_name(product: Mapping[str, Any], value: Any, target_item: Item):
     # Example: SENTINEL-1 -> sentinel-1
     target_item.properties["constellation"] = str(value).lower()
     target_item.properties["platform"] = (
         str(value).lower()
-        + [
-            attribute.get("Value").lower()
-            for attribute in product.get("Attributes", {})
-            if attribute.get("Name") == "platformSerialIdentifier"
-        ][0]
+        + str(_attribute_values(product).get("platformSerialIdentifier") or "").lower()
     )
 
 
@@ -190,167 +234,294 @@ DISPATCH_REGISTRY: Dict[str, Handler] = {
     "sliceNumber": on_slice_number,
 }
 
+HANDLER_EXTENSIONS: Dict[str, Tuple[Any, ...]] = {
+    "orbitNumber": (SatExtension,),
+    "relativeOrbitNumber": (SatExtension,),
+    "orbitDirection": (SatExtension,),
+    "polarisationChannels": (SarExtension,),
+    "operationalMode": (SarExtension,),
+    "swathIdentifier": (SarExtension,),
+    "productType": (ProductExtension,),
+    "timeliness": (ProductExtension,),
+    "processingCenter": (ProcessingExtension,),
+    "processingLevel": (ProcessingExtension,),
+    "processingDate": (ProcessingExtension,),
+    "processorName": (ProcessingExtension,),
+    "processorVersion": (ProcessingExtension,),
+    "cloudCover": (EOExtension,),
+    "sliceNumber": (Sentinel1Extension,),
+}
+"""The STAC extensions the `DISPATCH_REGISTRY` handlers write to, by attribute name."""
+
+# Attributes read by other handlers, e.g. on_platform_short_name
+PASSIVE_ATTRIBUTES = ("platformSerialIdentifier",)
+
 # Convert
 
 
-def _bbox_from_geojson_geometry(geom: Dict[str, Any]) -> List[float]:
+class IndexedProduct(Mapping[str, Any]):
     """
-    Compute [minx, miny, maxx, maxy] from a GeoJSON geometry.
-    Supports Polygon and MultiPolygon.
+    Read-only view of an OData Product, handed to the `DISPATCH_REGISTRY` handlers,
+    which also exposes the Product attributes values, by name, indexed once.
     """
-    gtype = geom.get("type")
-    coords = geom.get("coordinates")
-
-    def iter_points_polygon(poly_coords):
-        for ring in poly_coords:
-            for x, y in ring:
-                yield x, y
-
-    def iter_points_multipolygon(mpoly_coords):
-        for poly in mpoly_coords:
-            yield from iter_points_polygon(poly)
-
-    if gtype == "Polygon":
-        pts = list(iter_points_polygon(coords))
-    elif gtype == "MultiPolygon":
-        pts = list(iter_points_multipolygon(coords))
-    else:
-        raise ValueError(f"Unsupported geometry type: {gtype}")
 
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-    return [min(xs), min(ys), max(xs), max(ys)]
+    def __init__(self, product: Mapping[str, Any], attributes: Mapping[str, Any]):
+        self._product = product
+        self.attributes = attributes
 
+    def __getitem__(self, key: str) -> Any:
+        return self._product[key]
 
-def odata_products_to_stac_item_collection(
-    url: str, odata: Mapping[str, Any]
-) -> ItemCollection:
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._product)
+
+    def __len__(self) -> int:
+        return len(self._product)
+
+
+@dataclass(frozen=True)
+class _ConversionPlan:
+    handlers: Tuple[Tuple[str, Handler], ...]
+    stac_extensions: Tuple[str, ...]
+
+
+@lru_cache(maxsize=256)
+def _conversion_plan(names: Tuple[str, ...]) -> _ConversionPlan:
     """
-    Convert an OData Products response to a PySTAC ItemCollection.
+    Compile the handlers and the STAC extensions needed to convert the Products that
+    declare the input attributes, i.e. the Products of the same collection (and product
+    type) which share the same plan.
+    """
+    handlers: List[Tuple[str, Handler]] = []
+    stac_extensions: List[str] = []
+    for name in names:
+        if name in DISPATCH_REGISTRY:
+            handlers.append((name, DISPATCH_REGISTRY[name]))
+            for extension in HANDLER_EXTENSIONS.get(name, ()):
+                schema_uri: str = extension.get_schema_uri()
+                if schema_uri not in stac_extensions:
+                    stac_extensions.append(schema_uri)
+        elif name not in PASSIVE_ATTRIBUTES:
+            logger.warning(
+                f"Attribute '{name}' not yet managed by the STAC spec or extensions."
+            )
 
-    Expected input shape:
-      { "value": [ {product}, ... ], "@odata.nextLink": ... }
+    return _ConversionPlan(tuple(handlers), tuple(stac_extensions))
+
+
+def conversion_plan_cache_clear():
     """
-    products: List[Dict[str, Any]] = list(odata.get("value") or [])
+    Drop the compiled conversion plans, needed after `DISPATCH_REGISTRY` or
+    `HANDLER_EXTENSIONS` are changed.
+    """
+    _conversion_plan.cache_clear()
 
-    logger.debug(f"Processing {len(products)} Product(s).")
 
-    items: List[Item] = []
+def odata_product_to_stac_item(
+    url: str,
+    product: Mapping[str, Any],
+    position: str = "1 of 1",
+    bbox: Optional[List[float]] = None,
+) -> Item | None:
+    """
+    Convert a single OData Product to a PySTAC Item; the `GeoFootprint` bbox is
+    computed unless given.
 
-    for i, product in enumerate(products):
-        logger.debug(
-            "------------------------------------------------------------------------"
+    Returns `None` when the Product does not declare any `GeoFootprint`.
+    """
+    logger.debug(
+        "------------------------------------------------------------------------"
+    )
+    logger.debug(f"Processing Product {position}")
+
+    geom = product.get("GeoFootprint")
+    if not geom:
+        logger.warning(
+            f"Product {position} with ID '{product.get('Id')}' does not declare the 'GeoFootprint' field, skipping it."
         )
-        logger.debug(f"Processing Product {i + 1} of {len(products)}")
+        # Skip products without geometry (or raise if you prefer)
+        return None
 
-        geom = product.get("GeoFootprint")
-        if not geom:
-            logger.warning(
-                f"Product {i + 1} of {len(products)} with ID '{product.get('Id')}' does not declare the 'GeoFootprint' field, skipping it."
-            )
-            # Skip products without geometry (or raise if you prefer)
-            continue
-
-        bbox = _bbox_from_geojson_geometry(geom)
-
-        beginning = next(
-            (
-                attribute.get("Value")
-                for attribute in product.get("Attributes") or []
-                if attribute.get("Name") == "beginningDateTime"
-            ),
-            None,
+    if bbox is None:
+        bbox = geometry_bounds(geom)
+
+    # index the attributes once, the handlers look them up by name
+    attributes: Dict[str, Any] = {
+        str(attribute.get("Name")): attribute.get("Value")
+        for attribute in product.get("Attributes") or []
+    }
+    plan: _ConversionPlan = _conversion_plan(tuple(attributes))
+
+    beginning = attributes.get("beginningDateTime")
+
+    if beginning is None:
+        raise ValueError(
+            f"Product {product.get('Id')} has no beginningDateTime attribute"
         )
 
-        if beginning is None:
-            raise ValueError(
-                f"Product {product.get('Id')} has no beginningDateTime attribute"
-            )
+    properties: dict[str, Any] = {}
 
-        properties: dict[str, Any] = {}
+    item: Item = Item(
+        id=str(product.get("Id")),
+        geometry=geom,
+        bbox=bbox,
+        datetime=_parse_rfc3339(str(beginning)),
+        properties=properties,
+        stac_extensions=list(plan.stac_extensions),
+    )
 
-        item: Item = Item(
-            id=str(product.get("Id")),
-            geometry=geom,
-            bbox=bbox,
-            datetime=_parse_rfc3339(str(beginning)),
-            properties=properties,
+    item.add_link(
+        Link(
+            rel=RelType.DERIVED_FROM,
+            target=f"{url}?$filter=Name%20eq%20%27{product.get('Name')}%27&$expand=Assets&$expand=Attributes",
+            media_type="application/json",
+            title="OData product entry",
         )
+    )
 
-        item.add_link(
-            Link(
-                rel=RelType.DERIVED_FROM,
-                target=f"{url}?$filter=Name%20eq%20%27{product.get('Name')}%27&$expand=Assets&$expand=Attributes",
-                media_type="application/json",
-                title="OData product entry",
+    locations = product.get("Locations") or []
+    if locations:
+        for location in locations:
+            asset = Asset(
+                href=str(location.get("DownloadLink")),
+                # media_type=product.get("ContentType") or product.get("@odata.mediaContentType"),
+                roles=["data"],
+                title=str(location.get("FormatType")),
+                extra_fields={"file:size": location.get("ContentLength")},
             )
-        )
 
-        locations = product.get("Locations") or []
-        if locations:
-            for location in locations:
-                asset = Asset(
-                    href=str(location.get("DownloadLink")),
-                    # media_type=product.get("ContentType") or product.get("@odata.mediaContentType"),
-                    roles=["data"],
-                    title=str(location.get("FormatType")),
-                    extra_fields={"file:size": location.get("ContentLength")},
+            checksums = location.get("Checksum") or []
+            for checksum in checksums:
+                asset.extra_fields[f"checksum:{checksum.get('Algorithm')}"] = (
+                    checksum.get("Value")
                 )
 
-                checksums = location.get("Checksum") or []
-                for checksum in checksums:
-                    asset.extra_fields[f"checksum:{checksum.get('Algorithm')}"] = (
-                        checksum.get("Value")
-                    )
-
-                item.add_asset(str(location.get("FormatType")), asset)
-        else:
-            # try guess
-            if "S3Path" in product:
-                asset = Asset(
-                    href=str(product.get("S3Path")),
-                    media_type=product.get("ContentType")
-                    or product.get("@odata.mediaContentType"),
-                    roles=["data"],
-                    title=product.get("Name"),
-                    extra_fields={
-                        "file:size": product.get("ContentLength"),
-                        "checksum": product.get("Checksum"),
-                    },
-                )
-                item.add_asset("data", asset)
-
-            # Add the zipped archive
-            zip_asset = Asset(
-                href=f"https://download.dataspace.copernicus.eu/odata/v1/Products({product.get('Id')})/$value",
-                media_type="application/zip",
-                roles=["data", "metadata", "archive"],
-                title="application/zip",
+            item.add_asset(str(location.get("FormatType")), asset)
+    else:
+        # try guess
+        if "S3Path" in product:
+            asset = Asset(
+                href=str(product.get("S3Path")),
+                media_type=product.get("ContentType")
+                or product.get("@odata.mediaContentType"),
+                roles=["data"],
+                title=product.get("Name"),
+                extra_fields={
+                    "file:size": product.get("ContentLength"),
+                    "checksum": product.get("Checksum"),
+                },
             )
-            item.add_asset("Product", zip_asset)
-
-        # Add all extra fields
-        attributes = product.get("Attributes") or []
-        for attribute in attributes:
-            name: str = str(attribute.get("Name"))
-            value: Any = attribute.get("Value")
-            if name in DISPATCH_REGISTRY:
-                DISPATCH_REGISTRY[name](product, value, item)
-            elif name in ["platformSerialIdentifier"]:
-                # Handled in on_platform_short_name
-                continue
-            else:
-                logger.warning(
-                    f"Attribute '{name}' not yet managed by the STAC spec or extensions."
-                )
+            item.add_asset("data", asset)
+
+        # Add the zipped archive
+        zip_asset = Asset(
+            href=f"https://download.dataspace.copernicus.eu/odata/v1/Products({product.get('Id')})/$value",
+            media_type="application/zip",
+            roles=["data", "metadata", "archive"],
+            title="application/zip",
+        )
+        item.add_asset("Product", zip_asset)
+
+    # Add all extra fields
+    indexed_product: IndexedProduct = IndexedProduct(product, attributes)
+    for name, handler in plan.handlers:
+        handler(indexed_product, attributes[name], item)
+
+    return item
+
+
+def iter_stac_items(url: str, products: Iterable[Mapping[str, Any]]) -> Iterator[Item]:
+    """
+    Lazily convert OData Products to PySTAC Items, skipping the ones without geometry.
+    """
+    for i, (product, bbox) in enumerate(iter_bounds(products)):
+        item: Item | None = odata_product_to_stac_item(url, product, f"#{i + 1}", bbox)
+        if item is not None:
+            logger.debug(f"Appending STAC Item '{item.id}")
+            yield item
+
+
+def _convert_chunk(
+    url: str, chunk: List[Tuple[int, Mapping[str, Any]]]
+) -> List[Dict[str, Any]]:
+    # runs in the worker processes, Items travel back as plain dicts
+    bboxes = geometries_bounds([product.get("GeoFootprint") for _, product in chunk])
+
+    items: List[Dict[str, Any]] = []
+    for (position, product), bbox in zip(chunk, bboxes):
+        item: Item | None = odata_product_to_stac_item(
+            url, product, f"#{position}", bbox
+        )
+        if item is not None:
+            items.append(item.to_dict())
+    return items
+
+
+def iter_stac_item_dicts(
+    url: str,
+    products: Iterable[Mapping[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily convert OData Products to STAC Item dicts, skipping the ones without
+    geometry.
+
+    When `workers` is greater than 1, the Products are converted by chunks of
+    `chunk_size` in a pool of `workers` processes, the Items are still produced in the
+    same order as the input Products.
+    """
+    if not workers or workers <= 1:
+        yield from (item.to_dict() for item in iter_stac_items(url, products))
+        return
+
+    logger.debug(f"Converting Products in {workers} worker processes.")
 
-        logger.debug(f"Appending STAC Item '{item.id}")
+    yield from imap_chunks(
+        partial(_convert_chunk, url),
+        enumerate(products, 1),
+        workers,
+        chunk_size,
+    )
+
+
+def odata_products_to_stac_item_collection(
+    url: str, odata: Mapping[str, Any]
+) -> ItemCollection:
+    """
+    Convert an OData Products response to a PySTAC ItemCollection.
+
+    Expected input shape:
+      { "value": [ {product}, ... ], "@odata.nextLink": ... }
+    """
+    products: List[Dict[str, Any]] = list(odata.get("value") or [])
+
+    logger.debug(f"Processing {len(products)} Product(s).")
 
-        items.append(item)
+    # Items are freshly built, there is no need to let ItemCollection clone them
+    return ItemCollection(iter_stac_items(url, products), clone_items=False)
 
-    return ItemCollection(items, clone_items=True)
+
+def write_stac_item_collection(
+    url: str,
+    products: Iterable[Mapping[str, Any]],
+    output_stream: TextIO,
+    indent: Optional[int] = 2,
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Convert the OData Products to STAC Items and write them to the output stream as a
+    STAC ItemCollection, one at a time, as soon as the input iterable produces them;
+    see `iter_stac_item_dicts` for the `workers` parallel conversion.
+
+    Returns the number of written Items.
+    """
+    return write_feature_collection(
+        output_stream,
+        iter_stac_item_dicts(url, products, workers),
+        indent=indent,
+    )
 
 
 def to_stac_item_collection(url: str, odata: Mapping[str, Any], output_stream: TextIO):
-    item_collection: ItemCollection = odata_products_to_stac_item_collection(url, odata)
-    json.dump(item_collection.to_dict(), output_stream, indent=2)
+    write_stac_item_collection(url, odata.get("value") or [], output_stream)
@@ -0,0 +1,69 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+PARALLEL_CHUNK_SIZE = 100
+"""How many Products each worker process converts at once."""
+
+
+def imap_chunks(
+    function: Callable[[List[T]], List[R]],
+    items: Iterable[T],
+    workers: int,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    window: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Apply `function` to consecutive chunks of `chunk_size` items in a pool of `workers`
+    processes, yielding the results in the same order as the input items.
+
+    At most `window` chunks (twice the workers, by default) are in flight at any time,
+    so neither the input nor the results are ever held in memory all together; the
+    `function` must be picklable, i.e. defined at module level.
+    """
+    if workers <= 0:
+        raise ValueError(f"workers must be a positive integer, {workers} given")
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be a positive integer, {chunk_size} given")
+
+    window = window or 2 * workers
+    iterator: Iterator[T] = iter(items)
+    pending: Deque[Future] = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                chunk: List[T] = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+
+                pending.append(executor.submit(function, chunk))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # the consumer may stop early, do not convert what nobody will read
+            for future in pending:
+                future.cancel()
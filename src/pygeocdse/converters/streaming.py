@@ -0,0 +1,72 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from pygeocdse import codec
+from typing import Any, Callable, Iterable, Mapping, Optional, TextIO
+
+
+def _dumps(value: Any, indent: Optional[int], depth: int) -> str:
+    text: str = codec.dumps(value, indent)
+    if indent:
+        text = text.replace("\n", "\n" + " " * indent * depth)
+    return text
+
+
+def write_feature_collection(
+    output_stream: TextIO,
+    features: Iterable[Mapping[str, Any]],
+    trailer: Optional[Callable[[], Mapping[str, Any]]] = None,
+    indent: Optional[int] = 2,
+) -> int:
+    """
+    Write a GeoJSON FeatureCollection to the output stream, one Feature at a time, as
+    soon as the input iterable produces it.
+
+    Members that are only known once all the Features have been consumed (e.g. the
+    overall bbox) can be supplied by `trailer`, which is invoked after the last Feature
+    and whose members are appended after the `features` array.
+
+    Members are indented by `indent` spaces, the output is compact (i.e. without any
+    whitespace) when it is not set.
+
+    Returns the number of written Features.
+    """
+    newline: str = "\n" if indent else ""
+    level_1: str = " " * indent if indent else ""
+    level_2: str = level_1 * 2
+    separator: str = ": " if indent else ":"
+
+    output_stream.write(
+        f'{{{newline}{level_1}"type"{separator}"FeatureCollection",{newline}{level_1}"features"{separator}['
+    )
+
+    count: int = 0
+    for feature in features:
+        if count:
+            output_stream.write(",")
+        output_stream.write(f"{newline}{level_2}{_dumps(feature, indent, 2)}")
+        count += 1
+
+    output_stream.write(f"{newline}{level_1}]" if count else "]")
+
+    for name, value in (trailer() if trailer else {}).items():
+        output_stream.write(
+            f",{newline}{level_1}{codec.dumps(name)}{separator}{_dumps(value, indent, 1)}"
+        )
+
+    output_stream.write(f"{newline}}}{newline}")
+
+    return count
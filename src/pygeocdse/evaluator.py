@@ -13,20 +13,30 @@
 # limitations under the License.
 
 from builtins import isinstance
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
-from functools import wraps
-from http import HTTPStatus
-from httpx import Client, Headers, Request, RequestNotRead, Response
 from loguru import logger
+from pygeocdse.ast_utils import _as_utc, collection_names
 from pygeocdse.odata_attributes import get_attribute_type
+from pygeocdse.optimizer import UnsatisfiableFilter, optimize
 from pygeofilter import ast, values
 from pygeofilter.backends.evaluator import Evaluator, handle
 from pygeofilter.parsers.cql2_json import parse as json_parse
 from pygeofilter.util import IdempotentDict, parse_datetime
-from typing import Any, Dict, Mapping, Optional
+from typing import (
+    Any,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+import hashlib
 import json
-import re
 import shapely
+import threading
+
 
 COMPARISON_OP_MAP = {
     ast.ComparisonOp.EQ: "eq",
@@ -54,10 +64,14 @@ def date_format(date: str | datetime):
 
 class CDSEEvaluator(Evaluator):
     def __init__(
-        self, attribute_map: Mapping[str, str], function_map: Mapping[str, str]
+        self,
+        attribute_map: Mapping[str, str],
+        function_map: Mapping[str, str],
+        collections: Optional[Sequence[str]] = None,
     ):
         self.attribute_map = attribute_map
         self.function_map = function_map
+        self.collections = collections
 
     @handle(ast.Not)
     def not_(self, node, sub):
@@ -79,7 +93,7 @@ class CDSEEvaluator(Evaluator):
         if "Date" in lhs:
             rhs = node.rhs
 
-        attr_type = get_attribute_type(node.lhs.name)
+        attr_type = get_attribute_type(node.lhs.name, self.collections)
         return f"Attributes/OData.CSC.{attr_type}Attribute/any(att:att/Name eq {lhs} and att/OData.CSC.{attr_type}Attribute/Value {COMPARISON_OP_MAP[node.op]} {rhs})"
 
     @handle(ast.Between)
@@ -113,12 +127,15 @@ class CDSEEvaluator(Evaluator):
 
     @handle(ast.In)
     def in_(self, node, lhs, *options):
-        attr_type = get_attribute_type(node.lhs.name)
+        values = ",".join(options)
 
-        def _mapper(rhs):
-            return f"Attributes/OData.CSC.{attr_type}Attribute/any(att:att/Name eq {lhs} and att/OData.CSC.{attr_type}Attribute/Value eq {rhs})"
+        if "Collection/Name" == node.lhs.name:
+            predicate = f"{node.lhs.name} in ({values})"
+        else:
+            attr_type = get_attribute_type(node.lhs.name, self.collections)
+            predicate = f"Attributes/OData.CSC.{attr_type}Attribute/any(att:att/Name eq {lhs} and att/OData.CSC.{attr_type}Attribute/Value in ({values}))"
 
-        return "(" + " or ".join(map(_mapper, options)) + ")"
+        return f"NOT {predicate}" if node.not_ else predicate
 
     @handle(ast.IsNull)
     def null(self, node, lhs):
@@ -192,9 +209,7 @@ class CDSEEvaluator(Evaluator):
 
     @handle(values.Geometry)
     def geometry(self, node: values.Geometry):
-        jeometry = json.dumps(node.geometry)
-        geometry = shapely.from_geojson(jeometry)
-        return str(geometry)
+        return _geometry_wkt(node.geometry)
 
     @handle(ast.Attribute)
     def attribute(self, node: ast.Attribute):
@@ -223,106 +238,204 @@ class CDSEEvaluator(Evaluator):
             return str(node)
 
 
-def to_cdse(cql2_filter: str | Dict[str, Any]) -> str:
-    return to_cdse_where(json_parse(cql2_filter), IdempotentDict())
+CQL2_OP_ALIASES = {
+    "eq": "=",
+    "!=": "<>",
+    "ne": "<>",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
 
+COMMUTATIVE_OPS = ("and", "or")
 
-def to_cdse_where(
-    root: ast.AstType,
-    field_mapping: Mapping[str, str],
-    function_map: Optional[Mapping[str, str]] = None,
-) -> str:
-    return CDSEEvaluator(field_mapping, function_map or {}).evaluate(root)
 
+def _canonical_cql2(node: Any) -> Any:
+    """
+    Rewrite a CQL2-JSON filter in a canonical form, where equivalent filters are equal:
+    operator aliases are unified, `and`/`or` operands are sorted, integral numbers are
+    normalized the same way the evaluator formats them and timestamps are converted to
+    UTC ISO-8601, keeping their sub-second precision.
+    """
+    if isinstance(node, list):
+        return [_canonical_cql2(item) for item in node]
+
+    if isinstance(node, float) and node.is_integer():
+        return int(node)
 
-def _decode(value):
-    if not value:
-        return ""
+    if not isinstance(node, dict):
+        return node
 
-    if isinstance(value, str):
-        return value
+    canonical: Dict[str, Any] = {
+        name: _canonical_cql2(value) for name, value in node.items()
+    }
 
-    return value.decode("utf-8")
+    op = canonical.get("op")
+    if isinstance(op, str):
+        op = CQL2_OP_ALIASES.get(op, op)
+        canonical["op"] = op
 
+        args = canonical.get("args")
+        if op in COMMUTATIVE_OPS and isinstance(args, list):
+            canonical["args"] = sorted(
+                args, key=lambda arg: json.dumps(arg, sort_keys=True)
+            )
 
-def _log_request(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        request: Request = func(*args, **kwargs)
+    timestamp = canonical.get("timestamp")
+    if isinstance(timestamp, str):
+        canonical["timestamp"] = _as_utc(timestamp).isoformat()
 
-        logger.warning(f"{request.method} {request.url}")
+    return canonical
 
-        headers: Headers = request.headers
-        for name, value in headers.raw:
-            header_value = re.sub(
-                r"(\bBearer\s+)[^\s]+",
-                r"\1********",
-                _decode(value),
-                flags=re.IGNORECASE,
+
+class CompileCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CompileCache:
+    """
+    Bounded LRU cache of compiled strings, i.e. the `$filter` expressions, keyed on the
+    canonical form of the input CQL2-JSON filter, and the geometries WKT, keyed on the
+    geometry hash.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            where = self._entries.get(key)
+            if where is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return where
+
+    def put(self, key: str, where: str):
+        with self._lock:
+            self._entries[key] = where
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> CompileCacheInfo:
+        with self._lock:
+            return CompileCacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._entries)
             )
-            logger.warning(f"> {_decode(name)}: {header_value}")
 
-        logger.warning(">")
-        try:
-            if request.content:
-                logger.warning(_decode(request.content))
-        except RequestNotRead:
-            logger.warning("[REQUEST BUILT FROM STREAM, OMISSING]")
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
 
-        return request
 
-    return wrapper
+_compile_cache = _CompileCache(maxsize=1024)
 
 
-def _log_response(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        response: Response = func(*args, **kwargs)
+_wkt_cache = _CompileCache(maxsize=256)
 
-        if HTTPStatus.MULTIPLE_CHOICES._value_ <= response.status_code:
-            log = logger.error
-        else:
-            log = logger.success
 
-        status: HTTPStatus = HTTPStatus(response.status_code)
-        log(f"< {status._value_} {status.phrase}")
+def _geometry_wkt(geometry: Mapping[str, Any]) -> str:
+    """
+    Convert the input GeoJSON geometry to WKT, caching the result by geometry hash so
+    that large AOIs are parsed and serialized only once.
+    """
+    jeometry: str = json.dumps(geometry, sort_keys=True, separators=(",", ":"))
+    key: str = hashlib.sha256(jeometry.encode("utf-8")).hexdigest()
 
-        headers: Mapping[str, str] = response.headers
-        for name, value in headers.items():
-            log(f"< {_decode(name)}: {_decode(value)}")
+    wkt: str | None = _wkt_cache.get(key)
+    if wkt is None:
+        wkt = str(shapely.from_geojson(jeometry))
+        _wkt_cache.put(key, wkt)
 
-        log("")
+    return wkt
 
-        if response.content:
-            log(_decode(response.content))
 
-        if HTTPStatus.MULTIPLE_CHOICES._value_ <= response.status_code:
-            raise RuntimeError(
-                f"A server error occurred when invoking {kwargs['method'].upper()} {kwargs['url']}, read the logs for details"
-            )
-        return response
-
-    return wrapper
-
-
-def http_invoke(
-    base_url: str,
-    cql2_filter: str | Dict[str, Any],
-    limit: int = 20,
-    max_items: int = 200,
-    timeout: int = 30,
-) -> Mapping[str, Any]:
-    current_filter: str = to_cdse(cql2_filter)
-    url: str = f"{base_url}?$filter={current_filter}&$top={max_items}&$expand=Assets&$expand=Attributes&$expand=Locations"
-
-    with Client() as http_client:
-        http_client.build_request = _log_request(http_client.build_request)  # type: ignore
-        http_client.request = _log_response(http_client.request)  # type: ignore
-        response: Response = http_client.get(
-            url=url, headers={"Prefer": f"odata.maxpagesize={limit}"}, timeout=timeout
+def compile_cache_info() -> CompileCacheInfo:
+    """
+    Report the `to_cdse` compile cache statistics, in the `functools.lru_cache` fashion.
+    """
+    return _compile_cache.info()
+
+
+def compile_cache_clear():
+    _compile_cache.clear()
+    _wkt_cache.clear()
+
+
+def to_cdse(cql2_filter: str | Dict[str, Any]) -> str:
+    """
+    Compile a CQL2-JSON filter to the OData `$filter` expression.
+
+    Results are memoized, equivalent filters share the same cache entry.
+    """
+    cql2_json: Any = (
+        json.loads(cql2_filter) if isinstance(cql2_filter, str) else cql2_filter
+    )
+    key: str = json.dumps(
+        _canonical_cql2(cql2_json), sort_keys=True, separators=(",", ":")
+    )
+
+    where: str | None = _compile_cache.get(key)
+    if where is None:
+        where = to_cdse_where(json_parse(cql2_json), IdempotentDict())
+        _compile_cache.put(key, where)
+
+    return where
+
+
+def to_cdse_where(
+    root: ast.AstType,
+    field_mapping: Mapping[str, str],
+    function_map: Optional[Mapping[str, str]] = None,
+) -> str:
+    root = optimize(root)
+    return CDSEEvaluator(
+        field_mapping, function_map or {}, collection_names(root)
+    ).evaluate(root)
+
+
+Cql2Filter = Union[str, Dict[str, Any], ast.Node]
+"""A CQL2-JSON filter, either serialized, decoded or already parsed to a pygeofilter AST."""
+
+
+def _compile(cql2_filter: Cql2Filter) -> str:
+    if isinstance(cql2_filter, ast.Node):
+        # already parsed, no need to serialize it back and forth
+        return to_cdse_where(cql2_filter, IdempotentDict())
+
+    return to_cdse(cql2_filter)
+
+
+def satisfiable_where(cql2_filter: Cql2Filter) -> Optional[str]:
+    """
+    Compile the input filter, returning `None` when it cannot match any Product, so
+    that the search can be answered without any network round trip.
+    """
+    try:
+        return _compile(cql2_filter)
+    except UnsatisfiableFilter as e:
+        logger.info(
+            f"The input filter cannot match any Product ({e}), skipping the search."
         )
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    # the search functions live in pygeocdse.search, keep the historical import path
+    if "http_invoke" == name:
+        from pygeocdse.search import http_invoke
 
-    response.raise_for_status()  # Raise an error for HTTP error codes
-    data = response.json()
+        return http_invoke
 
-    return data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
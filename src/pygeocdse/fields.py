@@ -0,0 +1,129 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from loguru import logger
+from typing import List, Optional, Sequence, Tuple
+
+PRODUCT_PROPERTIES = (
+    "Id",
+    "Name",
+    "ContentType",
+    "ContentLength",
+    "OriginDate",
+    "PublicationDate",
+    "ModificationDate",
+    "Online",
+    "EvictionDate",
+    "S3Path",
+    "Checksum",
+    "ContentDate",
+    "Footprint",
+    "GeoFootprint",
+)
+"""The structural properties of the OData Product entity, selectable via `$select`."""
+
+PRODUCT_EXPANSIONS = ("Assets", "Attributes", "Locations")
+"""The navigation properties of the OData Product entity, expandable via `$expand`."""
+
+
+def resolve_fields(
+    fields: Sequence[str] = (),
+    required: Sequence[str] = PRODUCT_EXPANSIONS,
+) -> Tuple[Optional[List[str]], List[str]]:
+    """
+    Map the requested fields, in the STAC API Fields fashion (`name` or `+name` to
+    include, `-name` to exclude, possibly comma separated), onto the OData `$select`
+    properties and `$expand` navigations, always keeping the `required` ones, i.e. the
+    fields the output converter needs.
+
+    Returns the `$select` list (`None` to get all the properties) and the `$expand` one.
+    """
+    includes: List[str] = []
+    excludes: List[str] = []
+    for field in (f.strip() for value in fields for f in value.split(",")):
+        if not field:
+            continue
+
+        name: str = field.lstrip("+-")
+        if name not in PRODUCT_PROPERTIES and name not in PRODUCT_EXPANSIONS:
+            raise ValueError(
+                f"Unknown Product field '{name}', expected one of {', '.join(PRODUCT_PROPERTIES + PRODUCT_EXPANSIONS)}"
+            )
+
+        (excludes if field.startswith("-") else includes).append(name)
+
+    for name in excludes:
+        if name in required:
+            logger.warning(
+                f"Field '{name}' is needed by the output format, it cannot be excluded."
+            )
+
+    def wanted(name: str) -> bool:
+        return name in required or (name in includes and name not in excludes)
+
+    expand: List[str] = [n for n in PRODUCT_EXPANSIONS if wanted(n)]
+
+    select: Optional[List[str]] = None
+    if any(name in PRODUCT_PROPERTIES for name in includes):
+        select = [p for p in PRODUCT_PROPERTIES if wanted(p)]
+    elif any(name in PRODUCT_PROPERTIES for name in excludes):
+        select = [p for p in PRODUCT_PROPERTIES if p in required or p not in excludes]
+
+    return select, expand
+
+
+SORTABLE_FIELDS = {
+    "Id": "Id",
+    "Name": "Name",
+    "ContentLength": "ContentLength",
+    "OriginDate": "OriginDate",
+    "PublicationDate": "PublicationDate",
+    "ModificationDate": "ModificationDate",
+    "ContentDate/Start": "ContentDate/Start",
+    "ContentDate/End": "ContentDate/End",
+    # STAC Item properties aliases
+    "id": "Id",
+    "datetime": "ContentDate/Start",
+    "start_datetime": "ContentDate/Start",
+    "end_datetime": "ContentDate/End",
+    "created": "PublicationDate",
+    "updated": "ModificationDate",
+}
+"""The OData Product properties `$orderby` accepts, by OData or STAC name."""
+
+
+def resolve_sortby(sortby: Sequence[str] = ()) -> List[str]:
+    """
+    Map the requested sort fields, in the STAC API Sort fashion (`name` or `+name` for
+    ascending, `-name` for descending, possibly comma separated), onto the OData
+    `$orderby` terms, e.g. `-datetime` -> `ContentDate/Start desc`.
+    """
+    orderby: List[str] = []
+    for field in (f.strip() for value in sortby for f in value.split(",")):
+        if not field:
+            continue
+
+        name: str = field.lstrip("+-")
+        if name not in SORTABLE_FIELDS:
+            raise ValueError(
+                f"Unsupported sort field '{name}', expected one of {', '.join(SORTABLE_FIELDS)}"
+            )
+
+        orderby.append(
+            f"{SORTABLE_FIELDS[name]} {'desc' if field.startswith('-') else 'asc'}"
+        )
+
+    return orderby
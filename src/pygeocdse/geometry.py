@@ -0,0 +1,119 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from loguru import logger
+from pygeofilter.ast import AstType, Combination, Not, SpatialComparisonPredicate
+from pygeofilter.values import Geometry
+from shapely.geometry import mapping, shape
+from shapely.geometry.base import BaseGeometry
+from typing import Any, Dict, Mapping, Optional
+import numpy
+import shapely
+
+GEOMETRY_FALLBACKS = ("convex_hull", "envelope")
+
+
+@dataclass(frozen=True)
+class GeometryOptions:
+    """
+    How the spatial filter geometries are reduced before being sent to the server:
+
+    * `simplify_tolerance`: topology preserving simplification tolerance, in degrees;
+    * `precision`: number of decimal digits the coordinates are rounded to;
+    * `max_wkt_length`: max length of the WKT representation, geometries exceeding it are
+      replaced by their `fallback` (`convex_hull` or `envelope`), which cover a wider
+      area, so the search may return more Products than the original one.
+    """
+
+    simplify_tolerance: Optional[float] = None
+    precision: Optional[int] = None
+    max_wkt_length: Optional[int] = None
+    fallback: str = "convex_hull"
+
+    def __post_init__(self):
+        if self.fallback not in GEOMETRY_FALLBACKS:
+            raise ValueError(
+                f"Unsupported geometry fallback '{self.fallback}', expected one of {', '.join(GEOMETRY_FALLBACKS)}"
+            )
+
+
+def _round(geometry: BaseGeometry, precision: int) -> BaseGeometry:
+    # snapping to the grid keeps the geometry valid, rounding removes the float noise
+    snapped: BaseGeometry = shapely.set_precision(geometry, 10**-precision)
+    return shapely.transform(snapped, lambda coords: numpy.round(coords, precision))
+
+
+def reduce_geometry(
+    geometry: Mapping[str, Any], options: GeometryOptions
+) -> Dict[str, Any]:
+    """
+    Reduce the input GeoJSON geometry according to the input options, returning the
+    reduced GeoJSON geometry.
+    """
+    original: BaseGeometry = shape(geometry)
+    reduced: BaseGeometry = original
+
+    if options.simplify_tolerance:
+        reduced = reduced.simplify(options.simplify_tolerance, preserve_topology=True)
+
+    if options.precision is not None:
+        rounded: BaseGeometry = _round(reduced, options.precision)
+        # too coarse a grid could collapse the whole geometry
+        if not rounded.is_empty:
+            reduced = rounded
+
+    if options.max_wkt_length and len(str(reduced)) > options.max_wkt_length:
+        for fallback in GEOMETRY_FALLBACKS[
+            GEOMETRY_FALLBACKS.index(options.fallback) :
+        ]:
+            reduced = getattr(reduced, fallback)
+            if len(str(reduced)) <= options.max_wkt_length:
+                break
+
+        logger.warning(
+            f"Geometry WKT exceeds {options.max_wkt_length} characters, replaced by its {fallback}: more Products than expected may be returned."
+        )
+
+    logger.debug(
+        f"Geometry reduced from {shapely.get_num_coordinates(original)} to {shapely.get_num_coordinates(reduced)} vertices."
+    )
+
+    return dict(mapping(reduced))
+
+
+def reduce_geometries(filter: AstType, options: GeometryOptions) -> AstType:
+    """
+    Rebuild the input filter, replacing the geometries of its spatial predicates (e.g.
+    the `s_intersects` one built by `ast_utils.bbox_filter`) with their reduced version.
+    """
+    if isinstance(filter, Combination):
+        return type(filter)(
+            reduce_geometries(filter.lhs, options),
+            reduce_geometries(filter.rhs, options),
+        )
+
+    if isinstance(filter, Not):
+        return Not(reduce_geometries(filter.sub_node, options))
+
+    if isinstance(filter, SpatialComparisonPredicate) and isinstance(
+        filter.rhs, Geometry
+    ):
+        return type(filter)(
+            filter.lhs, Geometry(reduce_geometry(filter.rhs.geometry, options))
+        )
+
+    return filter
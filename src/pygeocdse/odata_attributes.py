@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from loguru import logger
 from pygeocdse.sentinel1 import SENTINEL1
+from pygeocdse.sentinel1rtc import SENTINEL1RTC
 from pygeocdse.sentinel2 import SENTINEL2
 from pygeocdse.sentinel3 import SENTINEL3
 from pygeocdse.sentinel5p import SENTINEL5P
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 
 
 # TODO: import all attributes from all satellites
@@ -32,15 +35,89 @@ from pygeocdse.sentinel5p import SENTINEL5P
 # CCM
 ADDITIONAL_ATTRIBUTES = ["Collection/Name", "PublicationDate", "ModificationDate"]
 
-ALL_ATTRIBUTES = [SENTINEL1, SENTINEL2, SENTINEL3, SENTINEL5P]
+COLLECTION_ATTRIBUTES: Dict[str, Mapping[str, str]] = {
+    "SENTINEL-1": SENTINEL1,
+    "SENTINEL-2": SENTINEL2,
+    "SENTINEL-3": SENTINEL3,
+    "SENTINEL-5P": SENTINEL5P,
+    "SENTINEL-1-RTC": SENTINEL1RTC,
+}
 
+ALL_ATTRIBUTES = list(COLLECTION_ATTRIBUTES.values())
 
-def get_attribute_type(attribute_name):
+
+def _build_index() -> Tuple[
+    Dict[Tuple[str, str], str], Dict[str, str], Dict[str, Dict[str, str]]
+]:
+    by_collection: Dict[Tuple[str, str], str] = {}
+    by_attribute: Dict[str, str] = {}
+    conflicts: Dict[str, Dict[str, str]] = {}
+
+    for collection, attributes in COLLECTION_ATTRIBUTES.items():
+        for attribute_name, type in attributes.items():
+            by_collection[(collection, attribute_name)] = type
+
+            # first declaration wins when no collection is specified
+            known_type = by_attribute.setdefault(attribute_name, type)
+            if known_type != type:
+                conflicts.setdefault(attribute_name, {})[collection] = type
+
+    for attribute_name, types in conflicts.items():
+        for collection, attributes in COLLECTION_ATTRIBUTES.items():
+            if attribute_name in attributes:
+                types.setdefault(collection, attributes[attribute_name])
+
+        logger.debug(
+            f"Attribute {attribute_name} is declared with different types across collections: {types}"
+        )
+
+    return by_collection, by_attribute, conflicts
+
+
+ATTRIBUTE_TYPE_INDEX, ATTRIBUTE_TYPES, ATTRIBUTE_TYPE_CONFLICTS = _build_index()
+"""
+`(collection, attribute)` -> type, attribute -> type (first declaration wins), and
+attribute -> `{collection: type}` for the attributes typed differently across collections.
+"""
+
+
+def get_attribute_type(attribute_name, collections: Optional[Iterable[str]] = None):
     if attribute_name in ADDITIONAL_ATTRIBUTES:
         return ""
 
-    for attribute in ALL_ATTRIBUTES:
-        type = attribute.get(attribute_name)
-        if type is not None:
-            return type
-    raise ValueError(f"Attribute {attribute_name} not found in attribute list")
+    known_collections = [c for c in collections or [] if c in COLLECTION_ATTRIBUTES]
+    if not known_collections:
+        type = ATTRIBUTE_TYPES.get(attribute_name)
+        if type is None:
+            raise ValueError(f"Attribute {attribute_name} not found in attribute list")
+        return type
+
+    types = {
+        ATTRIBUTE_TYPE_INDEX[(collection, attribute_name)]
+        for collection in known_collections
+        if (collection, attribute_name) in ATTRIBUTE_TYPE_INDEX
+    }
+
+    if not types:
+        # the per-collection maps are not exhaustive, trust the server on known names
+        type = ATTRIBUTE_TYPES.get(attribute_name)
+        if type is None:
+            raise ValueError(
+                f"Attribute {attribute_name} not found in attribute list of {', '.join(known_collections)}"
+            )
+        if attribute_name in ATTRIBUTE_TYPE_CONFLICTS:
+            raise ValueError(
+                f"Attribute {attribute_name} is not declared by {', '.join(known_collections)} and has conflicting types {ATTRIBUTE_TYPE_CONFLICTS[attribute_name]} across the other collections"
+            )
+
+        logger.warning(
+            f"Attribute {attribute_name} is not declared by {', '.join(known_collections)}, assuming its {type} type from the other collections"
+        )
+        return type
+
+    if len(types) > 1:
+        raise ValueError(
+            f"Attribute {attribute_name} has conflicting types {sorted(types)} across {', '.join(known_collections)}"
+        )
+
+    return types.pop()
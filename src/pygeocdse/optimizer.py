@@ -0,0 +1,374 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pygeocdse.ast_utils import and_chain, flatten_and
+from pygeofilter.ast import (
+    And,
+    AstType,
+    Attribute,
+    Equal,
+    GreaterEqual,
+    GreaterThan,
+    In,
+    LessEqual,
+    LessThan,
+    Not,
+    Or,
+    TimeAfter,
+    TimeBefore,
+    TimeBegins,
+    TimeEnds,
+)
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class UnsatisfiableFilter(ValueError):
+    """
+    Raised when the input filter cannot match any Product, e.g. `cloudCover < 10 AND
+    cloudCover > 30`, so that the search can be answered without querying the server.
+    """
+
+
+def _flatten_or(node: AstType) -> List[AstType]:
+    """
+    Collect the clauses of a (possibly nested) OR tree, in left-to-right order.
+    """
+    if isinstance(node, Or):
+        return _flatten_or(node.lhs) + _flatten_or(node.rhs)
+    return [node]
+
+
+def _or_chain(parts: Sequence[AstType]) -> AstType:
+    """
+    Rebuild a left-associated OR chain from the given clauses.
+    """
+    expr = parts[0]
+    for p in parts[1:]:
+        expr = Or(expr, p)
+
+    return expr
+
+
+def _is_plain_value(value: Any) -> bool:
+    # dates, geometries and nested expressions are rendered differently, keep them apart
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _equality_options(node: AstType) -> Optional[List[Any]]:
+    """
+    Return the values the input clause compares its attribute with, when it is a plain
+    `attribute = value` or `attribute IN (values...)` predicate.
+    """
+    if not isinstance(node, (Equal, In)) or not isinstance(node.lhs, Attribute):
+        return None
+
+    if isinstance(node, Equal):
+        return [node.rhs] if _is_plain_value(node.rhs) else None
+
+    if node.not_ or not all(_is_plain_value(option) for option in node.sub_nodes):
+        return None
+
+    return list(node.sub_nodes)
+
+
+def _merge_equalities(clauses: List[AstType]) -> List[AstType]:
+    """
+    Merge the OR-ed equalities on the same attribute into a single IN predicate, placed
+    where the first of them was; the other clauses are kept as they are.
+    """
+    merged: List[Any] = []
+    options_by_name: Dict[str, List[Any]] = {}
+
+    for clause in clauses:
+        options = _equality_options(clause)
+        if options is None:
+            merged.append(clause)
+            continue
+
+        name: str = clause.lhs.name
+        if name not in options_by_name:
+            options_by_name[name] = []
+            merged.append(name)
+
+        known = options_by_name[name]
+        known.extend(option for option in options if option not in known)
+
+    def rebuild(item: Any) -> AstType:
+        if not isinstance(item, str):
+            return item
+
+        options = options_by_name[item]
+        if 1 == len(options):
+            return Equal(Attribute(item), options[0])
+        return In(Attribute(item), options, False)
+
+    return [rebuild(item) for item in merged]
+
+
+COMPARISON_BOUNDS = {
+    GreaterThan: ("lower", False),
+    GreaterEqual: ("lower", True),
+    LessThan: ("upper", False),
+    LessEqual: ("upper", True),
+}
+
+TEMPORAL_BOUNDS = {
+    TimeAfter: ("lower", False),
+    TimeBegins: ("lower", True),
+    TimeBefore: ("upper", False),
+    TimeEnds: ("upper", True),
+}
+
+
+@dataclass
+class _Range:
+    lower: Any = None
+    lower_inclusive: bool = True
+    upper: Any = None
+    upper_inclusive: bool = True
+    values: Optional[List[Any]] = None
+
+    def restrict(self, side: str, value: Any, inclusive: bool):
+        current = getattr(self, side)
+        tighter = (lambda a, b: a > b) if "lower" == side else (lambda a, b: a < b)
+
+        if current is None or tighter(value, current):
+            setattr(self, side, value)
+            setattr(self, f"{side}_inclusive", inclusive)
+        elif value == current:
+            setattr(self, f"{side}_inclusive", inclusive and self._inclusive(side))
+
+    def _inclusive(self, side: str) -> bool:
+        return getattr(self, f"{side}_inclusive")
+
+    def allow(self, options: List[Any]):
+        if self.values is None:
+            self.values = []
+            self.values.extend(o for o in options if o not in self.values)
+        else:
+            self.values = [value for value in self.values if value in options]
+
+    def contains(self, value: Any) -> bool:
+        if self.lower is not None and (
+            value < self.lower or (value == self.lower and not self.lower_inclusive)
+        ):
+            return False
+        if self.upper is not None and (
+            value > self.upper or (value == self.upper and not self.upper_inclusive)
+        ):
+            return False
+        return True
+
+    def is_empty(self) -> bool:
+        if self.values is not None:
+            self.values = [value for value in self.values if self.contains(value)]
+            return not self.values
+
+        if self.lower is None or self.upper is None:
+            return False
+
+        return self.lower > self.upper or (
+            self.lower == self.upper
+            and not (self.lower_inclusive and self.upper_inclusive)
+        )
+
+
+def _range_key(node: AstType) -> Optional[Tuple[str, bool]]:
+    """
+    Return the `(attribute, temporal)` key of the clauses that can be merged into a
+    single range, `None` for any other clause.
+    """
+    if not isinstance(getattr(node, "lhs", None), Attribute):
+        return None
+
+    if type(node) in TEMPORAL_BOUNDS:
+        return (node.lhs.name, True) if isinstance(node.rhs, datetime) else None
+
+    if type(node) in COMPARISON_BOUNDS:
+        value = node.rhs
+        return (
+            (node.lhs.name, False)
+            if _is_plain_value(value) or isinstance(value, datetime)
+            else None
+        )
+
+    if _equality_options(node) is not None:
+        return (node.lhs.name, False)
+
+    return None
+
+
+def _merge_range(clauses: List[AstType]) -> _Range:
+    merged = _Range()
+    for clause in clauses:
+        bound = TEMPORAL_BOUNDS.get(type(clause)) or COMPARISON_BOUNDS.get(type(clause))
+        if bound:
+            side, inclusive = bound
+            merged.restrict(side, clause.rhs, inclusive)
+        else:
+            # _range_key groups only the bounds and the equalities
+            options: Optional[List[Any]] = _equality_options(clause)
+            if options is None:
+                raise ValueError(f"Clause {clause!r} cannot be merged into a range")
+            merged.allow(options)
+
+    return merged
+
+
+def _range_clauses(name: str, temporal: bool, merged: _Range) -> List[AstType]:
+    attribute = Attribute(name)
+
+    if merged.values is not None:
+        (clause,) = _merge_equalities([In(attribute, merged.values, False)])
+        return [clause]
+
+    if (
+        not temporal
+        and merged.lower is not None
+        and merged.lower == merged.upper
+        and merged.lower_inclusive
+        and merged.upper_inclusive
+    ):
+        return [Equal(attribute, merged.lower)]
+
+    bounds = TEMPORAL_BOUNDS if temporal else COMPARISON_BOUNDS
+    clauses: List[AstType] = []
+    for node_type, (side, inclusive) in bounds.items():
+        value = getattr(merged, side)
+        if value is not None and inclusive == getattr(merged, f"{side}_inclusive"):
+            clauses.append(node_type(attribute, value))
+
+    return clauses
+
+
+def _check_content_dates(ranges: Dict[Tuple[str, bool], _Range]):
+    # a Product cannot end before it starts
+    start = ranges.get(("ContentDate/Start", True))
+    end = ranges.get(("ContentDate/End", True))
+    if start is None or end is None or start.lower is None or end.upper is None:
+        return
+
+    try:
+        if start.lower > end.upper:
+            raise UnsatisfiableFilter(
+                f"ContentDate/Start lower bound {start.lower.isoformat()} follows ContentDate/End upper bound {end.upper.isoformat()}"
+            )
+    except TypeError:
+        # naive and aware datetimes cannot be compared
+        return
+
+
+def simplify(node: AstType) -> AstType:
+    """
+    Simplify the top level AND clauses of the input filter: duplicated clauses are
+    removed, comparisons on the same attribute (e.g. `cloudCover < 30 AND cloudCover <
+    10`) are merged into the tightest range, placed where the first of them was.
+
+    Raises `UnsatisfiableFilter` if the clauses contradict each other.
+    """
+    clauses: List[AstType] = []
+    for clause in flatten_and(node):
+        if clause not in clauses:
+            clauses.append(clause)
+
+    groups: Dict[Tuple[str, bool], List[AstType]] = {}
+    items: List[Any] = []
+    for clause in clauses:
+        key = _range_key(clause)
+        if key is None:
+            items.append(clause)
+            continue
+
+        if key not in groups:
+            groups[key] = []
+            items.append(key)
+        groups[key].append(clause)
+
+    ranges: Dict[Tuple[str, bool], _Range] = {}
+    rebuilt: Dict[Tuple[str, bool], List[AstType]] = {}
+    for key, group in groups.items():
+        try:
+            merged = _merge_range(group)
+            empty = merged.is_empty()
+        except TypeError:
+            # values that cannot be compared with each other, leave them as they are
+            rebuilt[key] = group
+            continue
+
+        if empty:
+            raise UnsatisfiableFilter(
+                f"Criteria on {key[0]} cannot be satisfied at the same time: {group}"
+            )
+
+        ranges[key] = merged
+        rebuilt[key] = group if 1 == len(group) else _range_clauses(*key, merged)
+
+    _check_content_dates(ranges)
+
+    simplified: List[AstType] = []
+    for item in items:
+        if isinstance(item, tuple):
+            simplified.extend(rebuilt[item])
+        else:
+            simplified.append(item)
+
+    return and_chain(simplified)
+
+
+def optimize(node: AstType) -> AstType:
+    """
+    Rewrite the input filter into an equivalent one that is cheaper to send and to
+    evaluate server side:
+
+    * disjunctions of equalities on the same attribute, e.g. `tileId = 'A' OR tileId =
+      'B'` as built by `collections_filter`, are merged into a single `tileId IN ('A',
+      'B')` predicate;
+    * conjunctions are simplified by `simplify`.
+
+    Raises `UnsatisfiableFilter` if the whole filter cannot be satisfied.
+    """
+    if isinstance(node, And):
+        return simplify(and_chain([optimize(c) for c in flatten_and(node)]))
+
+    if isinstance(node, Or):
+        clauses: List[AstType] = []
+        for clause in _flatten_or(node):
+            try:
+                clauses.append(optimize(clause))
+            except UnsatisfiableFilter:
+                # this branch cannot match, the others still may
+                continue
+
+        if not clauses:
+            raise UnsatisfiableFilter("None of the OR-ed criteria can be satisfied")
+
+        return _or_chain(_merge_equalities(clauses))
+
+    if isinstance(node, Not):
+        try:
+            return Not(optimize(node.sub_node))
+        except UnsatisfiableFilter:
+            # the negation always holds, but there is no way to express it: leave it
+            return node
+
+    if isinstance(node, In):
+        # a lone IN may carry duplicated options too
+        (clause,) = _merge_equalities([node])
+        return clause
+
+    return node
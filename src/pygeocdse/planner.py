@@ -0,0 +1,288 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+from pygeocdse.ast_utils import and_chain, flatten_and
+from pygeocdse.client import AsyncCDSEClient
+from pygeocdse.evaluator import to_cdse_where
+from pygeocdse.optimizer import UnsatisfiableFilter
+from pygeocdse.fields import PRODUCT_EXPANSIONS
+from pygeocdse.search import (
+    afetch_count,
+    afollow_pages,
+    amap_ordered,
+    count_url,
+    products_url,
+)
+from pygeofilter.ast import (
+    AstType,
+    Attribute,
+    TimeBefore,
+    TimeBegins,
+    TimeEnds,
+)
+from pygeofilter.util import IdempotentDict
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence, Tuple
+import asyncio
+
+CONTENT_DATE_START = "ContentDate/Start"
+CONTENT_DATE_END = "ContentDate/End"
+
+
+@dataclass(frozen=True)
+class TimePartition:
+    """
+    A slice of the searched ContentDate interval, small enough to be harvested by a
+    single request chain.
+
+    Products are assigned to the partition their `ContentDate/Start` falls in, i.e.
+    `start <= ContentDate/Start < end`; the last partition keeps the original upper bound.
+    """
+
+    start: datetime
+    end: datetime
+    count: int
+    filter: AstType
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _split_content_date(
+    filter: AstType,
+) -> Tuple[List[AstType], datetime, Optional[datetime]]:
+    """
+    Isolate the `ContentDate/Start` lower bound, as built by
+    `ast_utils.datetime_or_interval_filter`, from the rest of the filter clauses.
+
+    The `ContentDate/End` upper bound, if any, stays among the other clauses and is
+    only used to delimit the interval to split.
+    """
+    clauses: List[AstType] = []
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    for clause in flatten_and(filter):
+        if (
+            start is None
+            and isinstance(clause, TimeBegins)
+            and isinstance(clause.lhs, Attribute)
+            and CONTENT_DATE_START == clause.lhs.name
+            and isinstance(clause.rhs, datetime)
+        ):
+            start = _as_utc(clause.rhs)
+            continue
+
+        if (
+            isinstance(clause, TimeEnds)
+            and isinstance(clause.lhs, Attribute)
+            and CONTENT_DATE_END == clause.lhs.name
+            and isinstance(clause.rhs, datetime)
+        ):
+            end = _as_utc(clause.rhs)
+
+        clauses.append(clause)
+
+    if start is None:
+        raise ValueError(
+            f"The input filter does not declare any '{CONTENT_DATE_START}' lower bound, use 'datetime_or_interval_filter' to set it."
+        )
+
+    return clauses, start, end
+
+
+def _partition_filter(
+    clauses: List[AstType], start: datetime, end: datetime, last: bool
+) -> AstType:
+    bounds: List[AstType] = [TimeBegins(Attribute(CONTENT_DATE_START), start)]
+    if not last:
+        bounds.append(TimeBefore(Attribute(CONTENT_DATE_START), end))
+
+    return and_chain(clauses + bounds)
+
+
+async def plan_time_partitions(
+    base_url: str,
+    filter: AstType,
+    max_count: int = 1000,
+    min_span: timedelta = timedelta(hours=1),
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+) -> List[TimePartition]:
+    """
+    Split the ContentDate interval of the input filter in halves, recursively and
+    concurrently, until `$count` reports no more than `max_count` matching Products
+    in each of them, or the slice is not wider than `min_span`.
+
+    Empty partitions are dropped, the returned ones are sorted in time order.
+    """
+    if max_count <= 0:
+        raise ValueError(f"max_count must be a positive integer, {max_count} given")
+
+    clauses, start, end = _split_content_date(filter)
+    if end is None:
+        end = datetime.now(timezone.utc).replace(microsecond=0)
+
+    if end <= start:
+        return []
+
+    async def plan(start: datetime, end: datetime, last: bool) -> List[TimePartition]:
+        partition_filter: AstType = _partition_filter(clauses, start, end, last)
+        try:
+            where: str = to_cdse_where(partition_filter, IdempotentDict())
+        except UnsatisfiableFilter as e:
+            logger.info(
+                f"Partition [{start.isoformat()}, {end.isoformat()}) cannot match any Product ({e})."
+            )
+            return []
+
+        count: int = await afetch_count(count_url(base_url, where), timeout, session)
+
+        # CDSE dates have seconds resolution
+        middle: datetime = (start + (end - start) / 2).replace(microsecond=0)
+
+        if count <= max_count or end - start <= min_span or middle <= start:
+            if count > max_count:
+                logger.warning(
+                    f"Partition [{start.isoformat()}, {end.isoformat()}) still matches {count} Products, exceeding the {max_count} cap, but cannot be split further."
+                )
+
+            return [TimePartition(start, end, count, partition_filter)] if count else []
+
+        left, right = await asyncio.gather(
+            plan(start, middle, False), plan(middle, end, last)
+        )
+        return left + right
+
+    async with (
+        nullcontext(client) if client is not None else AsyncCDSEClient()
+    ) as session:
+        return await plan(start, end, True)
+
+
+def _content_date_start(product: Mapping[str, Any]) -> str:
+    return str((product.get("ContentDate") or {}).get("Start") or "")
+
+
+async def aiter_partitioned_products(
+    base_url: str,
+    filter: AstType,
+    max_count: int = 1000,
+    min_span: timedelta = timedelta(hours=1),
+    limit: int = 100,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    Harvest all the OData Products matching the input filter, by planning the time
+    partitions first and then fetching them concurrently.
+
+    Each partition is requested in pages of at most `max_count` Products, following
+    `@odata.nextLink` to the end rather than stopping at the planned count.
+
+    Products are yielded in `ContentDate/Start` order: a partition is released only
+    once all the previous ones have been yielded. At most `max_concurrency`
+    partitions (the `max_concurrency` of the client session, by default) are fetched
+    at the same time, the next one starts only once the oldest has been consumed.
+    """
+    async with (
+        nullcontext(client) if client is not None else AsyncCDSEClient()
+    ) as session:
+        partitions: List[TimePartition] = await plan_time_partitions(
+            base_url=base_url,
+            filter=filter,
+            max_count=max_count,
+            min_span=min_span,
+            timeout=timeout,
+            client=session,
+        )
+
+        logger.info(
+            f"Harvesting {sum(p.count for p in partitions)} Product(s) across {len(partitions)} time partition(s)."
+        )
+
+        async def fetch(partition: TimePartition) -> List[Mapping[str, Any]]:
+            where: str = to_cdse_where(partition.filter, IdempotentDict())
+            # the planned count is a hint only: a partition may exceed the $top cap
+            # when it cannot be split further, or grow since it has been planned
+            url: str = products_url(base_url, where, max_count, select, expand)
+            products = [
+                product
+                async for page in afollow_pages(url, limit, timeout, session)
+                for product in page.get("value") or []
+            ]
+            products.sort(key=_content_date_start)
+            return products
+
+        batches = amap_ordered(
+            fetch, partitions, max_concurrency or session.max_concurrency
+        )
+        try:
+            async for products in batches:
+                for product in products:
+                    yield product
+        finally:
+            await batches.aclose()
+
+
+def partitioned_http_invoke(
+    base_url: str,
+    filter: AstType,
+    max_count: int = 1000,
+    min_span: timedelta = timedelta(hours=1),
+    limit: int = 100,
+    timeout: int = 30,
+    max_concurrency: int = 10,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+) -> Mapping[str, Any]:
+    """
+    Blocking counterpart of `aiter_partitioned_products`.
+    """
+
+    async def harvest() -> List[Mapping[str, Any]]:
+        async with AsyncCDSEClient(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+        ) as client:
+            return [
+                product
+                async for product in aiter_partitioned_products(
+                    base_url=base_url,
+                    filter=filter,
+                    max_count=max_count,
+                    min_span=min_span,
+                    limit=limit,
+                    timeout=timeout,
+                    client=client,
+                    select=select,
+                    expand=expand,
+                    max_concurrency=max_concurrency,
+                )
+            ]
+
+    return {"value": asyncio.run(harvest())}
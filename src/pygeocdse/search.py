@@ -0,0 +1,640 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import nullcontext
+from httpx import Response
+from itertools import islice
+from pygeocdse import codec
+from pygeocdse.client import AsyncCDSEClient, CDSEClient
+from pygeocdse.evaluator import Cql2Filter, satisfiable_where
+from pygeocdse.fields import PRODUCT_EXPANSIONS
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+import asyncio
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def products_url(
+    base_url: str,
+    where: str,
+    max_items: int,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+) -> str:
+    """
+    Build the URL of the OData Products search for the input compiled `$filter`.
+    """
+    url: str = f"{base_url}?$filter={where}&$top={max_items}"
+    if orderby:
+        url += f"&$orderby={','.join(orderby)}"
+    if select:
+        url += f"&$select={','.join(select)}"
+    for navigation in expand:
+        url += f"&$expand={navigation}"
+    return url
+
+
+def count_url(base_url: str, where: str) -> str:
+    """
+    Build the URL retrieving, via `$count`, how many Products match the input `$filter`.
+    """
+    return f"{base_url}?$filter={where}&$count=true&$top=0"
+
+
+def follow_pages(
+    url: str | None,
+    limit: int,
+    timeout: int,
+    client: Optional[CDSEClient],
+    bypass_cache: bool = False,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Fetch the OData result pages starting from `url`, following `@odata.nextLink`;
+    a short-lived session is opened when no `client` is passed in.
+    """
+    with nullcontext(client) if client is not None else CDSEClient() as session:
+        while url:
+            response: Response = session.get(
+                url=url,
+                headers={"Prefer": f"odata.maxpagesize={limit}"},
+                timeout=timeout,
+                bypass_cache=bypass_cache,
+            )
+            response.raise_for_status()  # Raise an error for HTTP error codes
+            page: Mapping[str, Any] = codec.loads(response.content)
+
+            yield page
+
+            url = page.get("@odata.nextLink")
+
+
+def take(
+    pages: Iterator[Mapping[str, Any]], max_items: int
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Yield the Products of the input pages, stopping as soon as `max_items` are yielded.
+    """
+    if max_items <= 0:
+        return
+
+    returned: int = 0
+    for page in pages:
+        for product in page.get("value") or []:
+            yield product
+
+            returned += 1
+            if returned >= max_items:
+                return
+
+
+def iter_pages(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[CDSEClient] = None,
+    bypass_cache: bool = False,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Lazily fetch the OData result pages, following `@odata.nextLink` until the server
+    does not declare any further page.
+
+    Each page is requested only when the previous one has been consumed; when no
+    `client` is passed in, a short-lived session is opened for the whole iteration.
+    `bypass_cache` forces the pages to be fetched again even if the client session
+    holds a cached copy.
+
+    Only the `select` Product properties (all of them by default) and the `expand`
+    navigations are requested, see `fields.resolve_fields`; `orderby` sorts the
+    results, see `fields.resolve_sortby`.
+    """
+    where: Optional[str] = satisfiable_where(cql2_filter)
+    if where is None:
+        return iter(())
+
+    url: str = products_url(base_url, where, max_items, select, expand, orderby)
+    return follow_pages(url, limit, timeout, client, bypass_cache)
+
+
+def iter_products(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[CDSEClient] = None,
+    bypass_cache: bool = False,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+    stream: bool = False,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Lazily yield the OData Products matching the input filter, page after page,
+    stopping exactly once `max_items` Products have been yielded.
+
+    With `stream`, each page is decoded incrementally as it arrives, so that the
+    memory footprint does not grow with the page size (requires the optional `ijson`
+    package).
+    """
+    if stream:
+        where: Optional[str] = satisfiable_where(cql2_filter)
+        if where is None or max_items <= 0:
+            return iter(())
+
+        url: str = products_url(base_url, where, max_items, select, expand, orderby)
+        return islice(
+            _iter_streamed_products(url, limit, timeout, client, bypass_cache),
+            max_items,
+        )
+
+    return take(
+        iter_pages(
+            base_url=base_url,
+            cql2_filter=cql2_filter,
+            limit=limit,
+            max_items=max_items,
+            timeout=timeout,
+            client=client,
+            bypass_cache=bypass_cache,
+            select=select,
+            expand=expand,
+            orderby=orderby,
+        ),
+        max_items,
+    )
+
+
+def http_invoke(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[CDSEClient] = None,
+    bypass_cache: bool = False,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+    stream: bool = False,
+) -> Mapping[str, Any]:
+    return {
+        "value": list(
+            iter_products(
+                base_url=base_url,
+                cql2_filter=cql2_filter,
+                limit=limit,
+                max_items=max_items,
+                timeout=timeout,
+                client=client,
+                bypass_cache=bypass_cache,
+                select=select,
+                expand=expand,
+                orderby=orderby,
+                stream=stream,
+            )
+        )
+    }
+
+
+def fetch_count(
+    url: str,
+    timeout: int,
+    client: Optional[CDSEClient],
+    bypass_cache: bool = False,
+) -> int:
+    """
+    Retrieve the `@odata.count` declared by the response of the input count URL.
+    """
+    with nullcontext(client) if client is not None else CDSEClient() as session:
+        response: Response = session.get(
+            url=url, timeout=timeout, bypass_cache=bypass_cache
+        )
+
+    response.raise_for_status()  # Raise an error for HTTP error codes
+    return int(codec.loads(response.content)["@odata.count"])
+
+
+def count(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    timeout: int = 30,
+    client: Optional[CDSEClient] = None,
+    bypass_cache: bool = False,
+) -> int:
+    """
+    Retrieve, via `$count`, how many OData Products match the input filter, in a single
+    lightweight round trip: no Product is downloaded, nothing is expanded.
+    """
+    where: Optional[str] = satisfiable_where(cql2_filter)
+    if where is None:
+        return 0
+
+    return fetch_count(count_url(base_url, where), timeout, client, bypass_cache)
+
+
+def _iter_page_items(
+    chunks: Iterator[bytes], state: Dict[str, Any]
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Incrementally decode an OData page, yielding each element of its `value` array
+    as soon as it has been fully received; the `@odata.nextLink`, if any, is stored
+    in `state`, once the whole page has been consumed.
+    """
+    if ijson is None:
+        raise ImportError(
+            "Streaming decoding requires the optional 'ijson' package, i.e. `pip install pygeofilter-odata-cdse[streaming]`"
+        )
+
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builder = None
+
+    def drain() -> Iterator[Mapping[str, Any]]:
+        nonlocal builder
+        for prefix, event, value in events:
+            if builder is None:
+                if "value.item" == prefix and "start_map" == event:
+                    builder = ijson.ObjectBuilder()
+                elif "@odata.nextLink" == prefix and "string" == event:
+                    state["@odata.nextLink"] = value
+                    continue
+                else:
+                    continue
+
+            builder.event(event, value)
+            if "value.item" == prefix and "end_map" == event:
+                yield builder.value
+                builder = None
+        del events[:]
+
+    for chunk in chunks:
+        parser.send(chunk)
+        yield from drain()
+
+    parser.close()
+    yield from drain()
+
+
+def _iter_streamed_products(
+    url: str | None,
+    limit: int,
+    timeout: int,
+    client: Optional[CDSEClient],
+    bypass_cache: bool = False,
+) -> Iterator[Mapping[str, Any]]:
+    with nullcontext(client) if client is not None else CDSEClient() as session:
+        while url:
+            state: Dict[str, Any] = {}
+            with session.stream(
+                url=url,
+                headers={"Prefer": f"odata.maxpagesize={limit}"},
+                timeout=timeout,
+                bypass_cache=bypass_cache,
+            ) as chunks:
+                yield from _iter_page_items(chunks, state)
+
+            url = state.get("@odata.nextLink")
+
+
+KEYSET_ORDER = ("ContentDate/Start", "Id")
+"""The unique sort key the keyset pagination walks the results along."""
+
+
+def keyset_descending(orderby: Sequence[str]) -> bool:
+    """
+    Check that the input `$orderby` terms can be walked by the keyset pagination, i.e.
+    they are a prefix of `KEYSET_ORDER` all sorted in the same direction, returning
+    whether the direction is descending.
+    """
+    if len(orderby) > len(KEYSET_ORDER) or any(
+        term.split()[0] != key for term, key in zip(orderby, KEYSET_ORDER)
+    ):
+        raise ValueError(
+            f"Keyset pagination sorts by {', '.join(KEYSET_ORDER)} only, {', '.join(orderby)} requested."
+        )
+
+    directions = {term.split()[-1] for term in orderby}
+    if len(directions) > 1:
+        raise ValueError(
+            f"Keyset pagination walks {', '.join(KEYSET_ORDER)} in a single direction, mixed directions requested: {', '.join(orderby)}."
+        )
+
+    return "desc" in directions
+
+
+def _keyset_where(
+    where: str, last: Optional[Mapping[str, Any]], descending: bool
+) -> str:
+    if last is None:
+        return where
+
+    op: str = "lt" if descending else "gt"
+    # the raw ContentDate/Start keeps the sub-second precision `date_format` drops
+    start: str = str((last.get("ContentDate") or {}).get("Start"))
+    return f"({where}) and (ContentDate/Start {op} {start} or (ContentDate/Start eq {start} and Id {op} {last.get('Id')}))"
+
+
+def iter_products_keyset(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[CDSEClient] = None,
+    bypass_cache: bool = False,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    descending: bool = False,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Lazily yield the OData Products matching the input filter sorted by
+    `ContentDate/Start` (and `Id`, to break ties), stopping once `max_items` Products
+    have been yielded.
+
+    Instead of following `@odata.nextLink`, i.e. `$skip`, each page is requested with
+    a `ContentDate/Start gt <last seen>` criterion, so that the page latency does not
+    grow with the depth of the harvest.
+    """
+    where: Optional[str] = satisfiable_where(cql2_filter)
+    if where is None or max_items <= 0:
+        return
+
+    direction: str = "desc" if descending else "asc"
+    orderby: List[str] = [f"{key} {direction}" for key in KEYSET_ORDER]
+    if select is not None:
+        select = list(select) + [
+            key for key in ("ContentDate", "Id") if key not in select
+        ]
+
+    returned: int = 0
+    last: Optional[Mapping[str, Any]] = None
+    with nullcontext(client) if client is not None else CDSEClient() as session:
+        while returned < max_items:
+            page_size: int = min(limit, max_items - returned)
+            url: str = products_url(
+                base_url,
+                _keyset_where(where, last, descending),
+                page_size,
+                select,
+                expand,
+                orderby,
+            )
+            response: Response = session.get(
+                url=url,
+                headers={"Prefer": f"odata.maxpagesize={page_size}"},
+                timeout=timeout,
+                bypass_cache=bypass_cache,
+            )
+            response.raise_for_status()  # Raise an error for HTTP error codes
+            products: List[Mapping[str, Any]] = (
+                codec.loads(response.content).get("value") or []
+            )
+
+            # a short page is not the last one: the server may cap the page size
+            # below the requested one, only an empty page ends the results
+            if not products:
+                return
+
+            for product in products[:page_size]:
+                yield product
+                returned += 1
+
+            last = products[min(len(products), page_size) - 1]
+
+
+async def afollow_pages(
+    url: str | None,
+    limit: int,
+    timeout: int,
+    client: Optional[AsyncCDSEClient],
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    Asynchronous counterpart of `follow_pages`.
+    """
+    async with (
+        nullcontext(client) if client is not None else AsyncCDSEClient()
+    ) as session:
+        while url:
+            response: Response = await session.get(
+                url=url,
+                headers={"Prefer": f"odata.maxpagesize={limit}"},
+                timeout=timeout,
+            )
+            response.raise_for_status()  # Raise an error for HTTP error codes
+            page: Mapping[str, Any] = codec.loads(response.content)
+
+            yield page
+
+            url = page.get("@odata.nextLink")
+
+
+async def _ano_pages() -> AsyncIterator[Mapping[str, Any]]:
+    return
+    yield
+
+
+async def atake(
+    pages: AsyncIterator[Mapping[str, Any]], max_items: int
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    Asynchronous counterpart of `take`.
+    """
+    if max_items <= 0:
+        return
+
+    returned: int = 0
+    async for page in pages:
+        for product in page.get("value") or []:
+            yield product
+
+            returned += 1
+            if returned >= max_items:
+                return
+
+
+async def afetch_count(
+    url: str,
+    timeout: int,
+    client: Optional[AsyncCDSEClient],
+) -> int:
+    """
+    Asynchronous counterpart of `fetch_count`.
+    """
+    async with (
+        nullcontext(client) if client is not None else AsyncCDSEClient()
+    ) as session:
+        response: Response = await session.get(url=url, timeout=timeout)
+
+    response.raise_for_status()  # Raise an error for HTTP error codes
+    return int(codec.loads(response.content)["@odata.count"])
+
+
+async def amap_ordered(
+    function: Callable[[T], Awaitable[R]], items: Iterable[T], window: int
+) -> AsyncGenerator[R, None]:
+    """
+    Run `function` on the input items concurrently, yielding the results in the same
+    order as the input items.
+
+    At most `window` items are in flight at any time: the next one is scheduled only
+    once the oldest result has been consumed, so that a slow consumer never lets all
+    the results pile up in memory.
+    """
+    if window <= 0:
+        raise ValueError(f"window must be a positive integer, {window} given")
+
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(function(item)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # the consumer may stop early, do not fetch what nobody will read
+        for future in pending:
+            future.cancel()
+
+
+def aiter_pages(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    asyncio counterpart of `iter_pages`.
+    """
+    where: Optional[str] = satisfiable_where(cql2_filter)
+    if where is None:
+        return _ano_pages()
+
+    url: str = products_url(base_url, where, max_items, select, expand, orderby)
+    return afollow_pages(url, limit, timeout, client)
+
+
+def aiter_products(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    asyncio counterpart of `iter_products`.
+    """
+    return atake(
+        aiter_pages(
+            base_url=base_url,
+            cql2_filter=cql2_filter,
+            limit=limit,
+            max_items=max_items,
+            timeout=timeout,
+            client=client,
+            select=select,
+            expand=expand,
+            orderby=orderby,
+        ),
+        max_items,
+    )
+
+
+async def async_http_invoke(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    orderby: Optional[Sequence[str]] = None,
+) -> Mapping[str, Any]:
+    """
+    asyncio counterpart of `http_invoke`.
+    """
+    return {
+        "value": [
+            product
+            async for product in aiter_products(
+                base_url=base_url,
+                cql2_filter=cql2_filter,
+                limit=limit,
+                max_items=max_items,
+                timeout=timeout,
+                client=client,
+                select=select,
+                expand=expand,
+                orderby=orderby,
+            )
+        ]
+    }
+
+
+async def acount(
+    base_url: str,
+    cql2_filter: Cql2Filter,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+) -> int:
+    """
+    Retrieve, via `$count`, how many OData Products match the input filter, without
+    downloading any of them.
+    """
+    where: Optional[str] = satisfiable_where(cql2_filter)
+    if where is None:
+        return 0
+
+    return await afetch_count(count_url(base_url, where), timeout, client)
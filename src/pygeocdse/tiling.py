@@ -0,0 +1,310 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from contextlib import nullcontext
+from loguru import logger
+from pygeocdse.ast_utils import and_chain, flatten_and
+from pygeocdse.client import AsyncCDSEClient, WireLogging
+from pygeocdse.evaluator import to_cdse_where
+from pygeocdse.optimizer import UnsatisfiableFilter
+from pygeocdse.fields import PRODUCT_EXPANSIONS
+from pygeocdse.search import afollow_pages, amap_ordered, atake, products_url
+from pygeofilter.ast import AstType, GeometryIntersects
+from pygeofilter.util import IdempotentDict
+from pygeofilter.values import Geometry
+from shapely import get_dimensions, unary_union
+from shapely.geometry import GeometryCollection, box, mapping, shape
+from shapely.geometry.base import BaseGeometry
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+import asyncio
+import math
+
+MIN_AUTO_TILE_SIZE = 1.0
+"""Smallest tile edge, in degrees, the automatic tiling can choose."""
+
+
+def _split_intersects(filter: AstType) -> Tuple[List[AstType], int, GeometryIntersects]:
+    """
+    Locate the `s_intersects` clause, as built by `ast_utils.bbox_filter`, among the
+    top level AND clauses of the input filter.
+    """
+    clauses: List[AstType] = flatten_and(filter)
+
+    for i, clause in enumerate(clauses):
+        if isinstance(clause, GeometryIntersects) and isinstance(clause.rhs, Geometry):
+            return clauses, i, clause
+
+    raise ValueError(
+        "The input filter does not declare any top level 's_intersects' criterion, use 'bbox_filter' to set it."
+    )
+
+
+def _auto_tile_size(aoi: BaseGeometry, max_tiles: int) -> float:
+    minx, miny, maxx, maxy = aoi.bounds
+    per_side: int = max(1, math.isqrt(max_tiles))
+    return max(MIN_AUTO_TILE_SIZE, max(maxx - minx, maxy - miny) / per_side)
+
+
+def _same_dimension(piece: BaseGeometry, dimension: int) -> BaseGeometry:
+    """
+    Drop the lower dimensional leftovers (e.g. shared edges) an intersection may produce.
+    """
+    if isinstance(piece, GeometryCollection):
+        return unary_union(
+            [part for part in piece.geoms if dimension == get_dimensions(part)]
+        )
+
+    if dimension != get_dimensions(piece):
+        return GeometryCollection()
+
+    return piece
+
+
+def tile_geometry(
+    geometry: Mapping[str, Any],
+    tile_size: Optional[float] = None,
+    max_tiles: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Split the input GeoJSON geometry along a regular grid of `tile_size` degrees,
+    returning the non-empty pieces, row by row.
+
+    When `tile_size` is not set, it is chosen so that the AOI bounding box is covered
+    by roughly `max_tiles` square tiles, but never smaller than `MIN_AUTO_TILE_SIZE`.
+    """
+    aoi: BaseGeometry = shape(geometry)
+
+    if tile_size is None:
+        tile_size = _auto_tile_size(aoi, max_tiles)
+    elif tile_size <= 0:
+        raise ValueError(f"tile_size must be a positive number, {tile_size} given")
+
+    minx, miny, maxx, maxy = aoi.bounds
+    columns: int = max(1, math.ceil((maxx - minx) / tile_size))
+    rows: int = max(1, math.ceil((maxy - miny) / tile_size))
+
+    if 1 == columns * rows:
+        return [dict(mapping(aoi))]
+
+    dimension: int = get_dimensions(aoi)
+    tiles: List[Dict[str, Any]] = []
+    for row in range(rows):
+        for column in range(columns):
+            cell = box(
+                minx + column * tile_size,
+                miny + row * tile_size,
+                min(maxx, minx + (column + 1) * tile_size),
+                min(maxy, miny + (row + 1) * tile_size),
+            )
+            piece: BaseGeometry = _same_dimension(aoi.intersection(cell), dimension)
+            if not piece.is_empty:
+                tiles.append(dict(mapping(piece)))
+
+    logger.debug(
+        f"AOI split in {len(tiles)} tile(s) of {tile_size} degrees ({columns}x{rows} grid)."
+    )
+
+    return tiles
+
+
+def tile_filter(
+    filter: AstType,
+    tile_size: Optional[float] = None,
+    max_tiles: int = 16,
+) -> List[AstType]:
+    """
+    Derive, from the input filter, one filter per AOI tile, each of them replacing the
+    original `s_intersects` geometry with the tile one.
+    """
+    clauses, index, intersects = _split_intersects(filter)
+
+    filters: List[AstType] = []
+    for tile in tile_geometry(intersects.rhs.geometry, tile_size, max_tiles):
+        tile_clauses = list(clauses)
+        tile_clauses[index] = GeometryIntersects(intersects.lhs, Geometry(tile))
+        filters.append(and_chain(tile_clauses))
+
+    return filters
+
+
+async def aiter_tiled_products(
+    base_url: str,
+    filter: AstType,
+    tile_size: Optional[float] = None,
+    max_tiles: int = 16,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    client: Optional[AsyncCDSEClient] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Mapping[str, Any]]:
+    """
+    Search the OData Products matching the input filter, by querying each AOI tile
+    concurrently and removing the Products returned by more than one tile.
+
+    Products are yielded tile by tile, stopping once `max_items` distinct Products
+    have been yielded. At most `max_concurrency` tiles (the `max_concurrency` of the
+    client session, by default) are searched at the same time, the next one starts
+    only once the oldest has been consumed.
+    """
+    if max_items <= 0:
+        return
+
+    filters: List[AstType] = tile_filter(filter, tile_size, max_tiles)
+
+    async with (
+        nullcontext(client) if client is not None else AsyncCDSEClient()
+    ) as session:
+
+        async def fetch(tile_filter: AstType) -> List[Mapping[str, Any]]:
+            try:
+                where: str = to_cdse_where(tile_filter, IdempotentDict())
+            except UnsatisfiableFilter:
+                return []
+
+            url: str = products_url(base_url, where, max_items, select, expand)
+            return [
+                product
+                async for product in atake(
+                    afollow_pages(url, limit, timeout, session), max_items
+                )
+            ]
+
+        seen: Set[Any] = set()
+        tiles = amap_ordered(fetch, filters, max_concurrency or session.max_concurrency)
+        try:
+            async for products in tiles:
+                for product in products:
+                    product_id = product.get("Id")
+                    if product_id in seen:
+                        continue
+                    seen.add(product_id)
+
+                    yield product
+
+                    if len(seen) >= max_items:
+                        return
+        finally:
+            await tiles.aclose()
+
+
+def iter_tiled_products(
+    base_url: str,
+    filter: AstType,
+    tile_size: Optional[float] = None,
+    max_tiles: int = 16,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    max_concurrency: int = 10,
+    http2: bool = False,
+    wire_logging: Optional[WireLogging] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Blocking counterpart of `aiter_tiled_products`, driving it on a private event
+    loop: Products are yielded as soon as their tile has been searched, so that no
+    more than `max_concurrency` tiles are ever held in memory.
+    """
+
+    async def open_client() -> AsyncCDSEClient:
+        return AsyncCDSEClient(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+            max_concurrency=max_concurrency,
+            http2=http2,
+            timeout=timeout,
+            wire_logging=wire_logging,
+        )
+
+    loop = asyncio.new_event_loop()
+    client: AsyncCDSEClient = loop.run_until_complete(open_client())
+    products: AsyncIterator[Mapping[str, Any]] = aiter_tiled_products(
+        base_url=base_url,
+        filter=filter,
+        tile_size=tile_size,
+        max_tiles=max_tiles,
+        limit=limit,
+        max_items=max_items,
+        timeout=timeout,
+        client=client,
+        select=select,
+        expand=expand,
+        max_concurrency=max_concurrency,
+    )
+    try:
+        while True:
+            try:
+                product = loop.run_until_complete(products.__anext__())
+            except StopAsyncIteration:
+                return
+            yield product
+    finally:
+        # the consumer may stop early, cancel the tiles still in flight
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+def tiled_http_invoke(
+    base_url: str,
+    filter: AstType,
+    tile_size: Optional[float] = None,
+    max_tiles: int = 16,
+    limit: int = 20,
+    max_items: int = 200,
+    timeout: int = 30,
+    max_concurrency: int = 10,
+    http2: bool = False,
+    wire_logging: Optional[WireLogging] = None,
+    select: Optional[Sequence[str]] = None,
+    expand: Sequence[str] = PRODUCT_EXPANSIONS,
+) -> Mapping[str, Any]:
+    """
+    Blocking counterpart of `aiter_tiled_products`, collecting all the Products.
+    """
+    return {
+        "value": list(
+            iter_tiled_products(
+                base_url=base_url,
+                filter=filter,
+                tile_size=tile_size,
+                max_tiles=max_tiles,
+                limit=limit,
+                max_items=max_items,
+                timeout=timeout,
+                max_concurrency=max_concurrency,
+                http2=http2,
+                wire_logging=wire_logging,
+                select=select,
+                expand=expand,
+            )
+        )
+    }
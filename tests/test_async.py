@@ -0,0 +1,125 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict
+
+import asyncio
+import httpx
+import unittest
+
+from pygeocdse.client import AsyncCDSEClient, CDSEClient
+from pygeocdse.search import (
+    aiter_products,
+    amap_ordered,
+    async_http_invoke,
+    http_invoke,
+)
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+CQL2_FILTER = {"op": "<=", "args": [{"property": "cloudCover"}, 20]}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    skip = int(request.url.params.get("$skip", 0))
+    page: Dict[str, Any] = {
+        "value": [{"Id": f"product-{i}"} for i in range(skip, skip + 10)]
+    }
+    if skip < 20:
+        page["@odata.nextLink"] = f"{BASE_URL}?$skip={skip + 10}"
+    return httpx.Response(200, json=page)
+
+
+async def _async_handler(request: httpx.Request) -> httpx.Response:
+    return _handler(request)
+
+
+class TestAsyncSearch(unittest.IsolatedAsyncioTestCase):
+    async def test_same_output_as_sync(self):
+        with CDSEClient(transport=httpx.MockTransport(_handler)) as client:
+            expected = http_invoke(BASE_URL, CQL2_FILTER, max_items=25, client=client)
+
+        async with AsyncCDSEClient(
+            transport=httpx.MockTransport(_async_handler)
+        ) as client:
+            current = await async_http_invoke(
+                BASE_URL, CQL2_FILTER, max_items=25, client=client
+            )
+
+        self.assertEqual(expected, current)
+
+    async def test_concurrency_limit(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"value": [{"Id": "product-0"}]})
+
+        async with AsyncCDSEClient(
+            max_concurrency=2, transport=httpx.MockTransport(handler)
+        ) as client:
+            results = await asyncio.gather(
+                *(
+                    async_http_invoke(BASE_URL, CQL2_FILTER, client=client)
+                    for _ in range(6)
+                )
+            )
+
+        self.assertEqual(6, len(results))
+        self.assertEqual(2, peak)
+
+    async def test_aiter_products_stops_at_max_items(self):
+        async with AsyncCDSEClient(
+            transport=httpx.MockTransport(_async_handler)
+        ) as client:
+            products = [
+                product
+                async for product in aiter_products(
+                    BASE_URL, CQL2_FILTER, max_items=15, client=client
+                )
+            ]
+
+        self.assertEqual(15, len(products))
+
+    async def test_amap_ordered_keeps_order(self):
+        async def square(i: int) -> int:
+            # the first items complete last
+            await asyncio.sleep(0.001 * (10 - i))
+            return i * i
+
+        results = [result async for result in amap_ordered(square, range(10), 4)]
+
+        self.assertEqual([i * i for i in range(10)], results)
+
+    async def test_amap_ordered_bounded_window(self):
+        started = []
+
+        async def fetch(i: int) -> int:
+            started.append(i)
+            return i
+
+        results = amap_ordered(fetch, range(100), 3)
+        self.assertEqual(0, await results.__anext__())
+        await results.aclose()
+
+        self.assertEqual([0, 1, 2], started)
+
+    async def test_amap_ordered_invalid_window(self):
+        with self.assertRaises(ValueError):
+            [result async for result in amap_ordered(asyncio.sleep, [0], 0)]
@@ -12,9 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest.mock import patch
+
 import unittest
 
-from pygeocdse.odata_attributes import get_attribute_type
+from pygeocdse.ast_utils import (
+    collection_names,
+    collections_filter,
+    datetime_or_interval_filter,
+)
+from pygeocdse.evaluator import to_cdse
+from pygeocdse.odata_attributes import (
+    ATTRIBUTE_TYPE_CONFLICTS,
+    ATTRIBUTE_TYPE_INDEX,
+    COLLECTION_ATTRIBUTES,
+    get_attribute_type,
+)
 
 
 class TestOdataAttributes(unittest.TestCase):
@@ -42,3 +55,78 @@ class TestOdataAttributes(unittest.TestCase):
         attribute_name = "not_found"
         with self.assertRaises(ValueError):
             get_attribute_type(attribute_name)
+
+    def test_get_attribute_type_additional(self):
+        self.assertEqual("", get_attribute_type("Collection/Name"))
+
+    def test_get_attribute_type_rtc(self):
+        attribute_name = "spatialResolution"
+        self.assertEqual("Integer", get_attribute_type(attribute_name))
+        self.assertEqual(
+            "Integer", get_attribute_type(attribute_name, ["SENTINEL-1-RTC"])
+        )
+
+    def test_get_attribute_type_by_collection(self):
+        attribute_name = "cloudCover"
+        expected = "Double"
+        self.assertEqual(expected, get_attribute_type(attribute_name, ["SENTINEL-2"]))
+
+    def test_get_attribute_type_not_in_collection(self):
+        # declared by the other collections only, their type is assumed
+        self.assertEqual("Double", get_attribute_type("cloudCover", ["SENTINEL-1"]))
+        self.assertEqual("String", get_attribute_type("orbitDirection", ["SENTINEL-2"]))
+
+    def test_get_attribute_type_unknown_in_collection(self):
+        with self.assertRaises(ValueError):
+            get_attribute_type("not_found", ["SENTINEL-2"])
+
+    def test_get_attribute_type_conflict_not_in_collection(self):
+        with patch.dict(
+            ATTRIBUTE_TYPE_CONFLICTS,
+            {"cloudCover": {"SENTINEL-2": "Double", "SENTINEL-3": "Integer"}},
+        ):
+            with self.assertRaises(ValueError):
+                get_attribute_type("cloudCover", ["SENTINEL-1"])
+
+    def test_to_cdse_attribute_not_in_collection(self):
+        # Collection/Name = 'SENTINEL-2' AND orbitDirection = 'DESCENDING'
+        self.assertEqual(
+            "Collection/Name eq 'SENTINEL-2' and Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'orbitDirection' and att/OData.CSC.StringAttribute/Value eq 'DESCENDING')",
+            to_cdse(
+                {
+                    "op": "and",
+                    "args": [
+                        {
+                            "op": "=",
+                            "args": [{"property": "Collection/Name"}, "SENTINEL-2"],
+                        },
+                        {
+                            "op": "=",
+                            "args": [{"property": "orbitDirection"}, "DESCENDING"],
+                        },
+                    ],
+                }
+            ),
+        )
+
+    def test_get_attribute_type_unknown_collection(self):
+        attribute_name = "relativeOrbitNumber"
+        expected = "Integer"
+        self.assertEqual(expected, get_attribute_type(attribute_name, ["LANDSAT-8"]))
+
+    def test_index_covers_all_collections(self):
+        for collection, attributes in COLLECTION_ATTRIBUTES.items():
+            for attribute_name, type in attributes.items():
+                self.assertEqual(
+                    type, ATTRIBUTE_TYPE_INDEX[(collection, attribute_name)]
+                )
+
+    def test_collection_names(self):
+        filter = collections_filter(
+            datetime_or_interval_filter(
+                None, "2024-01-01T00:00:00Z/2024-02-01T00:00:00Z"
+            ),
+            ["SENTINEL-1", "SENTINEL-2"],
+        )
+        self.assertEqual(["SENTINEL-1", "SENTINEL-2"], collection_names(filter))
+        self.assertEqual([], collection_names(None))
@@ -0,0 +1,180 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
+import json
+import re
+import threading
+import unittest
+
+from pygeocdse.batch import batch_http_invoke
+from pygeocdse.client import CDSEClient
+
+PAGE_SIZE = 2
+
+
+def _page(path: str) -> Dict[str, Any]:
+    """
+    One Product per character of the `$filter` tail, paginated by `$skip`.
+    """
+    query = parse_qs(urlsplit(path).query)
+    name = query["$filter"][0].split("'")[-2]
+    skip = int(query.get("$skip", ["0"])[0])
+    value = [{"Id": f"{name}-{i}"} for i in range(skip, min(skip + PAGE_SIZE, 3))]
+
+    page: Dict[str, Any] = {"value": value}
+    if skip + PAGE_SIZE < 3:
+        page["@odata.nextLink"] = (
+            f"{StandInHandler.base_url}{urlsplit(path).path}?{urlsplit(path).query}&$skip={skip + PAGE_SIZE}"
+        )
+    return page
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    base_url = ""
+    # status answered to $batch requests, if rejected
+    reject_batch = 0
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StandInHandler.requests.append(("GET", self.path))
+        self._send(200, "application/json", json.dumps(_page(self.path)).encode())
+
+    def do_POST(self):
+        StandInHandler.requests.append(("POST", self.path))
+        content = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if self.reject_batch:
+            status = HTTPStatus(self.reject_batch)
+            self._send(status, "text/plain", status.phrase.encode())
+            return
+
+        boundary = re.search(r"boundary=(\S+)", self.headers["Content-Type"]).group(1)
+        parts = []
+        for part in content.decode().split(f"--{boundary}")[1:-1]:
+            content_id = re.search(r"Content-ID: (\d+)", part).group(1)
+            path = re.search(r"GET (\S+) HTTP/1.1", part).group(1)
+            parts.append((content_id, json.dumps(_page(f"/odata/v1/{path}"))))
+
+        # answer in reverse order, relying on the Content-ID to match the requests
+        body = "".join(
+            "--batchresponse\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: {content_id}\r\n"
+            "\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+            f"{page}\r\n"
+            for content_id, page in reversed(parts)
+        )
+        body += "--batchresponse--\r\n"
+        self._send(200, "multipart/mixed; boundary=batchresponse", body.encode())
+
+
+def _filter(name: str) -> dict:
+    return {"op": "=", "args": [{"property": "Collection/Name"}, name]}
+
+
+class TestBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        StandInHandler.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.products_url = f"{StandInHandler.base_url}/odata/v1/Products"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.requests = []
+        StandInHandler.reject_batch = 0
+
+    def _expected(self, names):
+        return [{"value": [{"Id": f"{n}-{i}"} for i in range(3)]} for n in names]
+
+    def test_batch(self):
+        names = ["A", "B", "C", "D", "E"]
+        with CDSEClient() as client:
+            results = batch_http_invoke(
+                self.products_url,
+                [_filter(n) for n in names],
+                limit=PAGE_SIZE,
+                batch_size=2,
+                client=client,
+            )
+
+        self.assertEqual(self._expected(names), results)
+
+        posts = [path for method, path in StandInHandler.requests if "POST" == method]
+        self.assertEqual(["/odata/v1/$batch"] * 3, posts)
+
+    def test_max_items(self):
+        results = batch_http_invoke(
+            self.products_url, [_filter("A")], limit=PAGE_SIZE, max_items=1
+        )
+        self.assertEqual([{"value": [{"Id": "A-0"}]}], results)
+        self.assertEqual(1, len(StandInHandler.requests))
+
+    def test_fallback(self):
+        StandInHandler.reject_batch = HTTPStatus.METHOD_NOT_ALLOWED
+
+        names = ["A", "B", "C"]
+        results = batch_http_invoke(
+            self.products_url,
+            [_filter(n) for n in names],
+            limit=PAGE_SIZE,
+            batch_size=2,
+        )
+
+        self.assertEqual(self._expected(names), results)
+        # $batch is not tried again once rejected
+        methods = [method for method, _ in StandInHandler.requests]
+        self.assertEqual(1, methods.count("POST"))
+        self.assertEqual(6, methods.count("GET"))
+
+    def test_server_error_not_fallback(self):
+        for status in (
+            HTTPStatus.UNAUTHORIZED,
+            HTTPStatus.TOO_MANY_REQUESTS,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+        ):
+            StandInHandler.requests = []
+            StandInHandler.reject_batch = status
+
+            with self.assertRaises(RuntimeError):
+                batch_http_invoke(
+                    self.products_url, [_filter("A"), _filter("B")], limit=PAGE_SIZE
+                )
+
+            # a failing server is not mistaken for a missing $batch support
+            methods = [method for method, _ in StandInHandler.requests]
+            self.assertEqual(["POST"], methods)
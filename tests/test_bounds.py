@@ -0,0 +1,110 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from unittest.mock import patch
+
+import json
+import shapely
+import unittest
+
+from pygeocdse.converters.bounds import geometries_bounds, geometry_bounds, iter_bounds
+
+ODATA_SEARCH = Path(__file__).parent / "artifacts" / "odata_search.json"
+
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [[[10, 40], [12, 40], [12, 42.5], [10, 42.5], [10, 40]]],
+}
+
+MULTI_POLYGON = {
+    "type": "MultiPolygon",
+    "coordinates": [
+        [[[10, 40], [11, 40], [11, 41], [10, 40]]],
+        [[[-5, 38], [-4, 38], [-4, 39], [-5, 38]]],
+    ],
+}
+
+
+class TestBounds(unittest.TestCase):
+    def test_polygons(self):
+        self.assertEqual(
+            [[10.0, 40.0, 12.0, 42.5], [-5.0, 38.0, 11.0, 41.0]],
+            geometries_bounds([POLYGON, MULTI_POLYGON]),
+        )
+
+    def test_any_geometry_type(self):
+        self.assertEqual(
+            [1.5, 2.0, 1.5, 2.0],
+            geometry_bounds({"type": "Point", "coordinates": [1.5, 2]}),
+        )
+        self.assertEqual(
+            [0.0, -1.0, 3.0, 4.0],
+            geometry_bounds(
+                {"type": "LineString", "coordinates": [[0, 4], [3, -1], [1, 1, 10]]}
+            ),
+        )
+        self.assertEqual(
+            [-5.0, 2.0, 12.0, 42.5],
+            geometry_bounds(
+                {
+                    "type": "GeometryCollection",
+                    "geometries": [POLYGON, {"type": "Point", "coordinates": [-5, 2]}],
+                }
+            ),
+        )
+
+    def test_missing_and_empty_geometries(self):
+        self.assertEqual(
+            [None, [10.0, 40.0, 12.0, 42.5], None],
+            geometries_bounds([None, POLYGON, {"type": "Polygon", "coordinates": []}]),
+        )
+
+    def test_invalid_geometry(self):
+        with self.assertRaises(ValueError):
+            geometry_bounds({"type": "Triangle", "coordinates": []})
+
+    def test_iter_bounds(self):
+        products = [{"Id": str(i), "GeoFootprint": POLYGON} for i in range(5)]
+        products[2] = {"Id": "2"}
+
+        current = list(iter_bounds(products, chunk_size=2))
+
+        self.assertEqual(products, [product for product, _ in current])
+        self.assertEqual(
+            [[10.0, 40.0, 12.0, 42.5]] * 2 + [None] + [[10.0, 40.0, 12.0, 42.5]] * 2,
+            [bbox for _, bbox in current],
+        )
+
+    def test_matches_shapely(self):
+        with ODATA_SEARCH.open() as input_stream:
+            footprints = [p["GeoFootprint"] for p in json.load(input_stream)["value"]]
+        footprints += [POLYGON, MULTI_POLYGON]
+
+        self.assertEqual(
+            shapely.bounds(
+                shapely.from_geojson(list(map(json.dumps, footprints)))
+            ).tolist(),
+            geometries_bounds(footprints),
+        )
+
+    def test_geometries_are_not_serialized(self):
+        with patch("pygeocdse.codec.dumps") as dumps:
+            list(iter_bounds([{"GeoFootprint": POLYGON}, {"GeoFootprint": None}]))
+
+        dumps.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import httpx
+import time
+import unittest
+
+from pygeocdse.cache import ResponseCache, cache_key
+from pygeocdse.client import CDSEClient
+from pygeocdse.search import http_invoke
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+CQL2_FILTER = {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-2"]}
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name) / "cache.sqlite"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_normalized_key(self):
+        self.assertEqual(
+            cache_key(f"{BASE_URL}?a=1&b=2", {"Prefer": "odata.maxpagesize=20"}),
+            cache_key(f"{BASE_URL}?b=2&a=1", {"prefer": "odata.maxpagesize=20"}),
+        )
+        self.assertNotEqual(
+            cache_key(f"{BASE_URL}?a=1", {"Prefer": "odata.maxpagesize=20"}),
+            cache_key(f"{BASE_URL}?a=1", {"Prefer": "odata.maxpagesize=50"}),
+        )
+
+    def test_ttl(self):
+        cache = ResponseCache(self.path)
+        cache.put(BASE_URL, None, b"{}", ttl=-1)
+        cache.put(f"{BASE_URL}?a=1", None, b"{}")
+
+        self.assertIsNone(cache.get(BASE_URL))
+        self.assertEqual(b"{}", cache.get(f"{BASE_URL}?a=1"))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.path, max_size=20)
+        cache.put(f"{BASE_URL}?a=1", None, b"0123456789")
+        time.sleep(0.01)
+        cache.put(f"{BASE_URL}?a=2", None, b"0123456789")
+        time.sleep(0.01)
+        # touch the first entry, the second one becomes the least recently used
+        cache.get(f"{BASE_URL}?a=1")
+        cache.put(f"{BASE_URL}?a=3", None, b"0123456789")
+
+        self.assertIsNotNone(cache.get(f"{BASE_URL}?a=1"))
+        self.assertIsNone(cache.get(f"{BASE_URL}?a=2"))
+        self.assertIsNotNone(cache.get(f"{BASE_URL}?a=3"))
+
+    def test_shared_by_client_sessions(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"value": [{"Id": "product-0"}]})
+
+        for bypass_cache in (False, False, True):
+            with CDSEClient(
+                cache=ResponseCache(self.path),
+                transport=httpx.MockTransport(handler),
+            ) as client:
+                data = http_invoke(
+                    BASE_URL, CQL2_FILTER, client=client, bypass_cache=bypass_cache
+                )
+                self.assertEqual([{"Id": "product-0"}], data["value"])
+
+        self.assertEqual(2, len(requests))
@@ -78,10 +78,33 @@ class TestCDSEEvaluator(unittest.TestCase):
             ],
         }
 
-        expected = "(Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'IW_GRHD_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'IW_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'EW_GRDM_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'EW_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S1_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S2_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S3_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S4_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S5_GRDH_1S') or Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value eq 'S6_GRDH_1S'))"
+        expected = "Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'productType' and att/OData.CSC.StringAttribute/Value in ('IW_GRHD_1S','IW_GRDH_1S','EW_GRDM_1S','EW_GRDH_1S','S1_GRDH_1S','S2_GRDH_1S','S3_GRDH_1S','S4_GRDH_1S','S5_GRDH_1S','S6_GRDH_1S'))"
 
         self.assertEqual(expected, to_cdse(cql2_filter))
 
+    def test_or_of_equalities(self):
+        cql2_filter = {
+            "op": "or",
+            "args": [
+                {"op": "=", "args": [{"property": "tileId"}, "32TQM"]},
+                {"op": "=", "args": [{"property": "tileId"}, "32TQN"]},
+                {"op": "=", "args": [{"property": "tileId"}, "32TQM"]},
+            ],
+        }
+        expected = "Attributes/OData.CSC.StringAttribute/any(att:att/Name eq 'tileId' and att/OData.CSC.StringAttribute/Value in ('32TQM','32TQN'))"
+        self.assertEqual(expected, to_cdse(cql2_filter))
+
+    def test_collection_names(self):
+        cql2_filter = {
+            "op": "or",
+            "args": [
+                {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-1"]},
+                {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-2"]},
+            ],
+        }
+        expected = "Collection/Name in ('SENTINEL-1','SENTINEL-2')"
+        self.assertEqual(expected, to_cdse(cql2_filter))
+
     # write test for
     # Collection/Name eq 'SENTINEL-2'
     # and Attributes/OData.CSC.DoubleAttribute/any(att:att/Name eq 'cloudCover'
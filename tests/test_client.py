@@ -0,0 +1,64 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import unittest
+
+from pygeocdse.client import CDSEClient
+from pygeocdse.search import http_invoke
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+CQL2_FILTER = {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-2"]}
+
+
+class TestCDSEClient(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return httpx.Response(200, json={"value": [{"Id": "product-0"}]})
+
+        self.client = CDSEClient(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_session_is_reused_across_searches(self):
+        for _ in range(3):
+            data = http_invoke(BASE_URL, CQL2_FILTER, client=self.client)
+            self.assertEqual(1, len(data["value"]))
+
+        self.assertEqual(3, len(self.requests))
+        self.assertFalse(self.client.http_client.is_closed)
+
+    def test_session_is_shared_among_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda _: http_invoke(BASE_URL, CQL2_FILTER, client=self.client),
+                    range(8),
+                )
+            )
+
+        self.assertEqual(8, len(results))
+        self.assertEqual(8, len(self.requests))
+
+    def test_closed_session(self):
+        self.client.close()
+        with self.assertRaises(RuntimeError):
+            http_invoke(BASE_URL, CQL2_FILTER, client=self.client)
@@ -0,0 +1,65 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+import io
+import json
+import unittest
+
+from pygeocdse import codec
+from pygeocdse.converters.streaming import write_feature_collection
+
+VALUE = {
+    "type": "Feature",
+    "id": "S2B_MSIL2A_20250101T000000",
+    "geometry": {"type": "Point", "coordinates": [12.5, -41.9]},
+    "properties": {"cloudCover": 3.25, "online": True, "tiles": ["T33TTG"]},
+    "bbox": None,
+}
+
+
+class TestCodec(unittest.TestCase):
+    def test_round_trip(self):
+        for backend in (codec.orjson, None):
+            with patch.object(codec, "orjson", backend):
+                self.assertEqual(VALUE, codec.loads(codec.dumps(VALUE)))
+                self.assertEqual(VALUE, codec.loads(json.dumps(VALUE).encode()))
+
+    def test_compact(self):
+        for backend in (codec.orjson, None):
+            with patch.object(codec, "orjson", backend):
+                self.assertEqual(
+                    json.dumps(VALUE, separators=(",", ":")), codec.dumps(VALUE)
+                )
+
+    def test_indented_as_stdlib(self):
+        for backend in (codec.orjson, None):
+            with patch.object(codec, "orjson", backend):
+                self.assertEqual(json.dumps(VALUE, indent=2), codec.dumps(VALUE, 2))
+
+    def test_streaming_compact_output(self):
+        output_stream = io.StringIO()
+        write_feature_collection(output_stream, [VALUE], indent=None)
+
+        self.assertEqual(
+            json.dumps(
+                {"type": "FeatureCollection", "features": [VALUE]},
+                separators=(",", ":"),
+            ),
+            output_stream.getvalue(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
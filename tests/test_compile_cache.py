@@ -0,0 +1,92 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from pygeocdse.evaluator import compile_cache_clear, compile_cache_info, to_cdse
+
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        compile_cache_clear()
+
+    def test_hits_and_misses(self):
+        cql2_filter = {"op": "<=", "args": [{"property": "cloudCover"}, 20]}
+
+        first = to_cdse(cql2_filter)
+        second = to_cdse(json.dumps(cql2_filter))
+
+        self.assertEqual(first, second)
+        info = compile_cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.currsize)
+
+    def test_equivalent_filters_share_entry(self):
+        to_cdse(
+            {
+                "op": "and",
+                "args": [
+                    {"op": "<=", "args": [{"property": "cloudCover"}, 20.0]},
+                    {
+                        "op": "t_begins",
+                        "args": [
+                            {"property": "ContentDate/Start"},
+                            {"timestamp": "2023-02-01T00:00:00.000Z"},
+                        ],
+                    },
+                ],
+            }
+        )
+        to_cdse(
+            {
+                "op": "and",
+                "args": [
+                    {
+                        "op": "t_begins",
+                        "args": [
+                            {"property": "ContentDate/Start"},
+                            {"timestamp": "2023-02-01T00:00:00Z"},
+                        ],
+                    },
+                    {"op": "lte", "args": [{"property": "cloudCover"}, 20]},
+                ],
+            }
+        )
+
+        info = compile_cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.currsize)
+
+    def test_timestamps_keep_precision_and_offset(self):
+        def t_begins(timestamp):
+            return {
+                "op": "t_begins",
+                "args": [{"property": "ContentDate/Start"}, {"timestamp": timestamp}],
+            }
+
+        to_cdse(t_begins("2023-02-01T01:00:00.250+01:00"))
+        to_cdse(t_begins("2023-02-01T00:00:00.250Z"))
+        self.assertEqual(1, compile_cache_info().currsize)
+
+        to_cdse(t_begins("2023-02-01T00:00:00.750Z"))
+        to_cdse(t_begins("2023-02-01T00:00:00.250+01:00"))
+        self.assertEqual(3, compile_cache_info().currsize)
+
+    def test_different_filters(self):
+        to_cdse({"op": "<=", "args": [{"property": "cloudCover"}, 20]})
+        to_cdse({"op": "<=", "args": [{"property": "cloudCover"}, 21]})
+
+        self.assertEqual(2, compile_cache_info().currsize)
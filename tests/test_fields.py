@@ -0,0 +1,74 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pygeocdse.converters.odata2geojson import REQUIRED_FIELDS
+from pygeocdse.fields import PRODUCT_PROPERTIES, resolve_fields, resolve_sortby
+from pygeocdse.search import products_url
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+
+class TestFields(unittest.TestCase):
+    def test_default_url(self):
+        self.assertEqual(
+            f"{BASE_URL}?$filter=x&$top=10&$expand=Assets&$expand=Attributes&$expand=Locations",
+            products_url(BASE_URL, "x", 10),
+        )
+
+    def test_footprint_only(self):
+        select, expand = resolve_fields(["Id,GeoFootprint"], REQUIRED_FIELDS)
+        self.assertEqual(["Id", "GeoFootprint"], select)
+        self.assertEqual([], expand)
+        self.assertEqual(
+            f"{BASE_URL}?$filter=x&$top=10&$select=Id,GeoFootprint",
+            products_url(BASE_URL, "x", 10, select, expand),
+        )
+
+    def test_no_fields(self):
+        self.assertEqual((None, []), resolve_fields([], REQUIRED_FIELDS))
+
+    def test_include_navigation(self):
+        select, expand = resolve_fields(["+Attributes", "Name"], REQUIRED_FIELDS)
+        self.assertEqual(["Id", "Name", "GeoFootprint"], select)
+        self.assertEqual(["Attributes"], expand)
+
+    def test_exclude(self):
+        select, expand = resolve_fields(["-Checksum", "-Locations"])
+        self.assertEqual([p for p in PRODUCT_PROPERTIES if "Checksum" != p], select)
+        self.assertEqual(["Assets", "Attributes", "Locations"], expand)
+
+        select, expand = resolve_fields(["-Locations"], ["Attributes"])
+        self.assertIsNone(select)
+        self.assertEqual(["Attributes"], expand)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            resolve_fields(["cloudCover"])
+
+    def test_sortby(self):
+        self.assertEqual(
+            ["ContentDate/Start desc", "Id asc"], resolve_sortby(["-datetime", "+id"])
+        )
+        self.assertEqual(
+            f"{BASE_URL}?$filter=x&$top=10&$orderby=ContentDate/Start desc",
+            products_url(
+                BASE_URL, "x", 10, expand=(), orderby=["ContentDate/Start desc"]
+            ),
+        )
+
+    def test_unsupported_sortby(self):
+        with self.assertRaises(ValueError):
+            resolve_sortby(["cloudCover"])
@@ -0,0 +1,87 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+
+from pygeocdse.ast_utils import bbox_filter
+from pygeocdse.evaluator import (
+    _wkt_cache,
+    compile_cache_clear,
+    to_cdse_where,
+)
+from pygeocdse.geometry import GeometryOptions, reduce_geometries, reduce_geometry
+from pygeofilter.util import IdempotentDict
+from shapely.geometry import Point, mapping, shape
+
+# a circle with lots of vertices and noisy coordinates
+CIRCLE = dict(mapping(Point(12.123456789, 41.987654321).buffer(1, quad_segs=256)))
+
+
+class TestGeometry(unittest.TestCase):
+    def setUp(self):
+        compile_cache_clear()
+
+    def test_default_wkt_unchanged(self):
+        filter = bbox_filter(None, (10.0, 40.0, 12.5, 42.5))
+        self.assertEqual(
+            "OData.CSC.Intersects(area=geography'SRID=4326;POLYGON ((12.5 40, 12.5 42.5, 10 42.5, 10 40, 12.5 40))')",
+            to_cdse_where(filter, IdempotentDict()),
+        )
+
+    def test_simplify(self):
+        reduced = reduce_geometry(CIRCLE, GeometryOptions(simplify_tolerance=0.01))
+        self.assertLess(len(reduced["coordinates"][0]), len(CIRCLE["coordinates"][0]))
+        self.assertTrue(shape(reduced).is_valid)
+
+    def test_precision(self):
+        reduced = reduce_geometry(CIRCLE, GeometryOptions(precision=3))
+        for x, y in reduced["coordinates"][0]:
+            self.assertEqual(x, round(x, 3))
+            self.assertEqual(y, round(y, 3))
+
+    def test_fallback(self):
+        reduced = shape(
+            reduce_geometry(
+                CIRCLE, GeometryOptions(max_wkt_length=200, fallback="envelope")
+            )
+        )
+        self.assertTrue(
+            math.isclose(shape(CIRCLE).envelope.area, reduced.area, rel_tol=1e-9)
+        )
+
+        reduced = shape(reduce_geometry(CIRCLE, GeometryOptions(max_wkt_length=500)))
+        self.assertLessEqual(len(str(reduced)), 500)
+        self.assertTrue(reduced.covers(shape(CIRCLE)))
+
+    def test_unsupported_fallback(self):
+        with self.assertRaises(ValueError):
+            GeometryOptions(fallback="centroid")
+
+    def test_reduce_geometries(self):
+        filter = bbox_filter(None, (10.123456, 40.0, 12.5, 42.5))
+        reduced = reduce_geometries(filter, GeometryOptions(precision=2))
+        self.assertIn(
+            "POLYGON ((10.12 40, 10.12 42.5, 12.5 42.5, 12.5 40, 10.12 40))",
+            to_cdse_where(reduced, IdempotentDict()),
+        )
+
+    def test_wkt_cache(self):
+        filter = bbox_filter(None, (10.0, 40.0, 12.5, 42.5))
+        to_cdse_where(filter, IdempotentDict())
+        to_cdse_where(filter, IdempotentDict())
+
+        info = _wkt_cache.info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
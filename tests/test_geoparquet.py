@@ -0,0 +1,114 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import io
+import json
+import pyarrow
+import pyarrow.parquet
+import shapely
+import unittest
+
+from pygeocdse.converters.odata2geoparquet import write_geoparquet
+
+ODATA_SEARCH = Path(__file__).parent / "artifacts" / "odata_search.json"
+
+
+class TestOData2GeoParquet(unittest.TestCase):
+    def setUp(self):
+        with ODATA_SEARCH.open() as input_stream:
+            self.products = json.load(input_stream)["value"]
+
+    def _write(self, products, **kwargs):
+        output_stream = io.BytesIO()
+        count = write_geoparquet(products, output_stream, **kwargs)
+        output_stream.seek(0)
+        return count, pyarrow.parquet.ParquetFile(output_stream)
+
+    def test_rows_and_batches(self):
+        count, parquet_file = self._write(self.products, batch_size=7)
+
+        self.assertEqual(len(self.products), count)
+        self.assertEqual(len(self.products), parquet_file.metadata.num_rows)
+        self.assertEqual(3, parquet_file.metadata.num_row_groups)
+        self.assertEqual(
+            [product["Id"] for product in self.products],
+            parquet_file.read(columns=["id"]).column("id").to_pylist(),
+        )
+
+    def test_write_to_path(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "products.parquet"
+            count = write_geoparquet(self.products, path)
+
+            self.assertEqual(len(self.products), count)
+            self.assertEqual(
+                len(self.products), pyarrow.parquet.ParquetFile(path).metadata.num_rows
+            )
+
+    def test_geoparquet_metadata(self):
+        _, parquet_file = self._write(self.products)
+
+        geo = json.loads(parquet_file.schema_arrow.metadata[b"geo"])
+        self.assertEqual("geometry", geo["primary_column"])
+        self.assertEqual("WKB", geo["columns"]["geometry"]["encoding"])
+
+    def test_geometry_and_bbox(self):
+        _, parquet_file = self._write(self.products + [{"Id": "no-footprint"}])
+        table = parquet_file.read(columns=["geometry", "bbox"])
+
+        geometry = shapely.from_wkb(table.column("geometry")[0].as_py())
+        self.assertTrue(
+            geometry.equals(shapely.geometry.shape(self.products[0]["GeoFootprint"]))
+        )
+        self.assertEqual(
+            list(geometry.bounds), list(table.column("bbox")[0].as_py().values())
+        )
+
+        self.assertIsNone(table.column("geometry")[-1].as_py())
+        self.assertIsNone(table.column("bbox")[-1].as_py())
+
+    def test_typed_columns(self):
+        _, parquet_file = self._write(self.products, collections=["SENTINEL-1"])
+        schema = parquet_file.schema_arrow
+
+        self.assertEqual(
+            pyarrow.timestamp("us", tz="UTC"), schema.field("content_start").type
+        )
+        self.assertEqual(pyarrow.int64(), schema.field("orbitNumber").type)
+        self.assertEqual(pyarrow.string(), schema.field("productType").type)
+        # SENTINEL-2 only attributes are left out
+        self.assertNotIn("cloudCover", schema.names)
+
+        table = parquet_file.read(columns=["beginningDateTime", "orbitNumber"])
+        self.assertEqual(
+            datetime(2026, 1, 1, 0, 10, 52, 74000, tzinfo=timezone.utc),
+            table.column("beginningDateTime")[0].as_py(),
+        )
+        self.assertEqual(5702, table.column("orbitNumber")[0].as_py())
+
+    def test_invalid_values(self):
+        product = dict(self.products[0])
+        product["Attributes"] = [{"Name": "orbitNumber", "Value": "n/a"}]
+
+        _, parquet_file = self._write([product], collections=["SENTINEL-1"])
+
+        self.assertIsNone(parquet_file.read().column("orbitNumber")[0].as_py())
+
+
+if __name__ == "__main__":
+    unittest.main()
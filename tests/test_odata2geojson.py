@@ -0,0 +1,66 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+from types import MappingProxyType
+
+import geojson
+import io
+import json
+import unittest
+
+from pygeocdse.converters.odata2geojson import (
+    FeatureBuildOptions,
+    iter_features,
+    odata_products_to_feature_collection_geojson,
+    to_feature_collection_geojson,
+)
+
+ODATA_SEARCH = Path(__file__).parent / "artifacts" / "odata_search.json"
+
+
+class TestOData2GeoJSON(unittest.TestCase):
+    def setUp(self):
+        with ODATA_SEARCH.open() as input_stream:
+            self.odata = json.load(input_stream)
+
+    def test_streaming_matches_feature_collection(self):
+        expected = json.loads(
+            geojson.dumps(odata_products_to_feature_collection_geojson(self.odata))
+        )
+
+        output_stream = io.StringIO()
+        to_feature_collection_geojson(self.odata, output_stream)
+        current = json.loads(output_stream.getvalue())
+
+        self.assertEqual(expected, current)
+
+    def test_trailer(self):
+        output_stream = io.StringIO()
+        to_feature_collection_geojson(self.odata, output_stream)
+        current = json.loads(output_stream.getvalue())
+
+        self.assertEqual(self.odata["@odata.nextLink"], current["next"])
+        self.assertEqual(4, len(current["bbox"]))
+        self.assertEqual(len(self.odata["value"]), len(current["features"]))
+
+    def test_feature_id_getter_on_mappings(self):
+        # the streaming conversion hands read-only Products to the getter
+        products = [MappingProxyType(p) for p in self.odata["value"]]
+        opts = FeatureBuildOptions(feature_id_getter=lambda p: p["Name"])
+
+        self.assertEqual(
+            [p["Name"] for p in products],
+            [feature["id"] for feature in iter_features(products, opts)],
+        )
@@ -0,0 +1,216 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Mapping
+from unittest.mock import patch
+
+import io
+import json
+import unittest
+
+from pygeocdse.converters.odata2stac import (
+    DISPATCH_REGISTRY,
+    conversion_plan_cache_clear,
+    iter_stac_item_dicts,
+    odata_products_to_stac_item_collection,
+    to_stac_item_collection,
+    write_stac_item_collection,
+)
+from pystac import Asset, Item, ItemCollection, Link, RelType
+from pystac.extensions.processing import ProcessingExtension
+from pystac.extensions.product import ProductExtension
+from pystac.extensions.sar import SarExtension
+from pystac.extensions.sat import SatExtension
+from shapely.geometry import shape
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+ODATA_SEARCH = Path(__file__).parent / "artifacts" / "odata_search.json"
+
+
+def _legacy_stac_item(url: str, product: Mapping[str, Any]) -> Item:
+    # the conversion as it was before the per-collection plans: no extension is
+    # declared upfront, the raw Product is dispatched attribute by attribute
+    attributes = product.get("Attributes") or []
+    beginning = next(
+        a.get("Value") for a in attributes if "beginningDateTime" == a.get("Name")
+    )
+
+    item = Item(
+        id=str(product.get("Id")),
+        geometry=product["GeoFootprint"],
+        bbox=list(shape(product["GeoFootprint"]).bounds),
+        datetime=datetime.fromisoformat(beginning.replace("Z", "+00:00")),
+        properties={},
+    )
+    item.add_link(
+        Link(
+            rel=RelType.DERIVED_FROM,
+            target=f"{url}?$filter=Name%20eq%20%27{product.get('Name')}%27&$expand=Assets&$expand=Attributes",
+            media_type="application/json",
+            title="OData product entry",
+        )
+    )
+    for location in product.get("Locations") or []:
+        asset = Asset(
+            href=str(location.get("DownloadLink")),
+            roles=["data"],
+            title=str(location.get("FormatType")),
+            extra_fields={"file:size": location.get("ContentLength")},
+        )
+        for checksum in location.get("Checksum") or []:
+            asset.extra_fields[f"checksum:{checksum.get('Algorithm')}"] = checksum.get(
+                "Value"
+            )
+        item.add_asset(str(location.get("FormatType")), asset)
+
+    for attribute in attributes:
+        name = str(attribute.get("Name"))
+        if name in DISPATCH_REGISTRY:
+            DISPATCH_REGISTRY[name](product, attribute.get("Value"), item)
+
+    return item
+
+
+class TestOData2STAC(unittest.TestCase):
+    def setUp(self):
+        with ODATA_SEARCH.open() as input_stream:
+            self.odata = json.load(input_stream)
+
+    def test_streaming_matches_item_collection(self):
+        expected = json.loads(
+            json.dumps(
+                odata_products_to_stac_item_collection(BASE_URL, self.odata).to_dict()
+            )
+        )
+
+        output_stream = io.StringIO()
+        to_stac_item_collection(BASE_URL, self.odata, output_stream)
+        current = json.loads(output_stream.getvalue())
+
+        self.assertEqual(expected, current)
+
+    def test_valid_feature_collection(self):
+        output_stream = io.StringIO()
+        to_stac_item_collection(BASE_URL, self.odata, output_stream)
+        current = json.loads(output_stream.getvalue())
+
+        self.assertEqual("FeatureCollection", current["type"])
+        self.assertEqual(len(self.odata["value"]), len(current["features"]))
+        self.assertTrue(all("Feature" == f["type"] for f in current["features"]))
+        self.assertEqual(
+            [p["Id"] for p in self.odata["value"]],
+            [item.id for item in ItemCollection.from_dict(current)],
+        )
+
+    def test_same_items_as_legacy_conversion(self):
+        expected = [
+            json.loads(json.dumps(_legacy_stac_item(BASE_URL, product).to_dict()))
+            for product in self.odata["value"]
+        ]
+
+        output_stream = io.StringIO()
+        to_stac_item_collection(BASE_URL, self.odata, output_stream)
+        current = json.loads(output_stream.getvalue())["features"]
+
+        self.assertEqual(len(expected), len(current))
+        for expected_item, current_item in zip(expected, current):
+            for member in ("stac_extensions", "properties", "assets", "links"):
+                self.assertEqual(expected_item[member], current_item[member], member)
+            self.assertEqual(expected_item, current_item)
+
+    def test_item_content(self):
+        output_stream = io.StringIO()
+        to_stac_item_collection(BASE_URL, self.odata, output_stream)
+        product = self.odata["value"][0]
+        item = json.loads(output_stream.getvalue())["features"][0]
+
+        for extension in (
+            SatExtension,
+            SarExtension,
+            ProductExtension,
+            ProcessingExtension,
+        ):
+            self.assertIn(extension.get_schema_uri(), item["stac_extensions"])
+
+        properties = item["properties"]
+        self.assertEqual("sentinel-1", properties["constellation"])
+        self.assertEqual("sentinel-1c", properties["platform"])
+        self.assertEqual(["sar"], properties["instruments"])
+        self.assertEqual("ascending", properties["sat:orbit_state"])
+        self.assertEqual(5702, properties["sat:absolute_orbit"])
+        self.assertEqual(106, properties["sat:relative_orbit"])
+        self.assertEqual("IW", properties["sar:instrument_mode"])
+        self.assertEqual(["VV", "VH"], properties["sar:polarizations"])
+        self.assertEqual("L1", properties["processing:level"])
+
+        self.assertEqual(["Compressed", "Extracted"], sorted(item["assets"]))
+        (link,) = [link for link in item["links"] if "derived_from" == link["rel"]]
+        self.assertIn(f"Name%20eq%20%27{product['Name']}%27", link["href"])
+
+    def test_external_handler_receives_the_product(self):
+        received = []
+
+        def on_product_type(product, value, target_item):
+            received.append((product["Id"], product.get("Name"), value))
+
+        with patch.dict(DISPATCH_REGISTRY, {"productType": on_product_type}):
+            conversion_plan_cache_clear()
+            try:
+                output_stream = io.StringIO()
+                to_stac_item_collection(BASE_URL, self.odata, output_stream)
+            finally:
+                conversion_plan_cache_clear()
+
+        self.assertEqual(
+            [(p["Id"], p["Name"], "IW_GRDH_1S") for p in self.odata["value"]],
+            received,
+        )
+
+    def test_parallel_conversion_matches_sequential(self):
+        products = list(self.odata["value"])
+        # the Products without footprint are skipped, wherever they are
+        for i in (0, 7, 19):
+            products[i] = {k: v for k, v in products[i].items() if "GeoFootprint" != k}
+
+        outputs = []
+        for workers in (1, 2):
+            output_stream = io.StringIO()
+            count = write_stac_item_collection(
+                BASE_URL, products, output_stream, workers=workers
+            )
+            self.assertEqual(17, count)
+            outputs.append(output_stream.getvalue())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(
+            [p["Id"] for p in products if "GeoFootprint" in p],
+            [item["id"] for item in json.loads(outputs[1])["features"]],
+        )
+
+        # several chunks, converted by different workers
+        self.assertEqual(
+            json.loads(outputs[0])["features"],
+            json.loads(
+                json.dumps(
+                    list(
+                        iter_stac_item_dicts(
+                            BASE_URL, products, workers=2, chunk_size=3
+                        )
+                    )
+                )
+            ),
+        )
@@ -0,0 +1,138 @@
+# Copyright 2025-2026 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from datetime import datetime, timezone
+from pygeocdse.ast_utils import and_chain
+from pygeocdse.optimizer import UnsatisfiableFilter, optimize, simplify
+from pygeofilter.ast import (
+    And,
+    Attribute,
+    Equal,
+    GreaterThan,
+    In,
+    LessEqual,
+    LessThan,
+    Or,
+    TimeBegins,
+    TimeEnds,
+)
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_merge_equalities(self):
+        filter = Or(
+            Or(Equal(Attribute("tileId"), "A"), Equal(Attribute("orbit"), "B")),
+            In(Attribute("tileId"), ["C", "A"], False),
+        )
+        self.assertEqual(
+            Or(
+                In(Attribute("tileId"), ["A", "C"], False),
+                Equal(Attribute("orbit"), "B"),
+            ),
+            optimize(filter),
+        )
+
+    def test_keep_other_clauses(self):
+        cloud_cover = LessThan(Attribute("cloudCover"), 10)
+        filter = Or(Equal(Attribute("tileId"), "A"), cloud_cover)
+        self.assertEqual(filter, optimize(filter))
+
+    def test_nested_in_and(self):
+        filter = And(
+            LessThan(Attribute("cloudCover"), 10),
+            Or(
+                Equal(Attribute("Collection/Name"), "SENTINEL-1"),
+                Equal(Attribute("Collection/Name"), "SENTINEL-2"),
+            ),
+        )
+        self.assertEqual(
+            And(
+                LessThan(Attribute("cloudCover"), 10),
+                In(Attribute("Collection/Name"), ["SENTINEL-1", "SENTINEL-2"], False),
+            ),
+            optimize(filter),
+        )
+
+    def test_not_in_is_kept(self):
+        filter = Or(
+            In(Attribute("tileId"), ["A"], True), Equal(Attribute("tileId"), "B")
+        )
+        self.assertEqual(filter, optimize(filter))
+
+
+class TestSimplify(unittest.TestCase):
+    def test_tightest_range(self):
+        cloud_cover = Attribute("cloudCover")
+        filter = and_chain(
+            [
+                LessThan(cloud_cover, 30),
+                Equal(Attribute("productType"), "S2MSI2A"),
+                LessEqual(cloud_cover, 10),
+                GreaterThan(cloud_cover, 2),
+            ]
+        )
+        self.assertEqual(
+            LessEqual(cloud_cover, 10),
+            simplify(And(LessThan(cloud_cover, 30), LessEqual(cloud_cover, 10))),
+        )
+        self.assertEqual(
+            and_chain(
+                [
+                    GreaterThan(cloud_cover, 2),
+                    LessEqual(cloud_cover, 10),
+                    Equal(Attribute("productType"), "S2MSI2A"),
+                ]
+            ),
+            simplify(filter),
+        )
+
+    def test_duplicates(self):
+        clause = Equal(Attribute("productType"), "S2MSI2A")
+        self.assertEqual(clause, simplify(And(clause, clause)))
+
+    def test_equality_within_range(self):
+        orbit = Attribute("relativeOrbitNumber")
+        filter = And(In(orbit, [10, 20, 30], False), LessThan(orbit, 25))
+        self.assertEqual(In(orbit, [10, 20], False), simplify(filter))
+
+    def test_contradiction(self):
+        cloud_cover = Attribute("cloudCover")
+        with self.assertRaises(UnsatisfiableFilter):
+            simplify(And(LessThan(cloud_cover, 10), GreaterThan(cloud_cover, 30)))
+
+        with self.assertRaises(UnsatisfiableFilter):
+            simplify(And(Equal(cloud_cover, 10), Equal(cloud_cover, 20)))
+
+    def test_content_date_window(self):
+        filter = And(
+            TimeBegins(
+                Attribute("ContentDate/Start"),
+                datetime(2024, 2, 1, tzinfo=timezone.utc),
+            ),
+            TimeEnds(
+                Attribute("ContentDate/End"), datetime(2024, 1, 1, tzinfo=timezone.utc)
+            ),
+        )
+        with self.assertRaises(UnsatisfiableFilter):
+            simplify(filter)
+
+    def test_unsatisfiable_or_branch(self):
+        cloud_cover = Attribute("cloudCover")
+        satisfiable = Equal(Attribute("productType"), "S2MSI2A")
+        filter = Or(
+            And(LessThan(cloud_cover, 10), GreaterThan(cloud_cover, 30)), satisfiable
+        )
+        self.assertEqual(satisfiable, optimize(filter))
@@ -0,0 +1,290 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Optional
+
+import httpx
+import json
+import re
+import unittest
+
+from unittest.mock import patch
+
+from pygeocdse.client import CDSEClient
+from pygeocdse.search import (
+    _iter_page_items,
+    count,
+    http_invoke,
+    iter_products,
+    iter_products_keyset,
+    ijson,
+    keyset_descending,
+)
+from pygeofilter.parsers.cql2_json import parse as parse_cql2_json
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+CQL2_FILTER = {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-2"]}
+
+
+def _paginated_handler(total: int, page_size: int, requests: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+
+        skip = int(request.url.params.get("$skip", 0))
+        value = [
+            {"Id": f"product-{i}"} for i in range(skip, min(skip + page_size, total))
+        ]
+        page: Dict[str, Any] = {"value": value}
+        if skip + page_size < total:
+            page["@odata.nextLink"] = f"{BASE_URL}?$skip={skip + page_size}"
+
+        return httpx.Response(200, json=page)
+
+    return handler
+
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+    def _patch_client(self, total: int, page_size: int):
+        transport = httpx.MockTransport(
+            _paginated_handler(total, page_size, self.requests)
+        )
+        return patch(
+            "pygeocdse.client.Client",
+            side_effect=lambda *args, **kwargs: httpx.Client(transport=transport),
+        )
+
+    def test_follows_next_link(self):
+        with self._patch_client(total=25, page_size=10):
+            products = list(
+                iter_products(BASE_URL, CQL2_FILTER, limit=10, max_items=100)
+            )
+
+        self.assertEqual(
+            [f"product-{i}" for i in range(25)], [p["Id"] for p in products]
+        )
+        self.assertEqual(3, len(self.requests))
+
+    def test_stops_exactly_at_max_items(self):
+        with self._patch_client(total=100, page_size=10):
+            products = list(
+                iter_products(BASE_URL, CQL2_FILTER, limit=10, max_items=15)
+            )
+
+        self.assertEqual(15, len(products))
+        self.assertEqual(2, len(self.requests))
+
+    def test_is_lazy(self):
+        with self._patch_client(total=100, page_size=10):
+            products = iter_products(BASE_URL, CQL2_FILTER, limit=10, max_items=100)
+            self.assertEqual(0, len(self.requests))
+
+            next(products)
+            self.assertEqual(1, len(self.requests))
+
+    def test_http_invoke_collects_all_pages(self):
+        with self._patch_client(total=25, page_size=10):
+            data = http_invoke(BASE_URL, CQL2_FILTER, limit=10, max_items=100)
+
+        self.assertEqual(25, len(data["value"]))
+
+    def test_prebuilt_ast(self):
+        with self._patch_client(total=5, page_size=10):
+            http_invoke(BASE_URL, CQL2_FILTER)
+            http_invoke(BASE_URL, json.dumps(CQL2_FILTER))
+            http_invoke(BASE_URL, parse_cql2_json(CQL2_FILTER))
+
+        self.assertEqual(1, len({str(request.url) for request in self.requests}))
+
+    def test_unsatisfiable_filter(self):
+        cql2_filter = {
+            "op": "and",
+            "args": [
+                CQL2_FILTER,
+                {"op": "<", "args": [{"property": "cloudCover"}, 10]},
+                {"op": ">", "args": [{"property": "cloudCover"}, 30]},
+            ],
+        }
+
+        with self._patch_client(total=5, page_size=10):
+            data = http_invoke(BASE_URL, cql2_filter)
+
+        self.assertEqual([], data["value"])
+        self.assertEqual(0, len(self.requests))
+
+
+def _keyset_handler(total: int, requests: list, max_page_size: Optional[int] = None):
+    products: List[Dict[str, Any]] = [
+        {
+            "Id": f"product-{i:02d}",
+            "ContentDate": {"Start": f"2024-01-01T00:00:{i // 2:02d}.000Z"},
+        }
+        for i in range(total)
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+
+        where = request.url.params["$filter"]
+        top = int(request.url.params["$top"])
+        # the server may serve fewer Products than requested per page
+        if max_page_size is not None:
+            top = min(top, max_page_size)
+        match = re.search(r"ContentDate/Start gt (\S+) or .* Id gt ([^)]+)\)", where)
+
+        matching = products
+        if match:
+            start, last_id = match.groups()
+            matching = [
+                p
+                for p in products
+                if p["ContentDate"]["Start"] > start
+                or (p["ContentDate"]["Start"] == start and p["Id"] > last_id)
+            ]
+
+        page: Dict[str, Any] = {"value": matching[:top]}
+        if len(matching) > top:
+            page["@odata.nextLink"] = f"{BASE_URL}?$skip={top}"
+        return httpx.Response(200, json=page)
+
+    return handler
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def test_walks_the_keyset(self):
+        requests = []
+        transport = httpx.MockTransport(_keyset_handler(25, requests))
+
+        with CDSEClient(transport=transport) as client:
+            products = list(
+                iter_products_keyset(
+                    BASE_URL, CQL2_FILTER, limit=10, max_items=100, client=client
+                )
+            )
+
+        self.assertEqual(
+            [f"product-{i:02d}" for i in range(25)], [p["Id"] for p in products]
+        )
+        # the results end with an empty page
+        self.assertEqual(4, len(requests))
+        for request in requests:
+            self.assertNotIn("$skip", str(request.url))
+            self.assertEqual(
+                "ContentDate/Start asc,Id asc", request.url.params["$orderby"]
+            )
+
+        # the last product of the first page is shared by ContentDate/Start 00:00:04
+        self.assertIn(
+            "ContentDate/Start eq 2024-01-01T00:00:04.000Z and Id gt product-09",
+            requests[1].url.params["$filter"],
+        )
+
+    def test_stops_at_max_items(self):
+        requests = []
+        transport = httpx.MockTransport(_keyset_handler(25, requests))
+
+        with CDSEClient(transport=transport) as client:
+            products = list(
+                iter_products_keyset(
+                    BASE_URL, CQL2_FILTER, limit=10, max_items=12, client=client
+                )
+            )
+
+        self.assertEqual(12, len(products))
+        self.assertEqual(["10", "2"], [r.url.params["$top"] for r in requests])
+
+    def test_short_pages(self):
+        requests = []
+        transport = httpx.MockTransport(_keyset_handler(25, requests, 4))
+
+        with CDSEClient(transport=transport) as client:
+            products = list(
+                iter_products_keyset(
+                    BASE_URL, CQL2_FILTER, limit=10, max_items=100, client=client
+                )
+            )
+
+        self.assertEqual(
+            [f"product-{i:02d}" for i in range(25)], [p["Id"] for p in products]
+        )
+        self.assertEqual(8, len(requests))
+
+    def test_sort_direction(self):
+        self.assertFalse(keyset_descending([]))
+        self.assertFalse(keyset_descending(["ContentDate/Start asc"]))
+        self.assertTrue(keyset_descending(["ContentDate/Start desc", "Id desc"]))
+
+        with self.assertRaisesRegex(ValueError, "mixed directions"):
+            keyset_descending(["ContentDate/Start desc", "Id asc"])
+        with self.assertRaisesRegex(ValueError, "sorts by"):
+            keyset_descending(["Name asc"])
+
+
+class TestCount(unittest.TestCase):
+    def test_count(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"@odata.count": 42, "value": []})
+
+        with CDSEClient(transport=httpx.MockTransport(handler)) as client:
+            self.assertEqual(42, count(BASE_URL, CQL2_FILTER, client=client))
+
+        self.assertEqual(1, len(requests))
+        self.assertEqual("true", requests[0].url.params["$count"])
+        self.assertEqual("0", requests[0].url.params["$top"])
+        self.assertNotIn("$expand", str(requests[0].url))
+
+
+@unittest.skipIf(ijson is None, "the optional 'ijson' package is not installed")
+class TestStreamedPagination(unittest.TestCase):
+    def test_follows_next_link(self):
+        requests = []
+        transport = httpx.MockTransport(_paginated_handler(25, 10, requests))
+
+        with CDSEClient(transport=transport) as client:
+            products = list(
+                iter_products(
+                    BASE_URL,
+                    CQL2_FILTER,
+                    limit=10,
+                    max_items=15,
+                    client=client,
+                    stream=True,
+                )
+            )
+
+        self.assertEqual(
+            [f"product-{i}" for i in range(15)], [p["Id"] for p in products]
+        )
+        self.assertEqual(2, len(requests))
+
+    def test_decodes_chunks(self):
+        page = {
+            "@odata.nextLink": f"{BASE_URL}?$skip=2",
+            "value": [
+                {"Id": "a", "Attributes": [{"Name": "cloudCover", "Value": 1.5}]},
+                {"Id": "b", "GeoFootprint": {"type": "Point", "coordinates": [1, 2]}},
+            ],
+        }
+        content = json.dumps(page).encode()
+        chunks = (content[i : i + 7] for i in range(0, len(content), 7))
+
+        state = {}
+        self.assertEqual(page["value"], list(_iter_page_items(chunks, state)))
+        self.assertEqual(page["@odata.nextLink"], state["@odata.nextLink"])
@@ -0,0 +1,65 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+import os
+import unittest
+
+from pygeocdse.converters.parallel import imap_chunks
+
+
+def _square_odd(chunk: List[int]) -> List[int]:
+    # drops some of the items, as the STAC conversion does for Products without geometry
+    return [n * n for n in chunk if n % 2]
+
+
+def _worker_pid(chunk: List[int]) -> List[int]:
+    return [os.getpid()] * len(chunk)
+
+
+class TestParallel(unittest.TestCase):
+    def test_preserves_order(self):
+        self.assertEqual(
+            [n * n for n in range(1000) if n % 2],
+            list(imap_chunks(_square_odd, range(1000), workers=3, chunk_size=7)),
+        )
+
+    def test_runs_in_workers(self):
+        pids = set(imap_chunks(_worker_pid, range(100), workers=2, chunk_size=10))
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_bounded_window(self):
+        consumed: List[int] = []
+
+        def items():
+            for n in range(1000):
+                consumed.append(n)
+                yield n
+
+        results = imap_chunks(_square_odd, items(), workers=2, chunk_size=10)
+        self.assertEqual(1, next(results))
+        # the first result is available once the window (2 * workers chunks) is full
+        self.assertEqual(40, len(consumed))
+        results.close()
+
+    def test_empty_input(self):
+        self.assertEqual([], list(imap_chunks(_square_odd, [], workers=2)))
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            list(imap_chunks(_square_odd, range(10), workers=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import httpx
+import re
+import unittest
+
+from pygeocdse.ast_utils import collections_filter, datetime_or_interval_filter
+from pygeocdse.client import AsyncCDSEClient
+from pygeocdse.planner import aiter_partitioned_products, plan_time_partitions
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+ORIGIN = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+# one Product every 6 hours, all over January 2023
+PRODUCTS: List[Dict[str, Any]] = [
+    {
+        "Id": f"product-{i}",
+        "ContentDate": {
+            "Start": (ORIGIN + timedelta(hours=6 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        },
+    }
+    for i in range(124)
+]
+
+
+def _bound(where: str, op: str) -> datetime | None:
+    match = re.search(rf"ContentDate/Start {op} (\S+)", where)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y-%m-%dT%H:%M:%SZ").replace(
+        tzinfo=timezone.utc
+    )
+
+
+class TestTimePartitions(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.counts = 0
+        self.searches = 0
+        self.tops: List[int] = []
+        # Products ingested after the partitions have been planned
+        self.unplanned = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            where = request.url.params["$filter"]
+            start = _bound(where, "ge")
+            end = _bound(where, "lt")
+            if start is None:
+                return httpx.Response(400, json={"error": "unbounded ContentDate"})
+
+            matching = [
+                product
+                for product in reversed(PRODUCTS)
+                if start <= datetime.fromisoformat(product["ContentDate"]["Start"])
+                and (
+                    end is None
+                    or datetime.fromisoformat(product["ContentDate"]["Start"]) < end
+                )
+            ]
+
+            if "true" == request.url.params.get("$count"):
+                self.counts += 1
+                return httpx.Response(
+                    200,
+                    json={"@odata.count": max(0, len(matching) - self.unplanned)},
+                )
+
+            top = int(request.url.params["$top"])
+            skip = int(request.url.params.get("$skip", 0))
+            self.tops.append(top)
+            if not skip:
+                self.searches += 1
+
+            page: Dict[str, Any] = {"value": matching[skip : skip + top]}
+            if skip + top < len(matching):
+                page["@odata.nextLink"] = str(
+                    request.url.copy_set_param("$skip", skip + top)
+                )
+            return httpx.Response(200, json=page)
+
+        self.client = AsyncCDSEClient(transport=httpx.MockTransport(handler))
+        self.filter = datetime_or_interval_filter(
+            collections_filter(None, ["SENTINEL-2"]),
+            "2023-01-01T00:00:00Z/2023-02-01T00:00:00Z",
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_partitions_fit_under_cap(self):
+        partitions = await plan_time_partitions(
+            BASE_URL, self.filter, max_count=10, client=self.client
+        )
+
+        self.assertTrue(all(p.count <= 10 for p in partitions))
+        self.assertEqual(len(PRODUCTS), sum(p.count for p in partitions))
+        self.assertEqual(
+            sorted(partitions, key=lambda p: p.start), partitions, "time ordered"
+        )
+
+    async def test_no_split_when_under_cap(self):
+        partitions = await plan_time_partitions(
+            BASE_URL, self.filter, max_count=1000, client=self.client
+        )
+
+        self.assertEqual(1, len(partitions))
+        self.assertEqual(1, self.counts)
+
+    async def test_products_merged_in_time_order(self):
+        products = [
+            product
+            async for product in aiter_partitioned_products(
+                BASE_URL, self.filter, max_count=10, client=self.client
+            )
+        ]
+
+        self.assertEqual([p["Id"] for p in PRODUCTS], [p["Id"] for p in products])
+
+    async def test_partitions_over_the_cap_are_paged(self):
+        # a single partition, too narrow to be split, with 124 Products
+        products = [
+            product
+            async for product in aiter_partitioned_products(
+                BASE_URL,
+                self.filter,
+                max_count=10,
+                min_span=timedelta(days=31),
+                client=self.client,
+            )
+        ]
+
+        self.assertEqual([p["Id"] for p in PRODUCTS], [p["Id"] for p in products])
+        self.assertTrue(all(top <= 10 for top in self.tops))
+
+    async def test_products_ingested_after_planning(self):
+        self.unplanned = 3
+
+        products = [
+            product
+            async for product in aiter_partitioned_products(
+                BASE_URL, self.filter, max_count=1000, client=self.client
+            )
+        ]
+
+        self.assertEqual([p["Id"] for p in PRODUCTS], [p["Id"] for p in products])
+
+    async def test_partitions_fetched_in_bounded_window(self):
+        products = aiter_partitioned_products(
+            BASE_URL, self.filter, max_count=10, client=self.client, max_concurrency=2
+        )
+        await products.__anext__()
+        await products.aclose()
+
+        self.assertLessEqual(self.searches, 2)
+
+    async def test_missing_content_date(self):
+        with self.assertRaises(ValueError):
+            await plan_time_partitions(
+                BASE_URL, collections_filter(None, ["SENTINEL-2"]), client=self.client
+            )
@@ -0,0 +1,65 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import unittest
+
+from pygeocdse.converters.streaming import write_feature_collection
+
+FEATURES = [
+    {"type": "Feature", "id": "a", "geometry": None, "properties": {"n": 1}},
+    {"type": "Feature", "id": "b", "geometry": None, "properties": {"n": [2, 3]}},
+]
+
+
+class TestStreamingFeatureCollection(unittest.TestCase):
+    def test_valid_feature_collection(self):
+        for indent in (2, None):
+            output_stream = io.StringIO()
+            count = write_feature_collection(output_stream, FEATURES, indent=indent)
+
+            self.assertEqual(2, count)
+            self.assertEqual(
+                {"type": "FeatureCollection", "features": FEATURES},
+                json.loads(output_stream.getvalue()),
+            )
+
+    def test_empty_feature_collection(self):
+        output_stream = io.StringIO()
+        write_feature_collection(output_stream, iter(()))
+
+        self.assertEqual(
+            {"type": "FeatureCollection", "features": []},
+            json.loads(output_stream.getvalue()),
+        )
+
+    def test_features_are_written_as_produced(self):
+        output_stream = io.StringIO()
+
+        def features():
+            for feature in FEATURES:
+                yield feature
+                # the Feature has already been flushed to the stream
+                self.assertIn(f'"id": "{feature["id"]}"', output_stream.getvalue())
+
+        write_feature_collection(output_stream, features())
+
+    def test_trailer(self):
+        output_stream = io.StringIO()
+        write_feature_collection(
+            output_stream, FEATURES, trailer=lambda: {"bbox": [0, 0, 1, 1]}
+        )
+
+        self.assertEqual([0, 0, 1, 1], json.loads(output_stream.getvalue())["bbox"])
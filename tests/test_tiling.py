@@ -0,0 +1,134 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import unittest
+
+from pygeocdse.ast_utils import bbox_filter, collections_filter
+from pygeocdse.client import AsyncCDSEClient
+from pygeocdse.tiling import (
+    aiter_tiled_products,
+    iter_tiled_products,
+    tile_filter,
+    tile_geometry,
+)
+from shapely.geometry import box, mapping, shape
+from shapely.ops import unary_union
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+
+class TestTiling(unittest.IsolatedAsyncioTestCase):
+    def test_tiles_cover_the_aoi(self):
+        aoi = box(-10, 35, 30, 60)
+        tiles = tile_geometry(mapping(aoi), tile_size=10)
+
+        self.assertEqual(12, len(tiles))
+        self.assertAlmostEqual(
+            aoi.area, unary_union([shape(tile) for tile in tiles]).area
+        )
+
+    def test_auto_tile_size(self):
+        tiles = tile_geometry(mapping(box(-10, 35, 30, 75)), max_tiles=16)
+
+        self.assertEqual(16, len(tiles))
+
+    def test_small_aoi_is_not_split(self):
+        aoi = mapping(box(12, 41, 12.5, 41.5))
+
+        self.assertEqual(1, len(tile_geometry(aoi)))
+
+    def test_tile_filter_keeps_other_clauses(self):
+        filter = bbox_filter(collections_filter(None, ["SENTINEL-2"]), (0, 0, 20, 10))
+
+        filters = tile_filter(filter, tile_size=10)
+
+        self.assertEqual(2, len(filters))
+        for tile in filters:
+            self.assertEqual("Collection/Name", tile.lhs.lhs.name)
+
+    def test_tile_filter_requires_intersects(self):
+        with self.assertRaises(ValueError):
+            tile_filter(collections_filter(None, ["SENTINEL-2"]))
+
+    async def test_duplicates_removed(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            # the same Product, crossing the tiles border, is returned by every tile
+            where = request.url.params["$filter"]
+            return httpx.Response(
+                200,
+                json={"value": [{"Id": "shared"}, {"Id": f"tile-{hash(where)}"}]},
+            )
+
+        filter = bbox_filter(None, (0, 0, 20, 20))
+
+        async with AsyncCDSEClient(transport=httpx.MockTransport(handler)) as client:
+            products = [
+                product
+                async for product in aiter_tiled_products(
+                    BASE_URL, filter, tile_size=10, client=client
+                )
+            ]
+
+        ids = [product["Id"] for product in products]
+        self.assertEqual(5, len(ids))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    async def test_tiles_bounded_window(self):
+        searched = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            searched.append(request.url.params["$filter"])
+            return httpx.Response(200, json={"value": [{"Id": str(len(searched))}]})
+
+        filter = bbox_filter(None, (0, 0, 40, 40))
+
+        async with AsyncCDSEClient(transport=httpx.MockTransport(handler)) as client:
+            products = aiter_tiled_products(
+                BASE_URL, filter, tile_size=10, client=client, max_concurrency=2
+            )
+            await products.__anext__()
+            await products.aclose()
+
+        self.assertLessEqual(len(searched), 2)
+
+
+class TestIterTiledProducts(unittest.TestCase):
+    def test_products_streamed(self):
+        searched = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            searched.append(request.url.params["$filter"])
+            return httpx.Response(200, json={"value": [{"Id": str(len(searched))}]})
+
+        filter = bbox_filter(None, (0, 0, 40, 40))
+        transport = httpx.MockTransport(handler)
+
+        with patch(
+            "pygeocdse.tiling.AsyncCDSEClient",
+            partial(AsyncCDSEClient, transport=transport),
+        ):
+            products = iter_tiled_products(
+                BASE_URL, filter, tile_size=10, max_concurrency=2
+            )
+            next(products)
+            streamed = len(searched)
+            remaining = list(products)
+
+        self.assertLessEqual(streamed, 2)
+        self.assertEqual(16, 1 + len(remaining))
+        self.assertEqual(16, len(searched))
@@ -0,0 +1,86 @@
+# Copyright 2025 Terradue
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from loguru import logger
+from unittest.mock import patch
+
+import httpx
+import unittest
+
+from pygeocdse.client import CDSEClient, WireLogging
+from pygeocdse.search import http_invoke
+
+BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
+
+CQL2_FILTER = {"op": "=", "args": [{"property": "Collection/Name"}, "SENTINEL-2"]}
+
+PRODUCTS = {"value": [{"Id": f"product-{i}", "Name": "x" * 100} for i in range(20)]}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if "FAIL" in str(request.url):
+        return httpx.Response(400, json={"detail": "y" * 5000})
+    return httpx.Response(200, json=PRODUCTS)
+
+
+class TestWireLogging(unittest.TestCase):
+    def setUp(self):
+        self.messages = []
+        self.sink_id = logger.add(self.messages.append, level="DEBUG")
+
+    def tearDown(self):
+        logger.remove(self.sink_id)
+
+    def _records(self, level: str):
+        return [m.record for m in self.messages if m.record["level"].name == level]
+
+    def test_disabled_by_default(self):
+        with CDSEClient(transport=httpx.MockTransport(_handler)) as client:
+            http_invoke(BASE_URL, CQL2_FILTER, client=client)
+
+        self.assertEqual([], self._records("DEBUG"))
+
+    def test_truncated_body(self):
+        with CDSEClient(
+            wire_logging=WireLogging(max_body_size=64),
+            transport=httpx.MockTransport(_handler),
+        ) as client:
+            http_invoke(BASE_URL, CQL2_FILTER, client=client)
+
+        records = self._records("DEBUG")
+        self.assertEqual(6, len(records))
+        for record in records:
+            self.assertLess(len(record["message"]), 512)
+
+    def test_nothing_formatted_when_level_disabled(self):
+        client = CDSEClient(
+            wire_logging=WireLogging(level="TRACE"),
+            transport=httpx.MockTransport(_handler),
+        )
+        with patch("pygeocdse.client._truncate") as truncate:
+            with patch("pygeocdse.client._headers_summary") as headers_summary:
+                http_invoke(BASE_URL, CQL2_FILTER, client=client)
+        client.close()
+
+        truncate.assert_not_called()
+        headers_summary.assert_not_called()
+
+    def test_errors_always_reported(self):
+        with CDSEClient(transport=httpx.MockTransport(_handler)) as client:
+            with self.assertRaises(RuntimeError):
+                http_invoke(f"{BASE_URL}/FAIL", CQL2_FILTER, client=client)
+
+        records = self._records("ERROR")
+        self.assertEqual(3, len(records))
+        self.assertLess(len(records[-1]["message"]), 2048)